@@ -0,0 +1,279 @@
+"""Time the stages of a bmi-map run.
+
+Run the benchmarks and save the results as JSON::
+
+    python benchmarks/bench.py --output results.json
+
+Compare against previously saved results, exiting with a non-zero status
+if any benchmark is slower by more than the threshold::
+
+    python benchmarks/bench.py --compare baseline.json --threshold 1.2
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from collections.abc import Sequence
+from functools import cache
+from functools import partial
+from typing import Any
+
+from bmi_map._bmi import BMI
+from bmi_map._compiled import compile_spec
+from bmi_map._main import main as bmi_map_main
+from bmi_map._parameter import Parameter
+from bmi_map._version import __version__
+from bmi_map.bmi_map import dumps
+from bmi_map.bmi_map import get_mapper
+from bmi_map.bmi_map import load
+from bmi_map.bmi_map import loads
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.bmi_map import set_output_cache
+
+LANGUAGES = ("c", "c++", "python", "sidl")
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark.
+
+    The decorated function does any setup and returns the callable to time.
+    """
+
+    def register(func: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def bmi_toml() -> str:
+    """Return the built-in BMI as a spec TOML document."""
+    return dumps(BMI)
+
+
+@benchmark("loads")
+def bench_loads():
+    content = bmi_toml()
+    return lambda: loads(content)
+
+
+@benchmark("loads-lazy")
+def bench_loads_lazy():
+    content = bmi_toml()
+    return lambda: loads(content, lazy=True)
+
+
+def large_spec(n_functions: int = 10_000) -> dict[str, tuple[Parameter, ...]]:
+    """Return a spec with many functions by repeating those of the BMI."""
+    funcs = list(BMI.items())
+    return {
+        f"{name}_{i}": params
+        for i, (name, params) in zip(
+            range(n_functions), itertools.cycle(funcs), strict=False
+        )
+    }
+
+
+@cache
+def _spec_dir() -> tempfile.TemporaryDirectory[str]:
+    return tempfile.TemporaryDirectory(prefix="bmi-map-bench-")
+
+
+def spec_file(name: str, content: bytes) -> str:
+    """Write a spec to a temporary file that lasts as long as the process.
+
+    Specs are loaded from files on disk, rather than from memory, so that
+    compiled specs are memory-mapped as they are in a bmi-map run.
+    """
+    path = os.path.join(_spec_dir().name, name)
+    with open(path, "wb") as fp:
+        fp.write(content)
+    return path
+
+
+def _load_file(path: str, lazy: bool = False):
+    with open(path, "rb") as fp:
+        return load(fp, lazy=lazy, cache=False)
+
+
+@benchmark("load-10k-toml")
+def bench_load_10k_toml():
+    path = spec_file("10k.toml", dumps(large_spec()).encode())
+    return lambda: _load_file(path)
+
+
+@benchmark("load-10k-compiled")
+def bench_load_10k_compiled():
+    path = spec_file("10k.bmic", compile_spec(large_spec()))
+    return lambda: _load_file(path)
+
+
+@benchmark("load-10k-compiled-lazy")
+def bench_load_10k_compiled_lazy():
+    spec = large_spec()
+    path, last = spec_file("10k.bmic", compile_spec(spec)), list(spec)[-1]
+    return lambda: _load_file(path, lazy=True)[last]
+
+
+@benchmark("parameter-validation")
+def bench_parameter_validation():
+    raw = [p.asdict() for params in BMI.values() for p in params]
+    return lambda: [Parameter(**param) for param in raw]
+
+
+def _bench_mapper(language: str):
+    mapper = get_mapper(language)
+    return lambda: [mapper.map(name, params) for name, params in BMI.items()]
+
+
+for _language in LANGUAGES:
+    BENCHMARKS[f"map-{_language}"] = partial(_bench_mapper, _language)
+
+
+def _bench_highlight(language: str):
+    from bmi_map._main import Highlighter
+
+    mapper = get_mapper(language)
+    text = "\n".join(mapper.map(name, params) for name, params in BMI.items())
+    highlight = Highlighter(language, depth="256")
+
+    return lambda: highlight(text)
+
+
+for _language in LANGUAGES:
+    BENCHMARKS[f"highlight-{_language}"] = partial(_bench_highlight, _language)
+
+
+def _bench_cli(language: str):
+    def run():
+        mapping_cache_clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            bmi_map_main(["--to", language, "--color", "never"])
+
+    return run
+
+
+for _language in LANGUAGES:
+    BENCHMARKS[f"cli-{_language}"] = partial(_bench_cli, _language)
+
+
+def _bench_map_10k(language: str, output_cache: str):
+    """Map a large spec without an output cache, or with a cold or warm one."""
+    from bmi_map._output_cache import OutputCache
+
+    spec = large_spec()
+    path = os.path.join(_spec_dir().name, f"outputs-{language}.sqlite")
+    cache = None if output_cache == "off" else OutputCache(path)
+
+    def run():
+        mapping_cache_clear()
+        if output_cache == "cold":
+            cache.clear()
+        set_output_cache(cache)
+        try:
+            return map_spec(spec, to=language)
+        finally:
+            set_output_cache(None)
+            if cache is not None:
+                cache.flush()
+
+    if output_cache == "warm":
+        run()
+    return run
+
+
+for _language in LANGUAGES:
+    for _output_cache in ("off", "cold", "warm"):
+        BENCHMARKS[f"map-10k-{_language}-output-cache-{_output_cache}"] = partial(
+            _bench_map_10k, _language, _output_cache
+        )
+
+
+def time_benchmark(func: Callable[[], Any], repeat: int = 5) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Return the names of benchmarks that regressed against a baseline."""
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            continue
+        ratio = timing["min"] / baseline[name]["min"]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(name)
+            flag = "  <-- regression"
+        print(f"{name:32s} {ratio:6.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default=".*", help="benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    parser.add_argument("--output", help="file to which to save results as JSON")
+    parser.add_argument("--compare", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio above which a benchmark is a regression",
+    )
+    args = parser.parse_args(argv)
+
+    pattern = re.compile(args.filter)
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if not pattern.search(name):
+            continue
+        results[name] = time_benchmark(setup(), repeat=args.repeat)
+        print(f"{name:32s} {results[name]['min'] * 1e6:12.1f} us", file=sys.stderr)
+
+    report = {
+        "bmi_map": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)["benchmarks"]
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Compare memory use and construction time of Parameter representations.
+
+A catalog of models, each with its own parsed copy of the built-in BMI,
+is built with the current, interned :class:`~bmi_map._parameter.Parameter`
+and with the original, unslotted dataclass::
+
+    python benchmarks/parameter_memory.py --models 1000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from bmi_map._bmi import BMI
+from bmi_map._parameter import Parameter
+from bmi_map._parameter import validate_intent
+from bmi_map._parameter import validate_name
+from bmi_map._parameter import validate_type
+
+
+@dataclass(frozen=True)
+class LegacyParameter:
+    """Parameter as it was before it was slotted and interned."""
+
+    name: str
+    intent: str
+    type: str
+
+    def __post_init__(self):
+        object.__setattr__(self, "name", validate_name(self.name))
+        object.__setattr__(self, "intent", validate_intent(self.intent))
+        object.__setattr__(self, "type", validate_type(self.type))
+
+
+def build_catalog(factory: Callable[..., Any], models: int) -> list[dict[str, tuple]]:
+    raw = {name: [p.asdict() for p in params] for name, params in BMI.items()}
+    return [
+        {name: tuple(factory(**p) for p in params) for name, params in raw.items()}
+        for _ in range(models)
+    ]
+
+
+def measure(factory: Callable[..., Any], models: int) -> dict[str, float]:
+    gc.collect()
+    start = time.perf_counter()
+    build_catalog(factory, models)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    catalog = build_catalog(factory, models)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalog
+
+    n_params = models * sum(len(params) for params in BMI.values())
+    return {
+        "parameters": n_params,
+        "seconds": elapsed,
+        "bytes": current,
+        "bytes_per_parameter": current / n_params,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=1000, help="models in catalog")
+    parser.add_argument("--output", help="file to which to save results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {
+        "legacy": measure(LegacyParameter, args.models),
+        "interned": measure(Parameter, args.models),
+    }
+    for name, result in results.items():
+        print(
+            f"{name:10s} {result['seconds'] * 1e3:10.1f} ms"
+            f" {result['bytes'] / 2**20:10.2f} MiB"
+            f" {result['bytes_per_parameter']:8.1f} B/param",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+"""Measure how loading, filtering and mapping scale with the size of a spec.
+
+Specs of increasing size are generated with :func:`bmi_map._synth.synth_spec`
+and each step of a bmi-map run is timed and its peak memory measured::
+
+    python benchmarks/scaling.py --max-functions 1000000 --plot scaling.png
+
+The steps are parsing the TOML, validating the parsed spec
+(``_spec_to_dict``), selecting functions (``filter_spec``) and mapping
+them to each language (``map_spec``). Plotting needs matplotlib.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tomllib
+import tracemalloc
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Any
+
+from bmi_map._spec import filter_spec
+from bmi_map._synth import synth_spec
+from bmi_map.bmi_map import _spec_to_dict
+from bmi_map.bmi_map import dumps
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+
+STEPS = ("parse", "validate", "filter", "map")
+
+
+def run_steps(
+    content: str, languages: Sequence[str], include: str, measure: Callable
+) -> None:
+    """Run the steps of a bmi-map run on a spec, measuring each one."""
+    mapping_cache_clear()
+    funcs = measure("parse", lambda: tomllib.loads(content)["bmi"])
+    spec = measure("validate", lambda: _spec_to_dict(funcs))
+    selected = measure("filter", lambda: filter_spec(spec, include=include))
+    measure("map", lambda: map_spec(selected, to=languages))
+
+
+def time_steps(
+    content: str, languages: Sequence[str], include: str
+) -> dict[str, float]:
+    """Return the seconds taken by each step."""
+    seconds = {}
+
+    def measure(step, func):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        seconds[step] = time.perf_counter() - start
+        return result
+
+    run_steps(content, languages, include, measure)
+    return seconds
+
+
+def memory_steps(
+    content: str, languages: Sequence[str], include: str
+) -> dict[str, int]:
+    """Return the peak number of bytes allocated by each step."""
+    peaks = {}
+
+    def measure(step, func):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            peaks[step] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result
+
+    run_steps(content, languages, include, measure)
+    return peaks
+
+
+def sizes(max_functions: int) -> list[int]:
+    """Return powers of ten from 100 up to *max_functions*."""
+    sizes = []
+    n = 100
+    while n <= max_functions:
+        sizes.append(n)
+        n *= 10
+    return sizes
+
+
+def plot(results: list[dict[str, Any]], path: str) -> bool:
+    """Plot time and memory against the number of functions."""
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed, not plotting", file=sys.stderr)
+        return False
+
+    n_functions = [result["functions"] for result in results]
+    fig, (seconds_ax, memory_ax) = plt.subplots(1, 2, figsize=(11, 4.5))
+    for step in STEPS:
+        seconds_ax.plot(
+            n_functions, [r["seconds"][step] for r in results], "o-", label=step
+        )
+        if all("bytes" in r for r in results):
+            memory_ax.plot(
+                n_functions,
+                [r["bytes"][step] / 2**20 for r in results],
+                "o-",
+                label=step,
+            )
+    for ax, label in ((seconds_ax, "time (s)"), (memory_ax, "peak memory (MiB)")):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("functions")
+        ax.set_ylabel(label)
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    return True
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--max-functions",
+        type=int,
+        default=1_000_000,
+        help="largest number of functions",
+    )
+    parser.add_argument(
+        "--params-per-func", type=int, default=3, help="parameters of each function"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for the specs")
+    parser.add_argument(
+        "--to",
+        nargs="+",
+        default=["c", "c++", "python", "sidl"],
+        help="languages to map to",
+    )
+    parser.add_argument(
+        "--include", default="^get_", help="functions selected by the filter step"
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="don't measure memory (which takes as long as the timing)",
+    )
+    parser.add_argument("--output", help="file to which to save results as JSON")
+    parser.add_argument("--plot", help="file to which to save a plot of the results")
+    args = parser.parse_args(argv)
+
+    print(
+        f"python {platform.python_version()},"
+        f" {args.params_per_func} parameters per function,"
+        f" mapping to {', '.join(args.to)}"
+    )
+    header = f"{'functions':>9} {'MiB':>8}" + "".join(
+        f" {s + ' (s)':>12}" for s in STEPS
+    )
+    if args.memory:
+        header += "".join(f" {s + ' (MiB)':>14}" for s in STEPS)
+    print(header)
+
+    results = []
+    for n_functions in sizes(args.max_functions):
+        content = dumps(synth_spec(n_functions, args.params_per_func, seed=args.seed))
+        result: dict[str, Any] = {
+            "functions": n_functions,
+            "spec_bytes": len(content.encode()),
+            "seconds": time_steps(content, args.to, args.include),
+        }
+        if args.memory:
+            result["bytes"] = memory_steps(content, args.to, args.include)
+        results.append(result)
+
+        line = f"{n_functions:>9} {result['spec_bytes'] / 2**20:>8.1f}"
+        line += "".join(f" {result['seconds'][s]:>12.3f}" for s in STEPS)
+        if args.memory:
+            line += "".join(f" {result['bytes'][s] / 2**20:>14.1f}" for s in STEPS)
+        print(line, flush=True)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "params_per_func": args.params_per_func,
+                    "languages": args.to,
+                    "results": results,
+                },
+                fp,
+                indent=2,
+            )
+    if args.plot:
+        plot(results, args.plot)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""Measure how mapping throughput scales with the number of threads.
+
+A spec of distinct functions is mapped to every language by
+:func:`~bmi_map._parallel.map_spec_concurrent` with an increasing number
+of threads. Throughput only scales on free-threaded builds of Python::
+
+    python3.13t benchmarks/thread_scaling.py --threads 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Sequence
+
+from bmi_map._parallel import map_spec_concurrent
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.bmi_map import set_mapping_cache_size
+
+LANGUAGES = ("c", "c++", "python", "sidl")
+
+
+def make_spec(n_functions: int) -> dict[str, tuple[Parameter, ...]]:
+    """Return a spec of functions with distinct signatures."""
+    return {
+        f"get_var_{i}": (
+            Parameter(name="grid", intent="in", type="int"),
+            Parameter(name=f"var_{i}", intent="in", type="array[double, n]"),
+            Parameter(name="units", intent="out", type="string"),
+        )
+        for i in range(n_functions)
+    }
+
+
+def time_mapping(
+    spec: dict[str, tuple[Parameter, ...]], threads: int, repeat: int
+) -> float:
+    """Return the best time to map a spec, with an empty mapping cache."""
+    best = float("inf")
+    for _ in range(repeat):
+        mapping_cache_clear()
+        start = time.perf_counter()
+        map_spec_concurrent(spec, to=LANGUAGES, jobs=threads)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def gil_enabled() -> bool:
+    try:
+        return sys._is_gil_enabled()  # type: ignore[attr-defined]
+    except AttributeError:
+        return True
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts"
+    )
+    parser.add_argument(
+        "--functions", type=int, default=20_000, help="functions in the spec"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats")
+    parser.add_argument("--output", help="file to which to save results as JSON")
+    args = parser.parse_args(argv)
+
+    spec = make_spec(args.functions)
+    set_mapping_cache_size(None)
+    expected = map_spec(spec, to=LANGUAGES)
+
+    print(
+        f"python {platform.python_version()}"
+        f" ({'GIL' if gil_enabled() else 'free-threaded'}),"
+        f" {args.functions} functions x {len(LANGUAGES)} languages"
+    )
+    print(f"{'threads':>7} {'seconds':>9} {'funcs/s':>10} {'speedup':>8}")
+
+    results: list[dict[str, float]] = []
+    for threads in args.threads:
+        mapping_cache_clear()
+        if map_spec_concurrent(spec, to=LANGUAGES, jobs=threads) != expected:
+            print(f"error: mapping with {threads} threads differs", file=sys.stderr)
+            return 1
+
+        seconds = time_mapping(spec, threads, args.repeat)
+        rate = args.functions * len(LANGUAGES) / seconds
+        speedup = results[0]["seconds"] / seconds if results else 1.0
+        results.append({"threads": threads, "seconds": seconds, "rate": rate})
+        print(f"{threads:>7} {seconds:>9.3f} {rate:>10.0f} {speedup:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "gil": gil_enabled(),
+                    "functions": args.functions,
+                    "results": results,
+                },
+                fp,
+                indent=2,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
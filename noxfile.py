@@ -53,6 +53,67 @@ def test(session: nox.Session) -> None:
     session.run("coverage", "xml", "-o", "coverage.xml")
 
 
+@nox.session(name="test-free-threaded", python="3.13t")
+def test_free_threaded(session: nox.Session) -> None:
+    """Run the tests and thread scaling benchmark on free-threaded Python."""
+    session.env["PYTHON_GIL"] = "0"
+    session.install("-r", "requirements-testing.in")
+    install(session)
+
+    session.run(
+        "python", "-c", "import sys; assert not sys._is_gil_enabled(), 'GIL is on'"
+    )
+    session.run("pytest", *session.posargs)
+    session.run(
+        "python",
+        os.path.join(ROOT, "benchmarks", "thread_scaling.py"),
+        "--output",
+        "thread-scaling.json",
+    )
+
+
+@nox.session
+def bench(session: nox.Session) -> None:
+    """Run the benchmarks.
+
+    Results are saved to benchmark.json and parameter-memory.json. Pass
+    ``--compare FILE`` to flag regressions against a saved baseline.
+    """
+    session.install(".[color]")
+    session.run(
+        "python",
+        os.path.join(ROOT, "benchmarks", "bench.py"),
+        "--output",
+        "benchmark.json",
+        *session.posargs,
+    )
+    session.run(
+        "python",
+        os.path.join(ROOT, "benchmarks", "parameter_memory.py"),
+        "--output",
+        "parameter-memory.json",
+    )
+
+
+@nox.session
+def scaling(session: nox.Session) -> None:
+    """Measure how time and memory scale with the size of a spec.
+
+    Results are saved to scaling.json and plotted in scaling.png. Extra
+    arguments are passed to the benchmark (e.g. ``--max-functions 10000``).
+    """
+    session.install(".", "matplotlib")
+    session.run(
+        "python",
+        os.path.join(ROOT, "benchmarks", "scaling.py"),
+        "--output",
+        "scaling.json",
+        "--plot",
+        "scaling.png",
+        *session.posargs,
+    )
+
+
 @nox.session
 def lint(session: nox.Session) -> None:
     """Look for lint."""
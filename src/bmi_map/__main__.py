@@ -2,4 +2,4 @@ from bmi_map._main import main
 
 
 if __name__ == "__main__":
-    SystemExit(main())
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+import glob
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from bmi_map._mapper import Signature
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import _map_signature
+from bmi_map.bmi_map import _read_output_cache
+from bmi_map.bmi_map import _write_output_cache
+
+Spec = Mapping[str, Sequence[Parameter]]
+Key = tuple[str, tuple[Parameter, ...]]
+
+
+class BatchStats(NamedTuple):
+    """How much work de-duplication saved when mapping a batch of specs."""
+
+    specs: int
+    functions: int
+    unique: int
+    languages: int
+
+    @property
+    def saved(self) -> float:
+        """Fraction of the functions that did not need to be mapped."""
+        return 1.0 - self.unique / self.functions if self.functions else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.specs} specs, {self.functions} functions, {self.unique} unique:"
+            f" mapped {self.unique * self.languages} functions"
+            f" instead of {self.functions * self.languages}"
+            f" ({100 * self.saved:.1f}% saved)"
+        )
+
+
+def expand_spec_paths(patterns: Iterable[str]) -> list[str]:
+    """Expand glob patterns into a list of spec files.
+
+    Matches of each pattern are sorted, files that are matched more than
+    once are only listed the first time, and patterns that match nothing
+    are kept as they are.
+    """
+    paths: dict[str, None] = {}
+    for pattern in patterns:
+        paths.update(dict.fromkeys(sorted(glob.glob(pattern)) or [pattern]))
+    return list(paths)
+
+
+def map_spec_batch(
+    specs: Sequence[Spec],
+    to: str | Iterable[str] = ("c", "c++", "python", "sidl"),
+    jobs: int | None = None,
+    executor: str = "auto",
+) -> tuple[list[dict[str, dict[str, str]]], BatchStats]:
+    """Map several specs, mapping each distinct function only once.
+
+    Functions with the same name and parameters are often repeated
+    across specs (for example, the standard BMI functions). They are
+    mapped once per language and the result shared by every spec that
+    contains them. Each spec is looked up in the output cache first, so
+    only the functions of specs, and languages, that aren't there are
+    mapped.
+
+    Parameters
+    ----------
+    specs : sequence of mapping
+        Specs to map.
+    to : str or iterable of str, optional
+        Language, or languages, to which to map the functions.
+    jobs : int, optional
+        Number of workers used to map the distinct functions. If not
+        given, map them in this process.
+    executor : {"auto", "process", "thread"}, optional
+        Kind of worker pool used if *jobs* is given.
+
+    Returns
+    -------
+    list of dict
+        For each spec, the output of :func:`~bmi_map.bmi_map.map_spec`.
+    BatchStats
+        Counts of the functions that were, and were not, mapped.
+
+    Examples
+    --------
+    >>> from bmi_map._batch import map_spec_batch
+    >>> from bmi_map._parameter import Parameter
+    >>> grid = (Parameter("grid", "in", "int"),)
+    >>> mapped, stats = map_spec_batch(
+    ...     [{"update": ()}, {"update": (), "get_grid_rank": grid}], to="c"
+    ... )
+    >>> mapped[1]["c"]["get_grid_rank"]
+    'int get_grid_rank(void* self, const int grid);'
+    >>> print(stats)
+    2 specs, 3 functions, 2 unique: mapped 2 functions instead of 3 (33.3% saved)
+    """
+    languages = (to,) if isinstance(to, str) else tuple(dict.fromkeys(to))
+
+    cached = [_read_output_cache(spec, languages) for spec in specs]
+
+    unique: dict[Key, dict[str, str]] = {}
+    todo: dict[Key, dict[str, None]] = {}
+    n_functions = 0
+    for spec, (_, found) in zip(specs, cached, strict=True):
+        missing = [language for language in languages if language not in found]
+        for name, params in spec.items():
+            key = (name, tuple(params))
+            unique.setdefault(key, {})
+            if missing:
+                todo.setdefault(key, {}).update(dict.fromkeys(missing))
+            n_functions += 1
+
+    if jobs is None or jobs == 1:
+        _map_serial(todo, unique)
+    elif todo:
+        _map_parallel(todo, unique, languages, jobs=jobs, executor=executor)
+
+    results = []
+    for spec, (digest, found) in zip(specs, cached, strict=True):
+        computed = {
+            language: {
+                name: unique[name, tuple(params)][language]
+                for name, params in spec.items()
+            }
+            for language in languages
+            if language not in found
+        }
+        _write_output_cache(digest, computed)
+        mapped = found | computed
+        results.append({language: mapped[language] for language in languages})
+
+    return results, BatchStats(len(specs), n_functions, len(unique), len(languages))
+
+
+def _map_serial(
+    todo: Mapping[Key, Iterable[str]], unique: dict[Key, dict[str, str]]
+) -> None:
+    for (name, params), languages in todo.items():
+        signature = Signature.from_params(name, params)
+        for language in languages:
+            unique[name, params][language] = _map_signature(signature, language)
+
+
+def _map_parallel(
+    todo: Mapping[Key, Iterable[str]],
+    unique: dict[Key, dict[str, str]],
+    languages: Sequence[str],
+    jobs: int,
+    executor: str,
+) -> None:
+    """Map signatures with a pool of workers, grouped into specs by name.
+
+    The groups aren't real specs so they don't go through the output cache.
+    """
+    from bmi_map._parallel import map_specs_parallel
+
+    needed = [
+        language
+        for language in languages
+        if any(language in langs for langs in todo.values())
+    ]
+    groups = _group_by_name(todo)
+    for group, result in zip(
+        groups,
+        map_specs_parallel(
+            groups, needed, jobs=jobs, executor=executor, output_cache=False
+        ),
+        strict=True,
+    ):
+        for name, params in group.items():
+            unique[name, params].update(
+                (language, result[language][name]) for language in todo[name, params]
+            )
+
+
+def _group_by_name(
+    signatures: Iterable[tuple[str, tuple[Parameter, ...]]],
+) -> list[dict[str, tuple[Parameter, ...]]]:
+    """Split signatures into specs within which function names are unique."""
+    groups: list[dict[str, tuple[Parameter, ...]]] = []
+    for name, params in signatures:
+        for group in groups:
+            if name not in group:
+                group[name] = params
+                break
+        else:
+            groups.append({name: params})
+    return groups
@@ -1,3 +1,7 @@
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import Sequence
+
 from bmi_map._parameter import Parameter
 
 BMI = {
@@ -131,3 +135,74 @@ BMI = {
     "update": (),
     "update_until": (Parameter(name="time", intent="in", type="double"),),
 }
+
+# Batched variants of get_value, set_value and their indexed versions that
+# exchange several variables in one call. The values of the variables are
+# packed, one variable after another in the order of *names*, into a single
+# buffer. Each variable takes get_var_nbytes bytes or, for the indexed
+# versions, count * get_var_itemsize bytes (the same indices are used for
+# every variable).
+BATCHED_BMI = {
+    "get_values": (
+        Parameter(name="names", intent="in", type="array[string, n_names]"),
+        Parameter(name="dest", intent="in", type="array[any]"),
+    ),
+    "get_values_at_indices": (
+        Parameter(name="names", intent="in", type="array[string, n_names]"),
+        Parameter(name="dest", intent="in", type="array[any]"),
+        Parameter(name="inds", intent="in", type="array[int, count]"),
+    ),
+    "set_values": (
+        Parameter(name="names", intent="in", type="array[string, n_names]"),
+        Parameter(name="src", intent="in", type="array[any]"),
+    ),
+    "set_values_at_indices": (
+        Parameter(name="names", intent="in", type="array[string, n_names]"),
+        Parameter(name="inds", intent="in", type="array[int, count]"),
+        Parameter(name="src", intent="in", type="array[any]"),
+    ),
+}
+
+
+def with_batched(
+    spec: Mapping[str, Sequence[Parameter]],
+) -> Mapping[str, Sequence[Parameter]]:
+    """Add the batched functions to a spec.
+
+    The batched functions come after those of the spec, and functions
+    that the spec already defines are kept as they are. The spec's
+    functions are not accessed, so lazily validated specs stay lazy.
+
+    Examples
+    --------
+    >>> from bmi_map._bmi import BMI, with_batched
+    >>> spec = with_batched({"update": BMI["update"]})
+    >>> list(spec)[:3]
+    ['update', 'get_values', 'get_values_at_indices']
+    """
+    batched = {name: params for name, params in BATCHED_BMI.items() if name not in spec}
+    return _Extended(spec, batched)
+
+
+class _Extended(Mapping[str, Sequence[Parameter]]):
+    """A read-only view of a spec followed by extra functions."""
+
+    def __init__(
+        self,
+        spec: Mapping[str, Sequence[Parameter]],
+        extra: Mapping[str, Sequence[Parameter]],
+    ):
+        self._spec = spec
+        self._extra = extra
+
+    def __getitem__(self, name: str) -> Sequence[Parameter]:
+        if name in self._extra:
+            return self._extra[name]
+        return self._spec[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._spec
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._spec) + len(self._extra)
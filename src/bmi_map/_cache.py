@@ -0,0 +1,120 @@
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from typing import Generic
+from typing import NamedTuple
+from typing import TypeVar
+
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int | None
+    currsize: int
+
+
+class LRUCache(Generic[V]):
+    """A size-bounded, least-recently-used cache.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional
+        Maximum number of entries to hold. Use ``None`` for an unbounded
+        cache and ``0`` to disable caching.
+
+    Notes
+    -----
+    The cache can be shared by threads. Values are computed outside of
+    the cache's lock, so computing a value may itself use the cache, and
+    threads that miss on the same key at the same time each compute it.
+
+    Examples
+    --------
+    >>> from bmi_map._cache import LRUCache
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.lookup("a", lambda: 1)
+    1
+    >>> cache.lookup("a", lambda: 2)
+    1
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize: int | None = 128):
+        self._data: OrderedDict[Hashable, V] = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable, compute: Callable[[], V]) -> V:
+        """Return the cached value for *key*, computing it on a miss."""
+        if self._maxsize == 0:
+            return compute()
+
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return value
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._evict()
+
+        return value
+
+    def resize(self, maxsize: int | None) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self._maxsize,
+                currsize=len(self._data),
+            )
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def user_cache_dir() -> pathlib.Path:
+    """Return the folder in which bmi-map keeps its on-disk caches.
+
+    This is ``$BMI_MAP_CACHE_DIR``, if set, otherwise ``bmi-map`` within
+    ``$XDG_CACHE_HOME`` (or ``~/.cache``).
+    """
+    try:
+        return pathlib.Path(os.environ["BMI_MAP_CACHE_DIR"])
+    except KeyError:
+        pass
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return pathlib.Path(cache_home).expanduser() / "bmi-map"
@@ -0,0 +1,152 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from bmi_map._parameter import parse_type
+from bmi_map._parameter import validate_intent
+from bmi_map._parameter import validate_name
+from bmi_map._spec import FIELDS
+from bmi_map._spec import validate_function_name
+
+_VALIDATORS: dict[str, Callable[[str], object]] = {
+    "name": validate_name,
+    "intent": validate_intent,
+    "type": parse_type,
+}
+
+
+@dataclass(frozen=True)
+class SpecError:
+    """A problem found in a spec.
+
+    Parameters
+    ----------
+    function : str
+        Name of the function with the problem.
+    message : str
+        Description of the problem.
+    parameter : int, optional
+        Position of the parameter with the problem.
+    field : str, optional
+        Field of the parameter with the problem.
+    """
+
+    function: str
+    message: str
+    parameter: int | None = None
+    field: str | None = None
+
+    @property
+    def location(self) -> str:
+        location = self.function
+        if self.parameter is not None:
+            location += f".params[{self.parameter}]"
+        if self.field is not None:
+            location += f".{self.field}"
+        return location
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}"
+
+
+def check_spec(funcs: Mapping[str, Any], fail_fast: bool = False) -> list[SpecError]:
+    """Validate all of the functions of a spec.
+
+    Rather than stopping at the first problem, every function and every
+    parameter is checked, and all of the problems are reported.
+
+    Parameters
+    ----------
+    funcs : mapping
+        The raw ``bmi`` table of a spec.
+    fail_fast : bool, optional
+        Stop after finding the first problem.
+
+    Returns
+    -------
+    list of SpecError
+        The problems found, in the order of the spec.
+
+    Examples
+    --------
+    >>> from bmi_map._check import check_spec
+    >>> param = {"name": "a", "intent": "up", "type": "array[int, n, n]"}
+    >>> funcs = {"foo": {"params": [param]}, "bar": {}}
+    >>> for error in check_spec(funcs):
+    ...     print(error)
+    foo.params[0].intent: intent not understood (up not one of 'in', 'inout', 'out')
+    foo.params[0].type: repeated dimension (n)
+    bar: missing 'params'
+    """
+    errors = []
+    for error in iter_errors(funcs):
+        errors.append(error)
+        if fail_fast:
+            break
+    return errors
+
+
+def iter_errors(funcs: Mapping[str, Any]) -> Iterator[SpecError]:
+    """Iterate over the problems in a spec."""
+    if not isinstance(funcs, Mapping):
+        yield SpecError("bmi", "not a table")
+        return
+
+    for function, signature in funcs.items():
+        try:
+            validate_function_name(function)
+        except ValueError:
+            yield SpecError(function, "not a valid function name")
+        yield from _iter_function_errors(function, signature)
+
+
+def _iter_function_errors(function: str, signature: Any) -> Iterator[SpecError]:
+    if not isinstance(signature, Mapping) or "params" not in signature:
+        yield SpecError(function, "missing 'params'")
+        return
+
+    params = signature["params"]
+    if not isinstance(params, list):
+        yield SpecError(function, "'params' is not an array")
+        return
+
+    names: set[str] = set()
+    for index, param in enumerate(params):
+        if not isinstance(param, Mapping):
+            yield SpecError(function, "not a table", parameter=index)
+            continue
+
+        yield from _iter_param_errors(function, index, param)
+
+        name = param.get("name")
+        if isinstance(name, str):
+            if name.strip() in names:
+                yield SpecError(
+                    function,
+                    f"repeated parameter name ({name.strip()})",
+                    parameter=index,
+                    field="name",
+                )
+            names.add(name.strip())
+
+
+def _iter_param_errors(
+    function: str, index: int, param: Mapping[str, Any]
+) -> Iterator[SpecError]:
+    for key in [key for key in param if key not in _VALIDATORS]:
+        yield SpecError(function, "unknown field", parameter=index, field=key)
+
+    for field in FIELDS:
+        try:
+            value = param[field]
+        except KeyError:
+            yield SpecError(function, "missing", parameter=index, field=field)
+            continue
+        try:
+            _VALIDATORS[field](value)
+        except (AttributeError, TypeError):
+            yield SpecError(function, "not a string", parameter=index, field=field)
+        except ValueError as error:
+            yield SpecError(function, str(error), parameter=index, field=field)
@@ -0,0 +1,176 @@
+"""A compact binary format for specs.
+
+A compiled spec is laid out, with all integers little-endian, as
+
+* a header: the magic bytes ``BMISPEC\\0``, the format version, and the
+  numbers of strings, functions and parameters,
+* the byte offsets of each string in the string data (one more offset
+  than there are strings),
+* one fixed-width record per function: the index of its name in the
+  string table, the index of its first parameter, and its number of
+  parameters,
+* one fixed-width record per parameter: the indices of its name, intent
+  and type in the string table,
+* the string data, each distinct string stored once as UTF-8.
+
+Records are read on demand, so loading a compiled spec only costs
+reading its header, and a function's parameters are only created when
+the function is accessed.
+"""
+import itertools
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+from bmi_map._output import default_file_mode
+from bmi_map._parameter import Parameter
+from bmi_map._timing import phase
+
+MAGIC = b"BMISPEC\0"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHxxIII")
+_FUNCTION = struct.Struct("<III")
+_PARAMETER = struct.Struct("<III")
+
+
+class CompiledSpec(Mapping[str, tuple[Parameter, ...]]):
+    """A spec read from the compiled binary format.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap
+        The compiled spec.
+
+    Examples
+    --------
+    >>> from bmi_map._compiled import CompiledSpec, compile_spec
+    >>> from bmi_map._parameter import Parameter
+    >>> data = compile_spec({"update": (), "get_x": (Parameter("x", "out", "int"),)})
+    >>> spec = CompiledSpec(data)
+    >>> list(spec)
+    ['update', 'get_x']
+    >>> spec["get_x"]
+    (Parameter(name='x', intent='out', type='int'),)
+    """
+
+    def __init__(self, buffer: bytes | bytearray | mmap.mmap):
+        if len(buffer) < _HEADER.size:
+            raise ValueError("not a compiled spec (file is too short)")
+        magic, version, n_strings, n_functions, n_params = _HEADER.unpack_from(
+            buffer, 0
+        )
+        if magic != MAGIC:
+            raise ValueError("not a compiled spec")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported compiled spec version ({version})")
+
+        self._functions_start = _HEADER.size + 4 * (n_strings + 1)
+        self._params_start = self._functions_start + _FUNCTION.size * n_functions
+        self._strings_start = self._params_start + _PARAMETER.size * n_params
+
+        start, end = _HEADER.size, self._functions_start
+        offsets = array("I", buffer[start:end])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        if len(buffer) < self._strings_start + (offsets[-1] if offsets else 0):
+            raise ValueError("compiled spec is truncated")
+
+        self._buffer = buffer
+        self._offsets = offsets
+        self._n_functions = n_functions
+        self._strings: list[str | None] = [None] * n_strings
+        self._index: dict[str, int] | None = None
+        self._params: dict[str, tuple[Parameter, ...]] = {}
+
+    def __getitem__(self, name: str) -> tuple[Parameter, ...]:
+        try:
+            return self._params[name]
+        except KeyError:
+            pass
+        if self._index is None:
+            self._index = {name: index for index, name in enumerate(self)}
+
+        _, first, count = _FUNCTION.unpack_from(
+            self._buffer, self._functions_start + _FUNCTION.size * self._index[name]
+        )
+        start = self._params_start + _PARAMETER.size * first
+        end = start + _PARAMETER.size * count
+        with phase("validate"):
+            params = self._params[name] = tuple(
+                Parameter(*(self._string(index) for index in indices))
+                for indices in _PARAMETER.iter_unpack(self._buffer[start:end])
+            )
+        return params
+
+    def __iter__(self) -> Iterator[str]:
+        start, end = self._functions_start, self._params_start
+        for name, _, _ in _FUNCTION.iter_unpack(self._buffer[start:end]):
+            yield self._string(name)
+
+    def __len__(self) -> int:
+        return self._n_functions
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def _string(self, index: int) -> str:
+        string = self._strings[index]
+        if string is None:
+            start = self._strings_start + self._offsets[index]
+            end = self._strings_start + self._offsets[index + 1]
+            string = self._strings[index] = str(self._buffer[start:end], "utf-8")
+        return string
+
+
+def compile_spec(spec: Mapping[str, Sequence[Parameter]]) -> bytes:
+    """Compile a spec into the binary format."""
+    strings: dict[str, int] = {}
+    functions = array("I")
+    params = array("I")
+    for name, func_params in spec.items():
+        functions.extend(
+            (strings.setdefault(name, len(strings)), len(params) // 3, len(func_params))
+        )
+        for param in func_params:
+            params.extend(
+                strings.setdefault(value, len(strings))
+                for value in (param.name, param.intent, param.type)
+            )
+
+    data = [string.encode() for string in strings]
+    offsets = array("I", itertools.accumulate(map(len, data), initial=0))
+    if sys.byteorder == "big":
+        for table in (offsets, functions, params):
+            table.byteswap()
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(strings), len(functions) // 3, len(params) // 3
+    )
+    return b"".join(
+        [header, offsets.tobytes(), functions.tobytes(), params.tobytes(), *data]
+    )
+
+
+def dump(spec: Mapping[str, Sequence[Parameter]], path: str | os.PathLike[str]) -> None:
+    """Write a compiled spec to a file, replacing it atomically."""
+    path = pathlib.Path(path)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as fp:
+        fp.write(compile_spec(spec))
+    os.chmod(fp.name, default_file_mode())
+    os.replace(fp.name, path)
+
+
+def open_compiled(path: str | os.PathLike[str]) -> CompiledSpec:
+    """Memory-map a compiled spec file."""
+    with open(path, "rb") as fp:
+        return CompiledSpec(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
@@ -1,85 +1,736 @@
+from __future__ import annotations
+
 import argparse
-import re
+import importlib.util
+import os
 import sys
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from collections.abc import Sequence
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from functools import cache
 from functools import partial
 from typing import Any
+from typing import TYPE_CHECKING
 
 from bmi_map._bmi import BMI
-from bmi_map.bmi_map import bmi_map
+from bmi_map._bmi import with_batched
+from bmi_map._parameter import Parameter
+from bmi_map._registry import BUILTIN_MAPPERS
+from bmi_map._registry import find_mapper
+from bmi_map._spec import filter_spec
+from bmi_map._timing import phase
+from bmi_map._timing import Timings
+from bmi_map.bmi_map import _iter_map_spec
+from bmi_map.bmi_map import _iter_toml
 from bmi_map.bmi_map import load
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_info
+from bmi_map.bmi_map import set_mapper_options
+from bmi_map.bmi_map import set_output_cache
 
-try:
-    import pygments
-    import pygments.lexers
-    from pygments.formatters import TerminalTrueColorFormatter
-
-    with_pygments = True
-except ImportError:
-    with_pygments = False
+if TYPE_CHECKING:
+    from bmi_map._output_cache import OutputCache
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     argv = argv if argv is not None else sys.argv[1:]
 
-    parser = argparse.ArgumentParser()
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        epilog=f"other commands: {', '.join(COMMANDS)} (see bmi-map COMMAND --help)"
+    )
     parser.add_argument(
         "--spec",
-        type=argparse.FileType("rb"),
-        help="spec file from which to read function specifications",
+        action="append",
+        help=(
+            "spec file, or glob pattern of spec files, from which to read"
+            " function specifications (may be repeated)"
+        ),
         default=None,
     )
     parser.add_argument(
         "--to",
-        help="language for which to generate mappings",
-        choices=("c", "c++", "fortran", "python", "sidl"),
-        default="sidl",
+        help=(
+            "language, or languages, for which to generate mappings"
+            f" ({', '.join(BUILTIN_MAPPERS)} or one added by a plugin)"
+        ),
+        metavar="LANGUAGE",
+        nargs="+",
+        action="extend",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "keep validated specs and mapped functions in on-disk caches"
+            " (default: $BMI_MAP_SPEC_CACHE and $BMI_MAP_OUTPUT_CACHE)"
+        ),
     )
     parser.add_argument("--include", default=".*", help="Functions to include")
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help=(
+            "add batched functions (get_values, set_values and their"
+            " _at_indices versions) that exchange several variables per call"
+        ),
+    )
+    parser.add_argument(
+        "--cxx-style",
+        choices=("classic", "zero-copy"),
+        default=None,
+        help=(
+            "how C++ functions pass strings and arrays: as std::string and"
+            " pointers (classic, the default) or as std::string_view and"
+            " std::span (zero-copy)"
+        ),
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="file to which to write mapped functions (default: stdout)",
+    )
+    output.add_argument(
+        "--output-dir",
+        default=None,
+        help="folder to which to write mapped functions, one file per function",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="watch the spec file and regenerate functions when it changes",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=_non_negative_int,
+        default=None,
+        help="number of workers used to map functions (0 means one per CPU)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=("auto", "process", "thread"),
+        default="auto",
+        help="kind of worker pool used with --jobs",
+    )
     parser.add_argument(
         "--color",
         choices=("always", "auto", "never"),
         default="auto",
         help="When to use syntax highlighting.",
     )
+    parser.add_argument(
+        "--color-depth",
+        choices=("auto", "256", "truecolor"),
+        default="auto",
+        help="Colors used for syntax highlighting.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print the time spent in each phase of the run to stderr",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="profile the run with cProfile and save the statistics to PATH",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.spec is not None:
+        args.spec = _expand_specs(parser, args.spec)
+    _check_languages(parser, args.to)
+    _check_outputs(parser, args)
+
+    if args.cxx_style is None:
+        return _generate(args)
+
+    set_mapper_options("c++", style=args.cxx_style)
+    try:
+        return _generate(args)
+    finally:
+        set_mapper_options("c++")
+
+
+def _generate(args: argparse.Namespace) -> int:
+    if args.watch:
+        from bmi_map._watch import SpecWatcher
+
+        SpecWatcher(
+            args.spec[0],
+            args.output_dir,
+            to=args.to or ["sidl"],
+            select=partial(_select, include=args.include, batched=args.batched),
+        ).run()
+        return 0
+
+    output_cache = _open_output_cache(args.cache)
+    set_output_cache(output_cache)
+
+    try:
+        with _timer(args.timings) as timings:
+            with phase("run"):
+                if args.profile is None:
+                    status = _run(args)
+                else:
+                    status = _profile(_run, args, path=args.profile)
+    finally:
+        if output_cache is not None:
+            set_output_cache(None)
+            output_cache.close()
+
+    if timings is not None:
+        timings.report(sys.stderr)
+        _report_cache_stats(sys.stderr, output_cache)
+
+    return status
+
+
+def _non_negative_int(value: str) -> int:
+    n = int(value)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {n}")
+    return n
+
+
+def _expand_specs(parser: argparse.ArgumentParser, patterns: list[str]) -> list[str]:
+    from bmi_map._batch import expand_spec_paths
+
+    paths = expand_spec_paths(patterns)
+    for path in paths:
+        if path != "-" and not os.path.isfile(path):
+            parser.error(f"argument --spec: can't open {path!r}")
+    return paths
+
+
+def _check_languages(
+    parser: argparse.ArgumentParser, languages: list[str] | None
+) -> None:
+    # Plugins are only looked for if a language isn't built in.
+    for language in languages or ():
+        try:
+            find_mapper(language)
+        except ValueError as error:
+            parser.error(f"argument --to: {error}")
+
+
+def _check_outputs(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    n_specs = 0 if args.spec is None else len(args.spec)
+
+    if args.watch and (n_specs != 1 or args.output_dir is None):
+        parser.error("--watch requires a single --spec and --output-dir")
+    if n_specs > 1 and args.output_dir is None:
+        parser.error("several specs require --output-dir")
+    if n_specs > 1 and len(set(_spec_dirs(args.spec))) < n_specs:
+        parser.error("spec files must have different names")
+
+
+def _profile(func: Callable[..., int], *args: Any, path: str) -> int:
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
+
+
+def _timer(enabled: bool) -> AbstractContextManager[Timings | None]:
+    if enabled:
+        return Timings()
+    return nullcontext()
+
+
+def _open_output_cache(cache: bool | None) -> OutputCache | None:
+    if cache is False:
+        return None
+
+    from bmi_map._output_cache import output_cache_enabled
+    from bmi_map._output_cache import OutputCache
+
+    if cache is None and not output_cache_enabled():
+        return None
+    return OutputCache()
+
+
+def _run(args: argparse.Namespace) -> int:
+    if args.spec is not None and len(args.spec) > 1:
+        return _run_batch(args)
+
+    color = args.color if _has_pygments() else "never"
+
+    spec = BMI if args.spec is None else _load_spec(args.spec[0], cache=args.cache)
+
+    with phase("filter"):
+        funcs = _select(spec, include=args.include, batched=args.batched)
+
+    languages = tuple(dict.fromkeys(args.to or ["sidl"]))
+
+    if args.jobs is None or args.jobs == 1:
+        mapped = None
+    else:
+        from bmi_map._parallel import map_specs_parallel
+
+        with phase("map"):
+            (mapped,) = map_specs_parallel(
+                [funcs], to=languages, jobs=args.jobs, executor=args.executor
+            )
+
+    with phase("write"):
+        _write(args, funcs, languages, mapped, color)
+
+    return 0
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    from bmi_map._batch import map_spec_batch
+    from bmi_map._output import write_functions
+
+    specs = []
+    for path in args.spec:
+        spec = _load_spec(path, cache=args.cache)
+        with phase("filter"):
+            specs.append(_select(spec, include=args.include, batched=args.batched))
+
+    languages = tuple(dict.fromkeys(args.to or ["sidl"]))
+    mapped, stats = map_spec_batch(
+        specs,
+        to=languages,
+        jobs=None if args.jobs == 1 else args.jobs,
+        executor=args.executor,
+    )
+
+    with phase("write"):
+        for spec_dir, funcs in zip(_spec_dirs(args.spec), mapped, strict=True):
+            write_functions(
+                os.path.join(args.output_dir, spec_dir),
+                (
+                    (language, name, text)
+                    for language in languages
+                    for name, text in funcs[language].items()
+                ),
+            )
+
+    print(f"bmi-map: {stats}", file=sys.stderr)
+
+    return 0
+
+
+def _select(
+    spec: Mapping[str, Sequence[Parameter]], include: str, batched: bool = False
+) -> dict[str, Sequence[Parameter]]:
+    return filter_spec(with_batched(spec) if batched else spec, include=include)
+
+
+def _load_spec(
+    path: str, cache: bool | None = None
+) -> Mapping[str, Sequence[Parameter]]:
+    if path == "-":
+        return load(sys.stdin.buffer, lazy=True, cache=cache)
+    with open(path, "rb") as stream:
+        return load(stream, lazy=True, cache=cache)
+
+
+def _spec_dirs(paths: Sequence[str]) -> list[str]:
+    """Names of the output folders, one per spec file."""
+    return [os.path.splitext(os.path.basename(path))[0] for path in paths]
+
+
+def _write(
+    args: argparse.Namespace,
+    funcs: Mapping[str, Sequence[Parameter]],
+    languages: Sequence[str],
+    mapped: Mapping[str, Mapping[str, str]] | None,
+    color: str,
+) -> None:
+    if args.output_dir is not None:
+        from bmi_map._output import write_functions
+
+        write_functions(args.output_dir, _iter_functions(funcs, languages, mapped))
+    elif args.output is not None:
+        from bmi_map._output import AtomicWriter
+        from bmi_map._output import write_blocks
+
+        with AtomicWriter(args.output) as fp:
+            write_blocks(fp, _iter_blocks(funcs, languages, mapped))
+    else:
+        from bmi_map._output import write_blocks
+
+        if color == "always" or (color == "auto" and sys.stdout.isatty()):
+            highlight = partial(_highlight, depth=args.color_depth)
+        else:
+            highlight = None
+        write_blocks(
+            sys.stdout, _iter_blocks(funcs, languages, mapped), highlight=highlight
+        )
+
+
+def _report_cache_stats(file, output_cache: OutputCache | None = None) -> None:
+    from bmi_map._parameter import parse_type
+
+    mapping = mapping_cache_info()
+    types = parse_type.cache_info()
+    caches = [
+        ("mapping", mapping.hits, mapping.misses),
+        ("type", types.hits, types.misses),
+    ]
+    if output_cache is not None:
+        caches.append(("output", output_cache.hits, output_cache.misses))
+    for name, hits, misses in caches:
+        rate = 100 * hits / (hits + misses) if hits + misses else 0.0
+        print(
+            f"{name} cache: {hits} hits, {misses} misses ({rate:.1f}% hit rate)",
+            file=file,
+        )
+
+
+def _serve(argv: Sequence[str]) -> int:
+    from bmi_map._server import default_socket_path
+    from bmi_map._server import serve_stdio
+    from bmi_map._server import serve_unix
+
+    parser = argparse.ArgumentParser(
+        prog="bmi-map serve",
+        description="Map functions for clients, keeping parsed specs in memory.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help=(
+            "Unix domain socket on which to listen"
+            f" (default: {default_socket_path()})"
+        ),
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="read JSON-lines requests from stdin rather than a socket",
+    )
+    args = parser.parse_args(argv)
+
+    if args.stdio:
+        serve_stdio(sys.stdin, sys.stdout)
+        return 0
+
+    try:
+        serve_unix(args.socket or default_socket_path())
+    except FileExistsError as error:
+        print(f"bmi-map serve: {error}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def _client(argv: Sequence[str]) -> int:
+    from bmi_map._output import write_blocks
+    from bmi_map._server import request
+
+    parser = argparse.ArgumentParser(
+        prog="bmi-map client",
+        description=(
+            "Map functions with a running bmi-map server, or in this process"
+            " if no server is running."
+        ),
+    )
+    parser.add_argument("--socket", default=None, help="socket of the server")
+    parser.add_argument("--spec", default=None, help="spec file to map")
+    parser.add_argument("--include", default=".*", help="Functions to include")
+    parser.add_argument(
+        "--to",
+        help="language, or languages, for which to generate mappings",
+        nargs="+",
+        action="extend",
+        default=None,
+    )
+    args = parser.parse_args(argv)
+
+    response = request(
+        {
+            "spec": None if args.spec is None else os.path.abspath(args.spec),
+            "include": args.include,
+            "to": args.to or ["sidl"],
+        },
+        path=args.socket,
+    )
+    if not response["ok"]:
+        print(f"error: {response['error']}", file=sys.stderr)
+        return 1
+
+    write_blocks(
+        sys.stdout,
+        ((language, funcs.values()) for language, funcs in response["result"].items()),
+    )
+
+    return 0
+
 
+def _cache(argv: Sequence[str]) -> int:
+    from bmi_map._output_cache import OutputCache
+    from bmi_map._spec_cache import SpecCache
+
+    parser = argparse.ArgumentParser(
+        prog="bmi-map cache",
+        description="Show statistics of, or empty, the on-disk caches.",
+    )
+    parser.add_argument("action", choices=("stats", "clear"))
+    args = parser.parse_args(argv)
+
+    with OutputCache() as output_cache:
+        spec_cache = SpecCache()
+        if args.action == "clear":
+            output_cache.clear()
+            spec_cache.clear()
+            return 0
+
+        stats = output_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        print(f"output cache: {output_cache.path}")
+        print(f"  entries: {stats['entries']}")
+        print(
+            f"  size: {_format_bytes(stats['bytes'])}"
+            f" (max {_format_bytes(output_cache.max_bytes)})"
+        )
+        print(
+            f"  hits: {stats['hits']}, misses: {stats['misses']}"
+            f" ({100 * stats['hits'] / lookups if lookups else 0.0:.1f}% hit rate)"
+        )
+        print(f"spec cache: {spec_cache.path}")
+        print(f"  entries: {len(spec_cache)}")
+        print(
+            f"  size: {_format_bytes(spec_cache.size())}"
+            f" (max {_format_bytes(spec_cache.max_bytes)})"
+        )
+
+    return 0
+
+
+def _format_bytes(n_bytes: int) -> str:
+    size = float(n_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _compile(argv: Sequence[str]) -> int:
+    from bmi_map._compiled import dump
+
+    parser = argparse.ArgumentParser(
+        prog="bmi-map compile",
+        description="Compile a spec into a binary file that loads quickly.",
+    )
+    parser.add_argument(
+        "spec", type=argparse.FileType("rb"), help="spec file to compile"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="file to write (default: the spec file with a .bmispec extension)",
+    )
     args = parser.parse_args(argv)
 
-    color = args.color if with_pygments else "never"
+    try:
+        spec = load(args.spec, cache=False)
+    except ValueError as error:
+        print(f"{args.spec.name}: {error}", file=sys.stderr)
+        return 1
 
-    spec = BMI if args.spec is None else load(args.spec)
+    dump(spec, args.output or os.path.splitext(args.spec.name)[0] + ".bmispec")
 
-    funcs = _filter_keys(spec, include=args.include)
+    return 0
 
-    mapped_funcs = (bmi_map(func, params, to=args.to) for func, params in funcs.items())
 
-    if color == "always" or (color == "auto" and sys.stdout.isatty()):
-        highlight = Highlighter(args.to)
-        mapped_funcs = (highlight(mapped_func) for mapped_func in mapped_funcs)
+def _synth(argv: Sequence[str]) -> int:
+    from bmi_map._synth import synth_spec
 
-    print("\n".join(mapped_funcs))
+    parser = argparse.ArgumentParser(
+        prog="bmi-map synth",
+        description="Generate a large, valid spec for load and scaling tests.",
+    )
+    parser.add_argument(
+        "--functions", "-n", type=int, default=1000, help="number of functions"
+    )
+    parser.add_argument(
+        "--params-per-func",
+        "-k",
+        type=int,
+        default=3,
+        help="number of parameters of each function",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seed for a reproducible spec"
+    )
+    parser.add_argument(
+        "--output", "-o", default=None, help="file to write (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.functions < 0 or args.params_per_func < 0:
+        parser.error("numbers of functions and parameters must not be negative")
+
+    spec = synth_spec(args.functions, args.params_per_func, seed=args.seed)
+    if args.output is None:
+        sys.stdout.writelines(_iter_toml(spec))
+    else:
+        from bmi_map._output import AtomicWriter
+
+        with AtomicWriter(args.output) as fp:
+            for chunk in _iter_toml(spec):
+                fp.write(chunk)
 
     return 0
 
 
-def _filter_keys(d: dict[str, Any], include: str = ".*") -> dict[str, Any]:
-    pattern = re.compile(include)
-    return {k: v for k, v in d.items() if pattern.search(k)}
+def _check(argv: Sequence[str]) -> int:
+    import tomllib
+
+    from bmi_map._check import check_spec
+    from bmi_map._check import SpecError
+
+    parser = argparse.ArgumentParser(
+        prog="bmi-map check",
+        description="Validate a spec file, reporting all of its problems.",
+    )
+    parser.add_argument(
+        "--spec",
+        type=argparse.FileType("rb"),
+        required=True,
+        help="spec file to validate",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop at the first problem",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        document = tomllib.load(args.spec)
+    except tomllib.TOMLDecodeError as error:
+        print(f"{args.spec.name}: {error}")
+        return 1
+
+    if "bmi" in document:
+        errors = check_spec(document["bmi"], fail_fast=args.fail_fast)
+    else:
+        errors = [SpecError("bmi", "missing table")]
+    for problem in errors:
+        print(f"{args.spec.name}: {problem}")
+
+    return 1 if errors else 0
+
+
+COMMANDS = {
+    "cache": _cache,
+    "check": _check,
+    "compile": _compile,
+    "synth": _synth,
+    "serve": _serve,
+    "client": _client,
+}
+
+
+def _iter_functions(
+    funcs: Mapping[str, Sequence[Parameter]],
+    languages: Sequence[str],
+    mapped: Mapping[str, Mapping[str, str]] | None = None,
+) -> Iterator[tuple[str, str, str]]:
+    if mapped is None:
+        yield from _iter_map_spec(funcs, languages)
+    else:
+        for language in languages:
+            for name, text in mapped[language].items():
+                yield language, name, text
+
+
+def _iter_blocks(
+    funcs: Mapping[str, Sequence[Parameter]],
+    languages: Sequence[str],
+    mapped: Mapping[str, Mapping[str, str]] | None = None,
+) -> Iterator[tuple[str, Iterable[str]]]:
+    if mapped is None and len(languages) > 1:
+        # Blocks are written one language after another so, rather than
+        # walking the spec once per block, map every language in one walk.
+        mapped = map_spec(funcs, languages)
+    for language in languages:
+        yield language, (
+            text for _, _, text in _iter_functions(funcs, (language,), mapped)
+        )
+
+
+def _has_pygments() -> bool:
+    return importlib.util.find_spec("pygments") is not None
 
 
 class Highlighter:
-    def __init__(self, language: str):
+    """Syntax highlight mapped functions for a terminal.
+
+    Parameters
+    ----------
+    language : str
+        Language of the text to highlight.
+    depth : {"auto", "256", "truecolor"}, optional
+        Colors supported by the terminal. ``"auto"`` uses true color if
+        the ``COLORTERM`` environment variable says it is supported.
+    """
+
+    def __init__(self, language: str, depth: str = "auto"):
+        import pygments.lexers
+        from pygments.formatters import Terminal256Formatter
+        from pygments.formatters import TerminalTrueColorFormatter
+        from pygments.util import ClassNotFound
+
         if language == "sidl":
             language = "java"
+        if depth == "auto":
+            depth = _terminal_color_depth()
+
+        try:
+            lexer_class = pygments.lexers.find_lexer_class_by_name(language)
+        except ClassNotFound:
+            lexer_class = pygments.lexers.TextLexer
+        self._lexer = lexer_class(ensurenl=False)
+        if depth == "truecolor":
+            self._formatter = TerminalTrueColorFormatter()
+        else:
+            self._formatter = Terminal256Formatter()
+
+    def __call__(self, text: str) -> str:
+        import pygments
+
+        return pygments.highlight(text, self._lexer, self._formatter)
+
+
+def _highlight(language: str, text: str, depth: str = "auto") -> str:
+    with phase("highlight", language):
+        return get_highlighter(language, depth)(text)
+
+
+@cache
+def get_highlighter(language: str, depth: str = "auto") -> Highlighter:
+    """Return a shared Highlighter for a language and color depth."""
+    return Highlighter(language, depth=depth)
 
-        self._highlight = partial(
-            pygments.highlight,
-            lexer=pygments.lexers.find_lexer_class_by_name(language)(ensurenl=False),
-            formatter=TerminalTrueColorFormatter(),
-        )
 
-    def __call__(self, line: str) -> str:
-        return self._highlight(line)
+def _terminal_color_depth() -> str:
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return "truecolor"
+    else:
+        return "256"
 
 
 if __name__ == "__main__":
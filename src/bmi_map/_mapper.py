@@ -1,8 +1,153 @@
 from collections.abc import Sequence
+from typing import Any
+from typing import NamedTuple
 
 from bmi_map._parameter import Parameter
+from bmi_map._parameter import TypeSpec
+from bmi_map._parameter import VALID_INTENTS
+
+
+class Signature(NamedTuple):
+    """A BMI function with its parameters split by intent.
+
+    The split is language independent so it is done once and then shared
+    by every mapper.
+    """
+
+    name: str
+    params: tuple[Parameter, ...]
+    inputs: tuple[Parameter, ...]
+    outputs: tuple[Parameter, ...]
+    returns: tuple[Parameter, ...]
+
+    @classmethod
+    def from_params(cls, name: str, params: Sequence[Parameter]) -> "Signature":
+        params = tuple(params)
+        return cls(
+            name=name,
+            params=params,
+            inputs=tuple(p for p in params if p.intent.startswith("in")),
+            outputs=tuple(p for p in params if p.intent.endswith("out")),
+            returns=tuple(p for p in params if p.intent == "out"),
+        )
 
 
 class LanguageMapper:
+    extension = ".txt"
+
+    @classmethod
+    def from_options(cls, **options: Any) -> "LanguageMapper":
+        """Create a mapper from the options set for its language.
+
+        Mappers whose options select a different class override this.
+        """
+        return cls(**options)
+
     def map(self, name: str, params: Sequence[Parameter]) -> str:
-        raise NotImplementedError("map")
+        return self.map_signature(Signature.from_params(name, params))
+
+    def map_signature(self, signature: Signature) -> str:
+        raise NotImplementedError("map_signature")
+
+
+class TableMapper(LanguageMapper):
+    """A mapper that renders parameters from precomputed tables.
+
+    Subclasses declare how each type is spelled in their language and
+    implement :meth:`param_template`. When a subclass is created these
+    are expanded into tables keyed on ``(intent, isarray, dtype)``, so
+    mapping a parameter is a single lookup followed by formatting. The
+    tables are never changed after that, so mappers hold no mutable
+    state and can be shared by any number of threads.
+
+    Templates may use the fields ``{name}``, the parameter name,
+    ``{dims}``, each dimension rendered with :attr:`dim_template`, and
+    ``{rank}``, the number of dimensions rendered with
+    :attr:`rank_template` (or nothing for an array without dimensions).
+
+    Attributes
+    ----------
+    scalar_types : dict
+        Spelling of each scalar type.
+    array_types : dict
+        Spelling of an array of each element type.
+    dim_template : str
+        Template for each array dimension, with a ``{dim}`` field.
+    rank_template : str
+        Template for the number of array dimensions, with a ``{rank}``
+        field.
+    leading : tuple of str
+        Parameters that come before those of every function.
+    """
+
+    scalar_types: dict[str, str] = {}
+    array_types: dict[str, str] = {}
+    dim_template = ""
+    rank_template = ""
+    leading: tuple[str, ...] = ()
+
+    _type_table: dict[tuple[bool, str], str]
+    _param_table: dict[tuple[str, bool, str], str]
+
+    def __init_subclass__(cls, **kwds):
+        super().__init_subclass__(**kwds)
+        cls._type_table = {
+            (False, dtype): type_ for dtype, type_ in cls.scalar_types.items()
+        } | {(True, dtype): type_ for dtype, type_ in cls.array_types.items()}
+        cls._param_table = {
+            (intent, isarray, dtype): cls.param_template(intent, isarray, dtype, type_)
+            for (isarray, dtype), type_ in cls._type_table.items()
+            for intent in sorted(VALID_INTENTS)
+        }
+
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        """Return the template for a parameter.
+
+        This is called once for every table entry when the subclass is
+        created, never while mapping.
+
+        Parameters
+        ----------
+        intent : str
+            Intent of the parameter.
+        isarray : bool
+            If the parameter is an array.
+        dtype : str
+            The scalar type, or the element type of an array.
+        type_ : str
+            The spelling of the type from the type table.
+        """
+        raise NotImplementedError("param_template")
+
+    @classmethod
+    def _render(cls, template: str, name: str, type_spec: TypeSpec) -> str:
+        if type_spec.dims:
+            return template.format(
+                name=name,
+                dims="".join(
+                    cls.dim_template.format(dim=dim) for dim in type_spec.dims
+                ),
+                rank=cls.rank_template.format(rank=len(type_spec.dims)),
+            )
+        else:
+            return template.format(name=name, dims="", rank="")
+
+    @classmethod
+    def map_type(cls, type_spec: TypeSpec) -> str:
+        return cls._render(
+            cls._type_table[type_spec.isarray, type_spec.dtype], "", type_spec
+        )
+
+    @classmethod
+    def map_param(cls, param: Parameter) -> str:
+        type_spec = param.type_spec
+        return cls._render(
+            cls._param_table[param.intent, type_spec.isarray, type_spec.dtype],
+            param.name,
+            type_spec,
+        )
+
+    @classmethod
+    def map_params(cls, params: Sequence[Parameter]) -> str:
+        return ", ".join(cls.leading + tuple(cls.map_param(p) for p in params))
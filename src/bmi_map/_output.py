@@ -0,0 +1,215 @@
+import hashlib
+import os
+import pathlib
+import tempfile
+from collections.abc import Callable
+from collections.abc import Iterable
+from functools import cache
+from itertools import islice
+from types import TracebackType
+from typing import IO
+
+from bmi_map.bmi_map import get_mapper
+
+
+class AtomicWriter:
+    """Write a file through a temporary file that replaces it on close.
+
+    Text is streamed to a buffered temporary file next to the target while
+    its hash is computed. On close, the target is replaced only if its
+    contents differ, so unchanged files keep their timestamps. If an
+    exception is raised, the target is left untouched.
+
+    Parameters
+    ----------
+    path : path-like
+        File to write.
+
+    Examples
+    --------
+    >>> import pathlib, tempfile
+    >>> from bmi_map._output import AtomicWriter
+    >>> path = pathlib.Path(tempfile.mkdtemp()) / "bmi.h"
+    >>> with AtomicWriter(path) as fp:
+    ...     fp.write("int update(void* self);\\n")
+    >>> fp.changed
+    True
+    >>> with AtomicWriter(path) as fp:
+    ...     fp.write("int update(void* self);\\n")
+    >>> fp.changed
+    False
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self._path = pathlib.Path(path)
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._tmp: IO[bytes] | None = None
+        self.changed = False
+
+    def __enter__(self) -> "AtomicWriter":
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = tempfile.NamedTemporaryFile(
+            dir=self._path.parent,
+            prefix=f".{self._path.name}.",
+            suffix=".tmp",
+            delete=False,
+        )
+        return self
+
+    def write(self, text: str) -> None:
+        assert self._tmp is not None
+        data = text.encode()
+        self._hash.update(data)
+        self._size += len(data)
+        self._tmp.write(data)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._tmp is not None
+        self._tmp.close()
+        if exc_type is None and not self._matches_target():
+            os.chmod(self._tmp.name, default_file_mode())
+            os.replace(self._tmp.name, self._path)
+            self.changed = True
+        else:
+            os.unlink(self._tmp.name)
+
+    def _matches_target(self) -> bool:
+        try:
+            if self._path.stat().st_size != self._size:
+                return False
+            with open(self._path, "rb") as fp:
+                return hashlib.file_digest(fp, "sha256").digest() == self._hash.digest()
+        except FileNotFoundError:
+            return False
+
+
+@cache
+def default_file_mode() -> int:
+    """Return the permissions of a newly created file, as set by the umask.
+
+    Temporary files are only readable by their owner so this is applied to
+    them before they replace their target. The mode is read from a probe
+    file since querying the umask with :func:`os.umask` would change it
+    for all threads of the process.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        probe = os.path.join(tmp_dir, "probe")
+        os.close(os.open(probe, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        return os.stat(probe).st_mode & 0o777
+
+
+def write_if_changed(path: str | os.PathLike[str], text: str) -> bool:
+    """Atomically write text to a file unless the file already holds it.
+
+    Parameters
+    ----------
+    path : path-like
+        File to write.
+    text : str
+        New contents of the file.
+
+    Returns
+    -------
+    bool
+        ``True`` if the file was written, ``False`` if it was unchanged.
+    """
+    with AtomicWriter(path) as fp:
+        fp.write(text)
+    return fp.changed
+
+
+def write_blocks(
+    fp: IO[str] | AtomicWriter,
+    blocks: Iterable[tuple[str, Iterable[str]]],
+    highlight: Callable[[str, str], str] | None = None,
+    chunk_size: int = 256,
+) -> None:
+    """Stream blocks of mapped functions, separated by blank lines.
+
+    Parameters
+    ----------
+    fp : file-like
+        Stream to which to write.
+    blocks : iterable of (str, iterable of str)
+        Language of each block and its mapped functions.
+    highlight : callable, optional
+        Function that takes a language and some text and returns the text
+        highlighted. Functions are highlighted in chunks of *chunk_size*.
+    chunk_size : int, optional
+        Number of functions that are joined before being written.
+    """
+    for n_block, (language, lines) in enumerate(blocks):
+        if n_block > 0:
+            fp.write("\n\n")
+        for n_chunk, chunk in enumerate(_batched(lines, chunk_size)):
+            text = "\n".join(chunk)
+            if highlight is not None:
+                text = highlight(language, text)
+            if n_chunk > 0:
+                fp.write("\n")
+            fp.write(text)
+    fp.write("\n")
+
+
+def function_path(
+    output_dir: str | os.PathLike[str], language: str, name: str
+) -> pathlib.Path:
+    """Return the file, within an output folder, of a mapped function.
+
+    Raises a :class:`ValueError` if the function's name would place the
+    file anywhere other than directly within the language's folder.
+    """
+    folder = pathlib.Path(os.path.normpath(pathlib.Path(output_dir) / language))
+    path = folder / f"{name}{get_mapper(language).extension}"
+    if pathlib.Path(os.path.normpath(path)).parent != folder:
+        raise ValueError(f"function name is not valid ({name!r})")
+    return path
+
+
+def write_functions(
+    output_dir: str | os.PathLike[str], mapped: Iterable[tuple[str, str, str]]
+) -> list[pathlib.Path]:
+    """Write mapped functions, one file each, to an output folder.
+
+    Parameters
+    ----------
+    output_dir : path-like
+        Folder to which to write the functions.
+    mapped : iterable of (str, str, str)
+        Language, function name, and mapped function. Each function is
+        written as it is produced.
+
+    Returns
+    -------
+    list of Path
+        The files that were written. Files that already held their
+        function are not touched.
+    """
+    return [
+        path
+        for language, name, text in mapped
+        if write_if_changed(
+            path := function_path(output_dir, language, name), text + "\n"
+        )
+    ]
+
+
+def remove_functions(
+    output_dir: str | os.PathLike[str], languages: Iterable[str], names: Iterable[str]
+) -> None:
+    """Remove the files of mapped functions from an output folder."""
+    for language in languages:
+        for name in names:
+            function_path(output_dir, language, name).unlink(missing_ok=True)
+
+
+def _batched(iterable: Iterable[str], size: int) -> Iterable[tuple[str, ...]]:
+    it = iter(iterable)
+    while batch := tuple(islice(it, size)):
+        yield batch
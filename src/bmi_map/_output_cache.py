@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from types import TracebackType
+
+from bmi_map._cache import user_cache_dir
+from bmi_map._parameter import Parameter
+from bmi_map._version import __version__
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS mapped (
+    key BLOB PRIMARY KEY,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    atime INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mapped_atime ON mapped (atime);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class OutputCache:
+    """An on-disk cache of mapped specs shared between processes.
+
+    Each entry holds all of the functions of a spec mapped to one
+    language, so that a warm run costs a single hash of the spec and one
+    query per language rather than one of each per function. Entries are
+    keyed by a hash of the mapper, the spec's function names and
+    parameters, and the version of bmi-map, and are kept in a SQLite
+    database so that concurrent processes can safely share the cache.
+    Lookups read the database directly but new entries, and the access
+    times of entries that were read, are written in a single transaction
+    by :meth:`flush`. Once the total size of the cache exceeds
+    *max_bytes*, the least recently used entries are removed.
+
+    Errors from the database are never raised; the cache then behaves as
+    if it were empty.
+
+    Parameters
+    ----------
+    path : path-like, optional
+        Database file. The default is ``outputs.sqlite`` within
+        :func:`~bmi_map._cache.user_cache_dir`.
+    max_bytes : int, optional
+        Maximum total size of the cached functions.
+
+    Examples
+    --------
+    >>> import pathlib, tempfile
+    >>> from bmi_map._output_cache import OutputCache
+    >>> path = pathlib.Path(tempfile.mkdtemp()) / "outputs.sqlite"
+    >>> digest = OutputCache.digest([("update", ())])
+    >>> with OutputCache(path) as cache:
+    ...     cache.lookup("c", digest, lambda: ["int update(void* self);"])
+    ['int update(void* self);']
+    >>> with OutputCache(path) as cache:
+    ...     cache.lookup("c", digest, lambda: ["not called"])
+    ['int update(void* self);']
+    """
+
+    _max_pending = 64
+
+    def __init__(
+        self, path: str | os.PathLike[str] | None = None, max_bytes: int = 2**24
+    ):
+        self._path = pathlib.Path(path or user_cache_dir() / "outputs.sqlite")
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._pid = os.getpid()
+        self._broken = False
+        self._pending: dict[bytes, str] = {}
+        self._accessed: set[bytes] = set()
+        self._counted = (0, 0)
+        self.hits = self.misses = 0
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @staticmethod
+    def digest(funcs: Iterable[tuple[str, Iterable[Parameter]]]) -> bytes:
+        """Hash the function names and parameters of a spec, in order."""
+        lines = [
+            "\0".join([name, *[f"{p.name}:{p.intent}:{p.type}" for p in params]])
+            for name, params in funcs
+        ]
+        return hashlib.sha256("\n".join(lines).encode()).digest()
+
+    @staticmethod
+    def key(mapper: str, digest: bytes) -> bytes:
+        return hashlib.sha256(
+            b"\0".join([__version__.encode(), mapper.encode(), digest])
+        ).digest()
+
+    def get(self, mapper: str, digest: bytes) -> list[str] | None:
+        """Return the cached mapped functions of a spec, if any."""
+        key = self.key(mapper, digest)
+        with self._lock:
+            texts = self._get(key)
+            if texts is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return texts
+
+    def put(self, mapper: str, digest: bytes, texts: Sequence[str]) -> None:
+        """Save the mapped functions of a spec, in the order of the spec."""
+        key = self.key(mapper, digest)
+        with self._lock:
+            self._pending[key] = json.dumps(list(texts))
+            if len(self._pending) >= self._max_pending:
+                self._flush()
+
+    def lookup(
+        self, mapper: str, digest: bytes, compute: Callable[[], Sequence[str]]
+    ) -> list[str]:
+        """Return the cached mapped functions of a spec, computing them on a miss.
+
+        Parameters
+        ----------
+        mapper : str
+            Identifies the mapper and its options.
+        digest : bytes
+            Hash of the spec from :meth:`digest`.
+        compute : callable
+            Returns the mapped functions, in the order of the spec.
+        """
+        texts = self.get(mapper, digest)
+        if texts is None:
+            texts = list(compute())
+            self.put(mapper, digest, texts)
+        return texts
+
+    def flush(self) -> None:
+        """Write new entries and access times to the database."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Flush the cache and close the database."""
+        with self._lock:
+            self._flush()
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
+
+    def __enter__(self) -> "OutputCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._pending.clear()
+            self._accessed.clear()
+            if self._path.exists() and (db := self._connect()) is not None:
+                try:
+                    with db:
+                        db.execute("DELETE FROM mapped")
+                        db.execute("DELETE FROM counters")
+                except sqlite3.Error:
+                    pass
+
+    def stats(self) -> dict[str, int]:
+        """Return the number and size of the entries, and all-time hit counts."""
+        stats = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0}
+        with self._lock:
+            self._flush()
+            if not self._path.exists() or (db := self._connect()) is None:
+                return stats
+            try:
+                entries, size = db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM mapped"
+                ).fetchone()
+                stats.update(db.execute("SELECT name, value FROM counters"))
+            except sqlite3.Error:
+                return stats
+        stats["entries"], stats["bytes"] = entries, size
+        return stats
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._pid != os.getpid():
+            # A connection must not be used by a forked process.
+            self._db, self._pid = None, os.getpid()
+            self._pending.clear()
+            self._accessed.clear()
+            self._counted = (self.hits, self.misses)
+        if self._db is None and not self._broken:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self._path, timeout=30.0, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error):
+                self._broken = True
+            else:
+                self._db = db
+        return self._db
+
+    def _get(self, key: bytes) -> list[str] | None:
+        text = self._pending.get(key)
+        if text is None and (text := self._read(key)) is None:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def _read(self, key: bytes) -> str | None:
+        if (db := self._connect()) is None:
+            return None
+        try:
+            row = db.execute("SELECT text FROM mapped WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self._accessed.add(key)
+        return row[0]
+
+    def _flush(self) -> None:
+        hits, misses = self.hits - self._counted[0], self.misses - self._counted[1]
+        if not (self._pending or self._accessed or hits or misses):
+            return
+        if (db := self._connect()) is None:
+            self._pending.clear()
+            self._accessed.clear()
+            return
+
+        now = time.time_ns()
+        try:
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO mapped VALUES (?, ?, ?, ?)",
+                    (
+                        (key, text, len(key) + len(text.encode()), now)
+                        for key, text in self._pending.items()
+                    ),
+                )
+                db.executemany(
+                    "UPDATE mapped SET atime = ? WHERE key = ?",
+                    ((now, key) for key in self._accessed),
+                )
+                db.executemany(
+                    "INSERT INTO counters VALUES (?, ?)"
+                    " ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                    (("hits", hits), ("misses", misses)),
+                )
+                self._evict(db)
+        except sqlite3.Error:
+            pass
+        self._pending.clear()
+        self._accessed.clear()
+        self._counted = (self.hits, self.misses)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM mapped").fetchone()
+        excess = total - self._max_bytes
+        if excess <= 0:
+            return
+
+        keys = []
+        for key, size in db.execute("SELECT key, size FROM mapped ORDER BY atime"):
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+        db.executemany("DELETE FROM mapped WHERE key = ?", keys)
+
+
+def output_cache_enabled() -> bool:
+    """Check if the output cache is turned on by ``$BMI_MAP_OUTPUT_CACHE``."""
+    return os.environ.get("BMI_MAP_OUTPUT_CACHE", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,200 @@
+import os
+import sys
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import _iter_map_functions
+from bmi_map.bmi_map import _read_output_cache
+from bmi_map.bmi_map import _write_output_cache
+from bmi_map.bmi_map import get_mapper
+from bmi_map.bmi_map import mapper_options
+from bmi_map.bmi_map import set_mapper_options
+
+EXECUTORS = ("auto", "process", "thread")
+
+Spec = Mapping[str, Sequence[Parameter]]
+
+
+def map_specs_parallel(
+    specs: Sequence[Spec],
+    to: str | Iterable[str] = ("c", "c++", "python", "sidl"),
+    jobs: int | None = None,
+    executor: str = "auto",
+    output_cache: bool = True,
+) -> list[dict[str, dict[str, str]]]:
+    """Map several specs to several languages with a pool of workers.
+
+    Each (spec, language) pair is split into chunks of functions that are
+    handed out to the workers. Results are merged back in input order so
+    the output is the same as calling :func:`~bmi_map.bmi_map.map_spec`
+    on each spec. Pairs found in the output cache are not handed out,
+    and the workers don't use the cache: the results of the others are
+    saved to it by this process.
+
+    Parameters
+    ----------
+    specs : sequence of mapping
+        Specs to map.
+    to : str or iterable of str, optional
+        Language, or languages, to which to map the functions.
+    jobs : int, optional
+        Number of workers. If not given, use the number of CPUs.
+    executor : {"auto", "process", "thread"}, optional
+        Kind of worker pool. ``"auto"`` uses threads on free-threaded
+        builds of Python and processes otherwise.
+    output_cache : bool, optional
+        If ``False``, don't look up or save the specs in the output cache.
+
+    Returns
+    -------
+    list of dict
+        For each spec, the output of :func:`~bmi_map.bmi_map.map_spec`.
+    """
+    languages = (to,) if isinstance(to, str) else tuple(dict.fromkeys(to))
+    jobs = jobs or os.cpu_count() or 1
+
+    with _make_executor(executor, jobs, languages) as pool:
+        return _map_with(pool, specs, languages, jobs, output_cache=output_cache)
+
+
+def map_spec_concurrent(
+    spec: Spec,
+    to: str | Iterable[str] = ("c", "c++", "python", "sidl"),
+    jobs: int | None = None,
+    pool: Executor | None = None,
+) -> dict[str, dict[str, str]]:
+    """Map a spec with a pool of threads.
+
+    The result is the same as that of :func:`~bmi_map.bmi_map.map_spec`.
+    Threads share the mapping cache, and mapping does not need the GIL,
+    so on free-threaded builds of Python mapping scales with the number
+    of threads.
+
+    Parameters
+    ----------
+    spec : mapping
+        Function names mapped to their parameters.
+    to : str or iterable of str, optional
+        Language, or languages, to which to map the functions.
+    jobs : int, optional
+        Number of threads. If not given, use the number of CPUs.
+    pool : Executor, optional
+        Existing pool on which to run, for instance one shared by an
+        application. It is left running.
+
+    Examples
+    --------
+    >>> from bmi_map._bmi import BMI
+    >>> from bmi_map._parallel import map_spec_concurrent
+    >>> mapped = map_spec_concurrent(BMI, to="c", jobs=4)
+    >>> mapped["c"]["update"]
+    'int update(void* self);'
+    """
+    languages = (to,) if isinstance(to, str) else tuple(dict.fromkeys(to))
+    jobs = jobs or os.cpu_count() or 1
+
+    if pool is not None:
+        return _map_with(pool, [spec], languages, jobs)[0]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return _map_with(pool, [spec], languages, jobs)[0]
+
+
+def _map_with(
+    pool: Executor,
+    specs: Sequence[Spec],
+    languages: Sequence[str],
+    jobs: int,
+    output_cache: bool = True,
+) -> list[dict[str, dict[str, str]]]:
+    if output_cache:
+        cached = [_read_output_cache(spec, languages) for spec in specs]
+    else:
+        cached = [(b"", {}) for _ in specs]
+    missing = [
+        [language for language in languages if language not in mapped]
+        for _, mapped in cached
+    ]
+    units = [
+        (index, language, chunk)
+        for index, spec in enumerate(specs)
+        if missing[index]
+        for chunk in _chunk(list(spec.items()), jobs)
+        for language in missing[index]
+    ]
+
+    results: list[dict[str, dict[str, str]]] = [
+        {language: mapped.get(language, {}) for language in languages}
+        for _, mapped in cached
+    ]
+    mapped_chunks = pool.map(
+        _map_chunk,
+        [language for _, language, _ in units],
+        [chunk for _, _, chunk in units],
+    )
+    for (index, language, _), mapped in zip(units, mapped_chunks, strict=True):
+        results[index][language].update(mapped)
+
+    if output_cache:
+        for index, (digest, _) in enumerate(cached):
+            _write_output_cache(
+                digest,
+                {language: results[index][language] for language in missing[index]},
+            )
+
+    return results
+
+
+def _make_executor(kind: str, jobs: int, languages: Sequence[str]) -> Executor:
+    if kind not in EXECUTORS:
+        raise ValueError(
+            f"executor not understood ({kind!r} not one of"
+            f" {', '.join(repr(e) for e in EXECUTORS)})"
+        )
+    if kind == "auto":
+        kind = "process" if _is_gil_enabled() else "thread"
+
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=jobs)
+    else:
+        return ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(languages, mapper_options()),
+        )
+
+
+def _init_worker(
+    languages: Sequence[str], options: Mapping[str, Mapping[str, object]]
+) -> None:
+    for language, kwds in options.items():
+        set_mapper_options(language, **kwds)
+    for language in languages:
+        get_mapper(language)
+
+
+def _map_chunk(
+    language: str, items: Sequence[tuple[str, Sequence[Parameter]]]
+) -> dict[str, str]:
+    return {name: text for _, name, text in _iter_map_functions(items, (language,))}
+
+
+def _chunk(
+    items: Sequence[tuple[str, Sequence[Parameter]]], jobs: int
+) -> Iterable[tuple[tuple[str, Sequence[Parameter]], ...]]:
+    size = max(1, -(-len(items) // (jobs * 4)))
+    it = iter(items)
+    while chunk := tuple(islice(it, size)):
+        yield chunk
+
+
+def _is_gil_enabled() -> bool:
+    try:
+        return sys._is_gil_enabled()  # type: ignore[attr-defined]
+    except AttributeError:
+        return True
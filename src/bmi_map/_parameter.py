@@ -1,33 +1,106 @@
 import re
+import threading
 from collections import Counter
-from dataclasses import asdict
-from dataclasses import astuple
 from dataclasses import dataclass
+from dataclasses import field
+from functools import lru_cache
+from weakref import WeakValueDictionary
 
 VALID_INTENTS = frozenset(("in", "inout", "out"))
 VALID_SCALAR_TYPES = frozenset(("int", "double", "string"))
 VALID_ARRAY_TYPES = frozenset(("any", "int", "double", "string"))
 
+_TYPE_SPECS: dict["TypeSpec", "TypeSpec"] = {}
+
 
 @dataclass(frozen=True)
+class TypeSpec:
+    """A parsed parameter type.
+
+    Instances are interned by :func:`parse_type` so that equal types
+    share a single object.
+    """
+
+    dtype: str
+    isarray: bool = False
+    dims: tuple[str, ...] = ()
+
+    @property
+    def isscalar(self) -> bool:
+        return not self.isarray
+
+    def __str__(self) -> str:
+        if self.isarray:
+            return f"array[{', '.join((self.dtype,) + self.dims)}]"
+        else:
+            return self.dtype
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, init=False)
 class Parameter:
+    """A validated parameter of a BMI function.
+
+    Parameters are immutable and interned: creating a parameter that is
+    equal to one that already exists returns the existing instance
+    without validating it again. This holds even when parameters are
+    created by several threads at once.
+
+    Examples
+    --------
+    >>> from bmi_map._parameter import Parameter
+    >>> grid = Parameter(name="grid", intent="in", type="int")
+    >>> grid
+    Parameter(name='grid', intent='in', type='int')
+    >>> Parameter(name="grid", intent=" in", type="int") is grid
+    True
+    """
+
     name: str
     intent: str
     type: str
+    type_spec: TypeSpec = field(init=False, repr=False, compare=False)
 
-    def __post_init__(self):
-        object.__setattr__(self, "name", validate_name(self.name))
-        object.__setattr__(self, "intent", validate_intent(self.intent))
-        object.__setattr__(self, "type", validate_type(self.type))
+    def __new__(cls, name: str, intent: str, type: str) -> "Parameter":
+        key = (cls, name, intent, type)
+        try:
+            return _PARAMETERS[key]
+        except KeyError:
+            pass
+
+        name = validate_name(name)
+        intent = validate_intent(intent)
+        type_spec = parse_type(type)
+
+        with _PARAMETERS_LOCK:
+            self = _PARAMETERS.get((cls, name, intent, str(type_spec)))
+            if self is None:
+                self = object.__new__(cls)
+                object.__setattr__(self, "name", name)
+                object.__setattr__(self, "intent", intent)
+                object.__setattr__(self, "type", str(type_spec))
+                object.__setattr__(self, "type_spec", type_spec)
+                _PARAMETERS[(cls, name, intent, self.type)] = self
+            _PARAMETERS[key] = self
+
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self.name, self.intent, self.type))
 
     def asdict(self):
-        return asdict(self)
+        return {"name": self.name, "intent": self.intent, "type": self.type}
 
     def astuple(self):
-        return astuple(self)
+        return (self.name, self.intent, self.type)
 
     def isscalar(self):
-        return not self._type.startswith("array")
+        return self.type_spec.isscalar
+
+
+_PARAMETERS: WeakValueDictionary[
+    tuple[type[Parameter], str, str, str], Parameter
+] = WeakValueDictionary()
+_PARAMETERS_LOCK = threading.Lock()
 
 
 def validate_name(name: str) -> str:
@@ -58,12 +131,49 @@ def validate_scalar(dtype: str) -> str:
 
 def validate_array(dtype: str) -> str:
     if not dtype.startswith("array"):
-        raise ValueError("not an array type ({dtype})")
+        raise ValueError(f"not an array type ({dtype})")
+    return str(parse_type(dtype))
 
-    dtype, dims = split_array_type(dtype)
-    if dtype not in VALID_ARRAY_TYPES:
+
+def validate_type(dtype: str) -> str:
+    return str(parse_type(dtype))
+
+
+@lru_cache(maxsize=None)
+def parse_type(dtype: str) -> TypeSpec:
+    """Parse and validate a type string.
+
+    Parameters
+    ----------
+    dtype : str
+        A scalar type (e.g. ``"double"``) or an array type
+        (e.g. ``"array[int, m, n]"``).
+
+    Returns
+    -------
+    TypeSpec
+        The parsed type. Equal type strings return the same object.
+
+    Examples
+    --------
+    >>> from bmi_map._parameter import parse_type
+    >>> parse_type("array[double, m,n]")
+    TypeSpec(dtype='double', isarray=True, dims=('m', 'n'))
+    >>> parse_type("array[double, m, n]") is parse_type("array[double,m,n]")
+    True
+    """
+    if dtype.startswith("array"):
+        type_spec = _parse_array_type(dtype)
+    else:
+        type_spec = TypeSpec(validate_scalar(dtype))
+    return _TYPE_SPECS.setdefault(type_spec, type_spec)
+
+
+def _parse_array_type(dtype: str) -> TypeSpec:
+    array_type, dims = split_array_type(dtype)
+    if array_type not in VALID_ARRAY_TYPES:
         raise ValueError(
-            f"array type not understood ({dtype} not one of"
+            f"array type not understood ({array_type} not one of"
             f" {', '.join(repr(t) for t in sorted(VALID_ARRAY_TYPES))})"
         )
     repeated_dims = [dim for dim, count in Counter(dims).items() if count > 1]
@@ -73,14 +183,7 @@ def validate_array(dtype: str) -> str:
             f" ({', '.join(repeated_dims)})"
         )
 
-    return f"array[{', '.join((dtype,) + dims)}]"
-
-
-def validate_type(dtype: str) -> str:
-    if dtype.startswith("array"):
-        return validate_array(dtype)
-    else:
-        return validate_scalar(dtype)
+    return TypeSpec(array_type, isarray=True, dims=dims)
 
 
 def split_array_type(array_type: str) -> tuple[str, tuple[str, ...]]:
@@ -0,0 +1,170 @@
+"""Find the mapper for each language.
+
+Mappers for the built-in languages are part of bmi-map. Other packages
+add languages by registering a :class:`~bmi_map._mapper.LanguageMapper`
+subclass in the ``bmi_map.mappers`` entry-point group, for instance in
+their ``pyproject.toml``::
+
+    [project.entry-points."bmi_map.mappers"]
+    fortran = "bmi_fortran_map:FortranMapper"
+
+Installed entry points are only looked for when a language that is not
+built in is requested, or when all of the languages are listed. What is
+found is saved in :func:`~bmi_map._cache.user_cache_dir` and reused until
+a package is installed or removed, so that listing the languages doesn't
+read the metadata of every installed package on every run. Along with
+each mapper, the version of the package that provides it is saved so
+that mapped functions cached with an older version aren't reused. A
+mapper's module is imported only when its language is used.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from functools import cache
+from typing import Any
+
+from bmi_map._cache import user_cache_dir
+from bmi_map._mapper import LanguageMapper
+from bmi_map._version import __version__
+
+ENTRY_POINT_GROUP = "bmi_map.mappers"
+
+BUILTIN_MAPPERS: dict[str, str] = {
+    "c": "bmi_map.mappers.c:CMapper",
+    "c++": "bmi_map.mappers.cxx:CxxMapper",
+    "python": "bmi_map.mappers.python:PythonMapper",
+    "sidl": "bmi_map.mappers.sidl:SidlMapper",
+}
+
+
+def available_languages() -> tuple[str, ...]:
+    """Return the languages that have a mapper.
+
+    Built-in languages come first followed by those of plugins, sorted.
+    """
+    return tuple(BUILTIN_MAPPERS) + tuple(sorted(plugin_mappers()))
+
+
+def find_mapper(language: str) -> str:
+    """Return the ``"module:class"`` of a language's mapper.
+
+    Examples
+    --------
+    >>> from bmi_map._registry import find_mapper
+    >>> find_mapper("c")
+    'bmi_map.mappers.c:CMapper'
+    """
+    try:
+        return BUILTIN_MAPPERS[language]
+    except KeyError:
+        pass
+    try:
+        return plugin_mappers()[language]
+    except KeyError:
+        raise ValueError(
+            f"language not understood ({language!r} not one of"
+            f" {', '.join(repr(lang) for lang in available_languages())})"
+        ) from None
+
+
+def mapper_version(language: str) -> str:
+    """Return the version of the package that provides a language's mapper.
+
+    Examples
+    --------
+    >>> from bmi_map._registry import mapper_version
+    >>> from bmi_map._version import __version__
+    >>> mapper_version("c") == __version__
+    True
+    """
+    if language in BUILTIN_MAPPERS:
+        return __version__
+    find_mapper(language)
+    return _plugin_index()["versions"].get(language) or ""
+
+
+def load_mapper(language: str) -> type[LanguageMapper]:
+    """Import and return the mapper class of a language."""
+    import importlib
+
+    target = find_mapper(language)
+    module_name, _, qualname = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+
+    if not (isinstance(obj, type) and issubclass(obj, LanguageMapper)):
+        raise TypeError(f"{language}: {target} is not a LanguageMapper")
+    return obj
+
+
+def plugin_mappers() -> dict[str, str]:
+    """Return the mappers registered by other packages.
+
+    Built-in languages can't be replaced by a plugin; entry points for
+    them are ignored.
+    """
+    return _plugin_index()["mappers"]
+
+
+@cache
+def _plugin_index() -> dict[str, Any]:
+    key = _environment_key()
+    path = user_cache_dir() / "mappers.json"
+
+    try:
+        with open(path) as fp:
+            index = json.load(fp)
+    except (OSError, ValueError):
+        pass
+    else:
+        if isinstance(index, dict) and index.get("key") == key and "versions" in index:
+            return index
+
+    index = {"key": key, **_discover()}
+    _save_index(path, index)
+    return index
+
+
+def _discover() -> dict[str, dict[str, Any]]:
+    from importlib.metadata import entry_points
+
+    mappers: dict[str, str] = {}
+    versions: dict[str, str | None] = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in BUILTIN_MAPPERS:
+            mappers[entry_point.name] = entry_point.value
+            versions[entry_point.name] = (
+                None if entry_point.dist is None else entry_point.dist.version
+            )
+    return {"mappers": mappers, "versions": versions}
+
+
+def _environment_key() -> str:
+    """Fingerprint the folders from which packages are imported.
+
+    Installing or removing a package changes the modification time of
+    the folder it is installed into, which changes the fingerprint.
+    """
+    parts = [__version__, sys.executable]
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or os.curdir).st_mtime_ns
+        except OSError:
+            mtime = -1
+        parts.append(f"{entry}:{mtime}")
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _save_index(path: os.PathLike[str], index: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as fp:
+            json.dump(index, fp)
+        os.replace(fp.name, path)
+    except OSError:
+        pass
@@ -0,0 +1,232 @@
+"""Map functions for clients over a JSON-lines protocol.
+
+Each request is a JSON object on a single line; each response is a JSON
+object on a single line. A mapping request looks like::
+
+    {"spec": "/path/to/spec.toml", "include": "get_.*", "to": ["c", "sidl"]}
+
+where all of the keys are optional (without a spec, the built-in BMI is
+used; with ``"batched": true`` the batched BMI functions are added to the
+spec) and the response is either::
+
+    {"ok": true, "result": {"c": {"get_value": "..."}, "sidl": {...}}}
+
+or, if something went wrong::
+
+    {"ok": false, "error": "..."}
+
+A request with ``"op": "ping"`` checks that the server is running and
+one with ``"op": "shutdown"`` stops it. An ``"id"`` in a request is
+copied to its response.
+"""
+import asyncio
+import json
+import os
+import pathlib
+import socket
+import stat
+import tempfile
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import Any
+from typing import IO
+
+from bmi_map._bmi import BMI
+from bmi_map._bmi import with_batched
+from bmi_map._parameter import Parameter
+from bmi_map._spec import filter_spec
+from bmi_map.bmi_map import load
+from bmi_map.bmi_map import map_spec
+
+
+class MappingService:
+    """Handle mapping requests, keeping parsed specs in memory.
+
+    A spec file is parsed again only if its modification time or size has
+    changed since it was last requested.
+    """
+
+    def __init__(self) -> None:
+        self._specs: dict[
+            str, tuple[tuple[int, int], Mapping[str, Sequence[Parameter]]]
+        ] = {}
+        self.stopped = False
+
+    def load(self, path: str) -> Mapping[str, Sequence[Parameter]]:
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        try:
+            cached_stamp, spec = self._specs[path]
+        except KeyError:
+            pass
+        else:
+            if cached_stamp == stamp:
+                return spec
+
+        with open(path, "rb") as fp:
+            spec = load(fp, lazy=True)
+        self._specs[path] = (stamp, spec)
+
+        return spec
+
+    def handle(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        """Handle a single request and return its response."""
+        if not isinstance(request, Mapping):
+            return {
+                "ok": False,
+                "error": f"bad request: not an object ({type(request).__name__})",
+            }
+
+        response: dict[str, Any]
+        try:
+            op = request.get("op", "map")
+            if op == "map":
+                response = {"ok": True, "result": self._map(request)}
+            elif op == "ping":
+                response = {"ok": True}
+            elif op == "shutdown":
+                self.stopped = True
+                response = {"ok": True}
+            else:
+                raise ValueError(f"operation not understood ({op})")
+        except Exception as error:
+            response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def handle_line(self, line: str | bytes) -> str:
+        """Handle a request encoded as a line of JSON."""
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {"ok": False, "error": f"bad request: {error}"}
+        else:
+            response = self.handle(request)
+        return json.dumps(response) + "\n"
+
+    def _map(self, request: Mapping[str, Any]) -> dict[str, dict[str, str]]:
+        spec = BMI if request.get("spec") is None else self.load(request["spec"])
+        if request.get("batched"):
+            spec = with_batched(spec)
+        funcs = filter_spec(spec, include=request.get("include", ".*"))
+        return map_spec(funcs, to=request.get("to", "sidl"))
+
+
+def default_socket_path() -> pathlib.Path:
+    """Return the socket on which the server listens by default."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    if hasattr(os, "getuid"):
+        return pathlib.Path(runtime_dir) / f"bmi-map-{os.getuid()}.sock"
+    else:
+        return pathlib.Path(runtime_dir) / "bmi-map.sock"
+
+
+def serve_stdio(
+    stdin: IO[str], stdout: IO[str], service: MappingService | None = None
+) -> None:
+    """Answer requests, one per line, read from a stream."""
+    service = service or MappingService()
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(service.handle_line(line))
+        stdout.flush()
+        if service.stopped:
+            break
+
+
+def serve_unix(
+    path: str | os.PathLike[str], service: MappingService | None = None
+) -> None:
+    """Answer requests from clients connected to a Unix domain socket.
+
+    A socket left behind by a server that is no longer running is
+    replaced. If *path* is anything else, or a server is still listening
+    on it, a :class:`FileExistsError` is raised.
+    """
+    asyncio.run(_serve_unix(pathlib.Path(path), service or MappingService()))
+
+
+async def _serve_unix(path: pathlib.Path, service: MappingService) -> None:
+    stop = asyncio.Event()
+
+    async def handle_client(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                # Map in a worker thread so that other clients are answered
+                # while a large spec is mapped.
+                response = await asyncio.to_thread(service.handle_line, line)
+                writer.write(response.encode())
+                await writer.drain()
+                if service.stopped:
+                    stop.set()
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    _remove_stale_socket(path)
+    server = await asyncio.start_unix_server(handle_client, path=os.fspath(path))
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _remove_stale_socket(path: pathlib.Path) -> None:
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path}: file exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(os.fspath(path))
+        except ConnectionRefusedError:
+            path.unlink()
+            return
+    raise FileExistsError(f"{path}: a server is already listening on the socket")
+
+
+def request(
+    request: Mapping[str, Any], path: str | os.PathLike[str] | None = None
+) -> dict[str, Any]:
+    """Send a request to a running server.
+
+    If no server is listening on the socket, the request is handled in
+    this process instead.
+
+    Parameters
+    ----------
+    request : mapping
+        The request to send.
+    path : path-like, optional
+        Socket of the server. The default is :func:`default_socket_path`.
+
+    Returns
+    -------
+    dict
+        The response to the request.
+    """
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    except (AttributeError, OSError):
+        return MappingService().handle(request)
+
+    with sock:
+        try:
+            sock.connect(os.fspath(path or default_socket_path()))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return MappingService().handle(request)
+
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("r", encoding="utf-8") as fp:
+            return json.loads(fp.readline())
@@ -0,0 +1,125 @@
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import Any
+
+from bmi_map._parameter import Parameter
+from bmi_map._timing import phase
+
+FIELDS = ("name", "intent", "type")
+
+
+class LazySpec(Mapping[str, tuple[Parameter, ...]]):
+    """A spec whose parameters are built and validated on access.
+
+    Parameters
+    ----------
+    funcs : mapping
+        The raw ``bmi`` table of a spec, function names mapped to their
+        unvalidated signatures.
+
+    Examples
+    --------
+    >>> from bmi_map._spec import LazySpec
+    >>> spec = LazySpec(
+    ...     {
+    ...         "foo": {"params": [{"name": "a", "intent": "in", "type": "int"}]},
+    ...         "bar": {"params": [{"name": "b", "intent": "in", "type": "long"}]},
+    ...     }
+    ... )
+    >>> spec["foo"]
+    (Parameter(name='a', intent='in', type='int'),)
+    >>> spec.validate_all()
+    Traceback (most recent call last):
+    ...
+    ValueError: type not understood ('long' not one of 'double', 'int', 'string')
+    """
+
+    def __init__(self, funcs: Mapping[str, Mapping[str, Any]]):
+        self._funcs = funcs
+        self._params: dict[str, tuple[Parameter, ...]] = {}
+
+    def __getitem__(self, name: str) -> tuple[Parameter, ...]:
+        try:
+            return self._params[name]
+        except KeyError:
+            pass
+        with phase("validate"):
+            params = self._params[name] = signature_to_params(name, self._funcs[name])
+        return params
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._funcs)
+
+    def __len__(self) -> int:
+        return len(self._funcs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def validate_all(self) -> None:
+        """Build and validate the parameters of every function."""
+        for name in self:
+            self[name]
+
+
+def validate_function_name(name: str) -> str:
+    """Check that the name of a function is an identifier.
+
+    Function names are also the names of the files that mapped functions
+    are written to, so a name can't be a path.
+    """
+    if not isinstance(name, str) or not name.isidentifier():
+        raise ValueError(f"function name is not valid ({name!r})")
+    return name
+
+
+def signature_to_params(
+    name: str, signature: Mapping[str, Any]
+) -> tuple[Parameter, ...]:
+    try:
+        params = signature["params"]
+    except (KeyError, TypeError):
+        raise ValueError(f"{name}: missing 'params'") from None
+    if not isinstance(params, (list, tuple)):
+        raise ValueError(f"{name}: 'params' is not an array")
+    return tuple(
+        _table_to_param(f"{name}.params[{index}]", param)
+        for index, param in enumerate(params)
+    )
+
+
+def _table_to_param(location: str, table: Any) -> Parameter:
+    if not isinstance(table, Mapping):
+        raise ValueError(f"{location}: not a table")
+    for key in table:
+        if key not in FIELDS:
+            raise ValueError(f"{location}.{key}: unknown field")
+    for field in FIELDS:
+        if field not in table:
+            raise ValueError(f"{location}.{field}: missing")
+        if not isinstance(table[field], str):
+            raise ValueError(f"{location}.{field}: not a string")
+    return Parameter(**table)
+
+
+def filter_spec(spec: Mapping[str, Any], include: str = ".*") -> dict[str, Any]:
+    """Select the functions of a spec whose names match a pattern.
+
+    Only the selected functions of the spec are accessed so, for a
+    :class:`LazySpec`, only those functions are validated.
+    """
+    pattern = re.compile(include)
+    return {name: spec[name] for name in spec if pattern.search(name)}
+
+
+def iter_filter(
+    funcs: Iterable[tuple[str, Any]], include: str = ".*"
+) -> Iterator[tuple[str, Any]]:
+    """Select, from a stream of functions, those whose names match a pattern.
+
+    This is the streaming counterpart of :func:`filter_spec`.
+    """
+    pattern = re.compile(include)
+    return ((name, params) for name, params in funcs if pattern.search(name))
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from contextlib import suppress
+
+from bmi_map._cache import user_cache_dir
+from bmi_map._parameter import Parameter
+from bmi_map._version import __version__
+
+Spec = dict[str, tuple[Parameter, ...]]
+
+
+class SpecCache:
+    """An on-disk cache of validated specs.
+
+    Specs are keyed by a hash of the spec file's contents and the version
+    of bmi-map. Once the total size of the cache exceeds *max_bytes*, the
+    least recently used entries are removed. A cache folder that can't be
+    read or written is treated as an empty cache that can't hold entries.
+
+    Parameters
+    ----------
+    path : path-like, optional
+        Folder in which to store cached specs. The default is ``specs``
+        within :func:`~bmi_map._cache.user_cache_dir`.
+    max_bytes : int, optional
+        Maximum total size of the cached specs.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str] | None = None, max_bytes: int = 2**26
+    ):
+        self._path = pathlib.Path(path or user_cache_dir() / "specs")
+        self._max_bytes = max_bytes
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self._path
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        return hashlib.sha256(__version__.encode() + b"\0" + content).hexdigest()
+
+    def get(self, content: bytes) -> Spec | None:
+        """Return the cached spec for a spec file's contents, if any."""
+        entry = self._path / f"{self.key(content)}.pickle"
+        try:
+            with open(entry, "rb") as fp:
+                spec = pickle.load(fp)
+        except OSError:
+            return None
+        except Exception:
+            with suppress(OSError):
+                entry.unlink(missing_ok=True)
+            return None
+        with suppress(OSError):
+            # The entry may have been evicted by another process.
+            os.utime(entry)
+        return spec
+
+    def put(self, content: bytes, spec: Spec) -> None:
+        """Save the validated spec for a spec file's contents."""
+        try:
+            self._path.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self._path, suffix=".tmp", delete=False
+            ) as fp:
+                pickle.dump(spec, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(fp.name, self._path / f"{self.key(content)}.pickle")
+        except OSError:
+            return
+        self._evict()
+
+    def clear(self) -> None:
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def size(self) -> int:
+        """Return the total size, in bytes, of the cached specs."""
+        size = 0
+        for entry in self._entries():
+            with suppress(FileNotFoundError):
+                size += entry.stat().st_size
+        return size
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def _entries(self) -> list[pathlib.Path]:
+        return list(self._path.glob("*.pickle"))
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+def spec_cache_enabled() -> bool:
+    """Check if the spec cache is turned on by ``$BMI_MAP_SPEC_CACHE``."""
+    return os.environ.get("BMI_MAP_SPEC_CACHE", "").lower() in ("1", "true", "yes")
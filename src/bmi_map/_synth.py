@@ -0,0 +1,122 @@
+"""Generate large, valid specs for load and scaling tests.
+
+Functions are made up from a vocabulary of BMI-like verbs and nouns and
+have a mix of intents and types similar to that of real specs: mostly
+inputs, at most one output (which every mapper can turn into a return
+value), scalars and arrays of up to three dimensions.
+
+Examples
+--------
+>>> from bmi_map._synth import synth_spec
+>>> spec = synth_spec(1000, params_per_func=3, seed=1)
+>>> len(spec)
+1000
+>>> {len(params) for params in spec.values()}
+{3}
+>>> synth_spec(10, 3, seed=1) == synth_spec(10, 3, seed=1)
+True
+"""
+import itertools
+import random
+
+from bmi_map._parameter import Parameter
+
+VERBS = ("get", "set", "update", "compute", "init", "read", "write", "reset")
+NOUNS = (
+    "value",
+    "grid",
+    "flux",
+    "temperature",
+    "elevation",
+    "discharge",
+    "velocity",
+    "pressure",
+    "concentration",
+    "time",
+)
+PARAM_NAMES = ("name", "grid", "dest", "src", "inds", "time", "count", "values")
+DIMS = ("n", "m", "k", "nx", "ny", "nz")
+MAX_RANK = 3
+
+# Relative frequencies of intents and types. Outputs are drawn separately,
+# at most one per function.
+INTENT_WEIGHTS = {"in": 0.8, "inout": 0.2}
+SCALAR_WEIGHTS = {"int": 0.35, "double": 0.4, "string": 0.25}
+ARRAY_WEIGHTS = {"double": 0.45, "int": 0.25, "any": 0.2, "string": 0.1}
+ARRAY_FRACTION = 0.4
+OUTPUT_FRACTION = 0.5
+
+
+def _type_weights() -> dict[str, float]:
+    """Expand the type frequencies into those of every possible type.
+
+    Arrays are equally likely to have from zero to :data:`MAX_RANK`
+    dimensions, with names drawn from :data:`DIMS`.
+    """
+    weights = {
+        dtype: (1.0 - ARRAY_FRACTION) * weight
+        for dtype, weight in SCALAR_WEIGHTS.items()
+    }
+    for rank in range(MAX_RANK + 1):
+        shapes = list(itertools.permutations(DIMS, rank))
+        for dtype, weight in ARRAY_WEIGHTS.items():
+            for dims in shapes:
+                weights[f"array[{', '.join([dtype, *dims])}]"] = (
+                    ARRAY_FRACTION * weight / (MAX_RANK + 1) / len(shapes)
+                )
+    return weights
+
+
+_INTENTS = tuple(INTENT_WEIGHTS)
+_INTENT_CUM_WEIGHTS = tuple(itertools.accumulate(INTENT_WEIGHTS.values()))
+_TYPES = tuple(_type_weights().items())
+_TYPE_CUM_WEIGHTS = tuple(itertools.accumulate(weight for _, weight in _TYPES))
+
+
+def synth_spec(
+    n_functions: int, params_per_func: int = 3, seed: int | None = None
+) -> dict[str, tuple[Parameter, ...]]:
+    """Generate a spec of distinct functions.
+
+    Parameters
+    ----------
+    n_functions : int
+        Number of functions.
+    params_per_func : int, optional
+        Number of parameters of each function.
+    seed : int, optional
+        Seed for the random number generator. Equal seeds give equal specs.
+
+    Returns
+    -------
+    dict
+        Function names mapped to their parameters.
+    """
+    if n_functions < 0 or params_per_func < 0:
+        raise ValueError("numbers of functions and parameters must not be negative")
+
+    rng = random.Random(seed)
+    return {
+        f"{rng.choice(VERBS)}_{rng.choice(NOUNS)}_{index}": _synth_params(
+            rng, params_per_func
+        )
+        for index in range(n_functions)
+    }
+
+
+def _synth_params(rng: random.Random, n_params: int) -> tuple[Parameter, ...]:
+    if n_params == 0:
+        return ()
+
+    names = rng.choices(PARAM_NAMES, k=n_params)
+    intents = rng.choices(_INTENTS, cum_weights=_INTENT_CUM_WEIGHTS, k=n_params)
+    types = rng.choices(_TYPES, cum_weights=_TYPE_CUM_WEIGHTS, k=n_params)
+    if rng.random() < OUTPUT_FRACTION:
+        intents[rng.randrange(n_params)] = "out"
+
+    return tuple(
+        Parameter(f"{name}_{index}", intent, type_)
+        for index, (name, intent, (type_, _)) in enumerate(
+            zip(names, intents, types, strict=True)
+        )
+    )
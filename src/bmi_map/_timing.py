@@ -0,0 +1,169 @@
+"""Phase events emitted while loading and mapping specs.
+
+Loading and mapping are split into named phases (``"parse"``,
+``"validate"``, ``"map"``, ...). Functions registered with
+:func:`add_phase_hook` are called with a :class:`PhaseEvent` when a
+phase starts and when it ends, which lets callers feed them into their
+own metrics. When no hooks are registered phases cost a single check.
+
+Examples
+--------
+>>> from bmi_map._timing import add_phase_hook, phase, remove_phase_hook
+>>> events = []
+>>> add_phase_hook(events.append)
+>>> with phase("map", "c"):
+...     pass
+>>> remove_phase_hook(events.append)
+>>> [(event.name, event.language, event.kind) for event in events]
+[('map', 'c', 'start'), ('map', 'c', 'end')]
+"""
+import sys
+import threading
+from collections.abc import Callable
+from time import perf_counter
+from typing import NamedTuple
+from typing import TextIO
+
+
+class PhaseEvent(NamedTuple):
+    """The start or end of a phase.
+
+    Attributes
+    ----------
+    name : str
+        Name of the phase.
+    language : str or None
+        Language the phase is for, if any.
+    kind : {"start", "end"}
+        If the phase is starting or ending.
+    time : float
+        Value of :func:`time.perf_counter` at the event.
+    elapsed : float or None
+        Seconds since the phase started, for ``"end"`` events.
+    """
+
+    name: str
+    language: str | None
+    kind: str
+    time: float
+    elapsed: float | None = None
+
+
+PhaseHook = Callable[[PhaseEvent], None]
+
+_HOOKS: list[PhaseHook] = []
+
+
+def add_phase_hook(hook: PhaseHook) -> None:
+    """Call a function with every subsequent phase event."""
+    _HOOKS.append(hook)
+
+
+def remove_phase_hook(hook: PhaseHook) -> None:
+    """Stop calling a function added with :func:`add_phase_hook`."""
+    _HOOKS.remove(hook)
+
+
+class _Phase:
+    __slots__ = ("name", "language", "_start")
+
+    def __init__(self, name: str, language: str | None = None):
+        self.name = name
+        self.language = language
+        self._start: float | None = None
+
+    def __enter__(self) -> "_Phase":
+        if _HOOKS:
+            self._start = perf_counter()
+            _emit(PhaseEvent(self.name, self.language, "start", self._start))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if _HOOKS and self._start is not None:
+            end = perf_counter()
+            _emit(PhaseEvent(self.name, self.language, "end", end, end - self._start))
+
+
+def phase(name: str, language: str | None = None) -> _Phase:
+    """Context manager that marks the code it wraps as a phase."""
+    return _Phase(name, language)
+
+
+def _emit(event: PhaseEvent) -> None:
+    for hook in tuple(_HOOKS):
+        hook(event)
+
+
+class Timings:
+    """Accumulate the time spent in each phase.
+
+    Phases may be nested, in which case the time spent in an inner
+    phase is not counted again in the outer one, so that the phase
+    times add up to the total. Nesting is tracked separately for each
+    thread and the times of all threads are added together.
+
+    Examples
+    --------
+    >>> from bmi_map._timing import Timings, phase
+    >>> with Timings() as timings:
+    ...     with phase("map", "c"):
+    ...         pass
+    ...     with phase("map", "c"):
+    ...         pass
+    >>> timings.calls
+    {('map', 'c'): 2}
+    """
+
+    def __init__(self) -> None:
+        self.calls: dict[tuple[str, str | None], int] = {}
+        self.seconds: dict[tuple[str, str | None], float] = {}
+        self._stacks: dict[int, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Timings":
+        add_phase_hook(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_phase_hook(self)
+
+    def __call__(self, event: PhaseEvent) -> None:
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        if event.kind == "start":
+            stack.append(0.0)
+            return
+        if not stack:
+            return
+
+        elapsed = event.elapsed or 0.0
+        own = elapsed - stack.pop()
+        if stack:
+            stack[-1] += elapsed
+
+        key = (event.name, event.language)
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.seconds[key] = self.seconds.get(key, 0.0) + own
+
+    @property
+    def total(self) -> float:
+        """Total seconds spent in all phases."""
+        return sum(self.seconds.values())
+
+    def report(self, file: TextIO | None = None) -> None:
+        """Print a table of the time spent in each phase."""
+        file = sys.stderr if file is None else file
+        total = self.total
+
+        print(
+            f"{'phase':<12} {'language':<10} {'calls':>7} {'ms':>10} {'%':>6}",
+            file=file,
+        )
+        for (name, language), seconds in self.seconds.items():
+            print(
+                f"{name:<12} {language or '':<10} {self.calls[name, language]:>7}"
+                f" {seconds * 1e3:>10.3f}"
+                f" {100 * seconds / total if total else 0.0:>6.1f}",
+                file=file,
+            )
+        print(f"{'total':<12} {'':<10} {'':>7} {total * 1e3:>10.3f}", file=file)
@@ -0,0 +1,109 @@
+import os
+import pathlib
+import sys
+import time
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+from bmi_map._output import remove_functions
+from bmi_map._output import write_functions
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import _iter_map_spec
+from bmi_map.bmi_map import load
+
+
+class SpecWatcher:
+    """Keep the mapped functions of a spec file up to date.
+
+    Each time the spec changes, only the functions that were added or
+    changed are mapped again, and only their files are rewritten.
+
+    Parameters
+    ----------
+    path : path-like
+        Spec file to watch.
+    output_dir : path-like
+        Folder to which to write mapped functions.
+    to : iterable of str
+        Languages for which to generate mappings.
+    select : callable, optional
+        Function that takes a spec and returns the functions to map.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        output_dir: str | os.PathLike[str],
+        to: Iterable[str],
+        select=dict,
+    ):
+        self._path = pathlib.Path(path)
+        self._output_dir = pathlib.Path(output_dir)
+        self._languages = tuple(dict.fromkeys(to))
+        self._select = select
+
+        self._funcs: dict[str, Sequence[Parameter]] = {}
+        self._stamp: tuple[int, int] | None = None
+
+    def poll(self) -> list[str] | None:
+        """Regenerate the mappings if the spec file has changed.
+
+        Returns
+        -------
+        list of str or None
+            Names of the functions that were mapped again, or ``None`` if
+            the file has not changed since it was last read.
+        """
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        return self.update()
+
+    def update(self) -> list[str]:
+        """Read the spec and regenerate the functions that changed."""
+        with open(self._path, "rb") as fp:
+            funcs = self._select(load(fp, lazy=True))
+
+        changed, removed = diff_specs(self._funcs, funcs)
+
+        write_functions(
+            self._output_dir,
+            _iter_map_spec({name: funcs[name] for name in changed}, self._languages),
+        )
+        remove_functions(self._output_dir, self._languages, removed)
+
+        self._funcs = dict(funcs)
+
+        return changed
+
+    def run(self, interval: float = 1.0) -> None:
+        """Poll the spec file for changes until interrupted."""
+        try:
+            while True:
+                try:
+                    changed = self.poll()
+                except (KeyError, ValueError) as error:
+                    print(f"{self._path}: {error}", file=sys.stderr)
+                else:
+                    if changed:
+                        print(f"mapped {', '.join(changed)}", file=sys.stderr)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def diff_specs(
+    old: Mapping[str, Sequence[Parameter]], new: Mapping[str, Sequence[Parameter]]
+) -> tuple[list[str], list[str]]:
+    """Find functions that were added or changed, and that were removed."""
+    changed = [name for name in new if old.get(name) != new[name]]
+    removed = [name for name in old if name not in new]
+    return changed, removed
@@ -1,65 +1,531 @@
 from __future__ import annotations
 
-import tomllib
+import io
+import json
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
 from collections.abc import Sequence
+from functools import cache
 from typing import Any
 from typing import BinaryIO
+from typing import cast
+from typing import TYPE_CHECKING
 
 from bmi_map._bmi import BMI
+from bmi_map._cache import CacheInfo
+from bmi_map._cache import LRUCache
+from bmi_map._mapper import LanguageMapper
+from bmi_map._mapper import Signature
 from bmi_map._parameter import Parameter
-from bmi_map.mappers.c import CMapper
-from bmi_map.mappers.cxx import CxxMapper
-from bmi_map.mappers.python import PythonMapper
-from bmi_map.mappers.sidl import SidlMapper
+from bmi_map._registry import find_mapper
+from bmi_map._registry import load_mapper
+from bmi_map._registry import mapper_version
+from bmi_map._spec import iter_filter
+from bmi_map._spec import LazySpec
+from bmi_map._spec import signature_to_params
+from bmi_map._spec import validate_function_name
+from bmi_map._timing import phase
+
+if TYPE_CHECKING:
+    from bmi_map._output_cache import OutputCache
+    from bmi_map._spec_cache import SpecCache
+
+SpecSource = (
+    tuple[str, Sequence[Parameter]]
+    | Mapping[str, Sequence[Parameter]]
+    | str
+    | bytes
+    | BinaryIO
+)
+
+_MAPPER_OPTIONS: dict[str, dict[str, Any]] = {}
+_MAPPING_CACHE: LRUCache[str] = LRUCache(maxsize=4096)
+_OUTPUT_CACHE: OutputCache | None = None
 
 
 def bmi_map(name: str, params: Sequence[Parameter], to: str = "sidl") -> str:
-    """Map a BMI to a given language.
+    """Map a BMI function to a given language.
+
+    Mapped functions are kept in a size-bounded cache so that repeated
+    signatures are only mapped once.
 
     Parameters
     ----------
-    funcs : dict
-        Interface definitions of BMI functions.
+    name : str
+        Name of the BMI function.
+    params : sequence of Parameter
+        Parameters of the function.
     to : str, optional
         Language to which to map the interface.
 
     Examples
     --------
+    >>> from bmi_map._parameter import Parameter
     >>> from bmi_map.bmi_map import bmi_map
-    >>> funcs = {
-    ...     "get_component_name": {
-    ...         "params": [dict(name="name", intent="in", type="string")]
-    ...     }
+    >>> params = [Parameter(name="name", intent="in", type="string")]
+    >>> bmi_map("get_component_name", params, to="c")
+    'int get_component_name(void* self, const char* name);'
+    """
+    return _map_signature(Signature.from_params(name, params), to)
+
+
+def map_spec(
+    spec: Mapping[str, Sequence[Parameter]],
+    to: str | Iterable[str] = ("c", "c++", "python", "sidl"),
+) -> dict[str, dict[str, str]]:
+    """Map all the functions of a spec to one or more languages.
+
+    The spec is walked once. Each function's parameters are analyzed
+    a single time and the result is shared by all of the mappers.
+
+    Parameters
+    ----------
+    spec : mapping
+        Function names mapped to their parameters.
+    to : str or iterable of str, optional
+        Language, or languages, to which to map the functions.
+
+    Returns
+    -------
+    dict
+        For each language, in the order given, the mapped functions keyed
+        by function name, in spec order.
+
+    Examples
+    --------
+    >>> from bmi_map._parameter import Parameter
+    >>> from bmi_map.bmi_map import map_spec
+    >>> spec = {
+    ...     "update_until": [Parameter(name="time", intent="in", type="double")]
     ... }
-    >>> bmi_map(funcs, to="c")
-    ['int get_component_name(void* self, const char* name);']
+    >>> mapped = map_spec(spec, to=("c", "python"))
+    >>> mapped["c"]["update_until"]
+    'int update_until(void* self, const double time);'
+    >>> mapped["python"]["update_until"]
+    'def update_until(self, time: float) -> None:'
     """
-    LANGUAGE_MAPPER = {
-        "c": CMapper,
-        "c++": CxxMapper,
-        "python": PythonMapper,
-        "sidl": SidlMapper,
-    }
+    languages = (to,) if isinstance(to, str) else tuple(dict.fromkeys(to))
+
+    mapped: dict[str, dict[str, str]] = {language: {} for language in languages}
+    for language, name, text in _iter_map_spec(spec, languages):
+        mapped[language][name] = text
+
+    return mapped
+
+
+def iter_map(
+    specs: Iterable[SpecSource],
+    to: str | Iterable[str] = "sidl",
+    include: str | None = None,
+) -> Iterator[tuple[str, str, str]]:
+    """Lazily map a stream of functions to one or more languages.
+
+    Functions are read, validated and mapped one at a time, only as the
+    mapped functions are consumed, so memory use does not grow with the
+    number of functions that flow through.
+
+    Parameters
+    ----------
+    specs : iterable
+        Functions to map. Each item can be a ``(name, params)`` pair,
+        a mapping of names to parameters, a TOML document (as ``str`` or
+        ``bytes``), a compiled spec (as ``bytes``), or a binary file
+        holding either.
+    to : str or iterable of str, optional
+        Language, or languages, to which to map the functions.
+    include : str, optional
+        Regular expression; only functions whose names match are mapped.
+
+    Yields
+    ------
+    tuple of (str, str, str)
+        Language, function name and mapped function. Each function is
+        mapped to all of the languages before the next function is read.
+
+    Examples
+    --------
+    >>> from bmi_map.bmi_map import iter_map
+    >>> docs = [
+    ...     '[bmi.update]\\nparams = []',
+    ...     '[bmi.finalize]\\nparams = []\\n[bmi.initialize]\\nparams = []',
+    ... ]
+    >>> mapped = iter_map(docs, to=("c", "python"), include="i")
+    >>> next(mapped)
+    ('c', 'finalize', 'int finalize(void* self);')
+    >>> next(mapped)
+    ('python', 'finalize', 'def finalize(self) -> None:')
+    """
+    languages = (to,) if isinstance(to, str) else tuple(dict.fromkeys(to))
+
+    funcs = iter_functions(specs)
+    if include is not None:
+        funcs = iter_filter(funcs, include)
+
+    return _iter_map_functions(funcs, languages)
+
+
+def iter_functions(
+    specs: Iterable[SpecSource],
+) -> Iterator[tuple[str, Sequence[Parameter]]]:
+    """Iterate over the functions of a stream of specs.
+
+    See Also
+    --------
+    iter_map
+    """
+    for spec in specs:
+        if isinstance(spec, (str, bytes, bytearray)):
+            yield from _load_document(spec).items()
+        elif hasattr(spec, "read"):
+            yield from _load_document(cast(BinaryIO, spec)).items()
+        elif isinstance(spec, Mapping):
+            yield from spec.items()
+        else:
+            name, params = spec
+            yield name, params
+
+
+def _load_document(
+    doc: str | bytes | bytearray | BinaryIO,
+) -> Mapping[str, tuple[Parameter, ...]]:
+    if isinstance(doc, str):
+        return loads(doc, lazy=True, cache=False)
+    elif isinstance(doc, (bytes, bytearray)):
+        return load(io.BytesIO(doc), lazy=True, cache=False)
+    else:
+        return load(doc, lazy=True, cache=False)
+
+
+def _iter_map_spec(
+    spec: Mapping[str, Sequence[Parameter]], languages: Sequence[str]
+) -> Iterator[tuple[str, str, str]]:
+    if _OUTPUT_CACHE is None:
+        return _iter_map_functions(spec.items(), languages)
+    return _iter_map_cached(spec, languages)
+
+
+def _iter_map_cached(
+    spec: Mapping[str, Sequence[Parameter]], languages: Sequence[str]
+) -> Iterator[tuple[str, str, str]]:
+    digest, mapped = _read_output_cache(spec, languages)
+
+    missing = [language for language in languages if language not in mapped]
+    if missing:
+        computed: dict[str, dict[str, str]] = {language: {} for language in missing}
+        for language, name, text in _iter_map_functions(spec.items(), missing):
+            computed[language][name] = text
+        _write_output_cache(digest, computed)
+        mapped |= computed
+
+    for language in languages:
+        for name, text in mapped[language].items():
+            yield language, name, text
+
+
+def _read_output_cache(
+    spec: Mapping[str, Sequence[Parameter]], languages: Sequence[str]
+) -> tuple[bytes, dict[str, dict[str, str]]]:
+    """Hash a spec and find the languages it's mapped to in the output cache."""
+    mapped: dict[str, dict[str, str]] = {}
+    if _OUTPUT_CACHE is None:
+        return b"", mapped
+
+    with phase("output-cache"):
+        digest = _OUTPUT_CACHE.digest(spec.items())
+        for language in languages:
+            texts = _OUTPUT_CACHE.get(_mapper_id(language), digest)
+            if texts is not None:
+                mapped[language] = dict(zip(spec, texts, strict=True))
+    return digest, mapped
+
+
+def _write_output_cache(digest: bytes, mapped: Mapping[str, Mapping[str, str]]) -> None:
+    """Save a spec's mapped functions, as read by :func:`_read_output_cache`."""
+    if _OUTPUT_CACHE is None:
+        return
+
+    with phase("output-cache"):
+        for language, funcs in mapped.items():
+            _OUTPUT_CACHE.put(_mapper_id(language), digest, list(funcs.values()))
+
+
+def _iter_map_functions(
+    funcs: Iterable[tuple[str, Sequence[Parameter]]], languages: Sequence[str]
+) -> Iterator[tuple[str, str, str]]:
+    for name, params in funcs:
+        signature = Signature.from_params(name, params)
+        for language in languages:
+            yield language, name, _map_signature(signature, language)
+
+
+def _map_signature(signature: Signature, language: str) -> str:
+    with phase("map", language):
+        return _MAPPING_CACHE.lookup(
+            (language, signature.name, signature.params),
+            lambda: get_mapper(language).map_signature(signature),
+        )
+
+
+@cache
+def get_mapper(language: str) -> LanguageMapper:
+    """Return the shared mapper instance for a language.
+
+    Mappers are found with :mod:`bmi_map._registry`. The module that
+    defines the mapper is only imported the first time its language is
+    requested. The mapper is created with the options given to
+    :func:`set_mapper_options`.
+    """
+    return load_mapper(language).from_options(**_MAPPER_OPTIONS.get(language, {}))
+
+
+def _mapper_id(language: str) -> str:
+    mapper_id = f"{find_mapper(language)}=={mapper_version(language)}"
+    options = _MAPPER_OPTIONS.get(language)
+    if not options:
+        return mapper_id
+    args = ", ".join(f"{key}={value!r}" for key, value in sorted(options.items()))
+    return f"{mapper_id}({args})"
 
-    mapper = LANGUAGE_MAPPER[to]()
 
-    return mapper.map(name, params)
+def mapper_options() -> dict[str, dict[str, Any]]:
+    """Return the options set for each language's mapper."""
+    return {language: dict(options) for language, options in _MAPPER_OPTIONS.items()}
+
+
+def set_mapper_options(language: str, **options: Any) -> None:
+    """Set the options used to create a language's mapper.
+
+    Options replace any that were set before; call with no options to
+    go back to the mapper's defaults. Functions mapped with the previous
+    options are dropped from the mapping cache. Options should be set
+    before mapping starts rather than while other threads are mapping.
+
+    Parameters
+    ----------
+    language : str
+        Language of the mapper.
+    **options
+        Keyword arguments passed to the mapper's
+        :meth:`~bmi_map._mapper.LanguageMapper.from_options`.
+
+    Examples
+    --------
+    >>> from bmi_map._parameter import Parameter
+    >>> from bmi_map.bmi_map import bmi_map, set_mapper_options
+    >>> params = [Parameter(name="name", intent="in", type="string")]
+    >>> set_mapper_options("c++", style="zero-copy")
+    >>> bmi_map("get_var_units", params, to="c++")
+    'void GetVarUnits(std::string_view name);'
+    >>> set_mapper_options("c++")
+    >>> bmi_map("get_var_units", params, to="c++")
+    'void GetVarUnits(std::string name);'
+    """
+    find_mapper(language)
+    if options:
+        _MAPPER_OPTIONS[language] = dict(options)
+    else:
+        _MAPPER_OPTIONS.pop(language, None)
+    get_mapper.cache_clear()
+    _MAPPING_CACHE.clear()
+
+
+def mapping_cache_info() -> CacheInfo:
+    """Return hit, miss and eviction statistics of the mapping cache."""
+    return _MAPPING_CACHE.info()
+
+
+def mapping_cache_clear() -> None:
+    """Empty the mapping cache and reset its statistics."""
+    _MAPPING_CACHE.clear()
+
+
+def set_mapping_cache_size(maxsize: int | None) -> None:
+    """Set the number of mapped functions to keep.
+
+    Parameters
+    ----------
+    maxsize : int or None
+        Maximum number of entries. Use ``0`` to turn caching off or
+        ``None`` to let the cache grow without bound.
+    """
+    _MAPPING_CACHE.resize(maxsize)
+
+
+def set_output_cache(cache: OutputCache | None) -> None:
+    """Keep mapped specs in an on-disk cache shared between processes.
+
+    The cache is used when whole specs are mapped, by :func:`map_spec`
+    and the parallel mappers, rather than for single functions.
+
+    Parameters
+    ----------
+    cache : OutputCache or None
+        Cache to consult before mapping a spec, or ``None`` to stop using
+        an on-disk cache. New entries are only saved when the cache is
+        flushed or closed.
+    """
+    global _OUTPUT_CACHE
+    _OUTPUT_CACHE = cache
 
 
 def map_bmi_function(name: str, to: str) -> str:
     return bmi_map(name, BMI[name], to=to)
 
 
-def load(stream: BinaryIO) -> dict[str, tuple[Parameter, ...]]:
-    return _spec_to_dict(tomllib.load(stream)["bmi"])
+def load(
+    stream: BinaryIO, lazy: bool = False, cache: SpecCache | bool | None = None
+) -> Mapping[str, tuple[Parameter, ...]]:
+    """Load a spec from a TOML file.
+
+    Parameters
+    ----------
+    stream : file-like
+        Binary stream from which to read the spec.
+    lazy : bool, optional
+        If ``True``, return a :class:`~bmi_map._spec.LazySpec` that only
+        validates the functions that are accessed.
+    cache : SpecCache or bool, optional
+        On-disk cache of validated specs to consult before parsing the
+        spec. Use ``True`` for the default cache or ``False`` to not use
+        a cache. If not given, the default cache is used only if the
+        ``BMI_MAP_SPEC_CACHE`` environment variable is set. Specs that
+        go through the cache are always fully validated.
+
+    Notes
+    -----
+    Compiled specs (see :mod:`bmi_map._compiled`) are recognized by their
+    first bytes. They are memory-mapped, if *stream* is a file, and never
+    go through the cache.
+    """
+    from bmi_map._compiled import MAGIC
+
+    head = stream.read(len(MAGIC))
+    if head == MAGIC:
+        spec = _load_compiled(stream, head)
+        return spec if lazy else dict(spec)
+    return _load(head + stream.read(), lazy=lazy, cache=cache)
+
+
+def _load_compiled(
+    stream: BinaryIO, head: bytes
+) -> Mapping[str, tuple[Parameter, ...]]:
+    import mmap
+
+    from bmi_map._compiled import CompiledSpec
+
+    try:
+        buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        return CompiledSpec(head + stream.read())
+    return CompiledSpec(buffer)
+
+
+def loads(
+    s: str, lazy: bool = False, cache: SpecCache | bool | None = None
+) -> Mapping[str, tuple[Parameter, ...]]:
+    """Load a spec from a TOML-formatted string.
+
+    See Also
+    --------
+    load
+    """
+    return _load(s.encode(), lazy=lazy, cache=cache)
+
+
+def dumps(spec: Mapping[str, Sequence[Parameter]]) -> str:
+    """Format a spec as a TOML document.
+
+    The document can be read back with :func:`load` or :func:`loads`.
+
+    Examples
+    --------
+    >>> from bmi_map._parameter import Parameter
+    >>> from bmi_map.bmi_map import dumps
+    >>> print(dumps({"update_until": [Parameter("time", "in", "double")]}))
+    [bmi.update_until]
+    params = [
+        { name = "time", intent = "in", type = "double" },
+    ]
+    <BLANKLINE>
+    """
+    return "".join(_iter_toml(spec))
+
+
+def _iter_toml(spec: Mapping[str, Sequence[Parameter]]) -> Iterator[str]:
+    if not spec:
+        yield "[bmi]\n"
+    separator = ""
+    for name, params in spec.items():
+        key = name if re.fullmatch(r"[A-Za-z0-9_-]+", name) else json.dumps(name)
+        if params:
+            lines = [f"{separator}[bmi.{key}]\nparams = [\n"]
+            lines += [
+                f"    {{ name = {json.dumps(param.name)},"
+                f" intent = {json.dumps(param.intent)},"
+                f" type = {json.dumps(param.type)} }},\n"
+                for param in params
+            ]
+            lines.append("]\n")
+            yield "".join(lines)
+        else:
+            yield f"{separator}[bmi.{key}]\nparams = []\n"
+        separator = "\n"
+
+
+def _load(
+    content: bytes, lazy: bool = False, cache: SpecCache | bool | None = None
+) -> Mapping[str, tuple[Parameter, ...]]:
+    spec_cache = _get_spec_cache(cache)
+    if spec_cache is None:
+        with phase("parse"):
+            funcs = _parse_toml(content)
+        return _spec_to_dict(funcs, lazy=lazy)
+
+    with phase("spec-cache"):
+        spec = spec_cache.get(content)
+    if spec is None:
+        with phase("parse"):
+            funcs = _parse_toml(content)
+        spec = dict(_spec_to_dict(funcs))
+        with phase("spec-cache"):
+            spec_cache.put(content, spec)
+    return spec
+
+
+def _parse_toml(content: bytes) -> Any:
+    import tomllib
+
+    try:
+        return tomllib.loads(content.decode())["bmi"]
+    except KeyError:
+        raise ValueError("spec has no [bmi] table") from None
+
 
+def _get_spec_cache(cache: SpecCache | bool | None) -> SpecCache | None:
+    from bmi_map._spec_cache import spec_cache_enabled
+    from bmi_map._spec_cache import SpecCache
 
-def loads(s: str) -> dict[str, tuple[Parameter, ...]]:
-    return _spec_to_dict(tomllib.loads(s)["bmi"])
+    if cache is None:
+        cache = spec_cache_enabled()
+    if cache is True:
+        return SpecCache()
+    elif cache is False:
+        return None
+    else:
+        return cache
 
 
-def _spec_to_dict(funcs: dict[str, dict[str, Any]]) -> dict[str, tuple[Parameter, ...]]:
-    return {
-        name: tuple(Parameter(**param) for param in signature["params"])
-        for name, signature in funcs.items()
-    }
+def _spec_to_dict(
+    funcs: dict[str, dict[str, Any]], lazy: bool = False
+) -> Mapping[str, tuple[Parameter, ...]]:
+    for name in funcs:
+        validate_function_name(name)
+    if lazy:
+        return LazySpec(funcs)
+    with phase("validate"):
+        return {
+            name: signature_to_params(name, signature)
+            for name, signature in funcs.items()
+        }
@@ -1,50 +1,37 @@
-from collections.abc import Sequence
+from bmi_map._mapper import Signature
+from bmi_map._mapper import TableMapper
 
-from bmi_map._mapper import LanguageMapper
-from bmi_map._parameter import Parameter
-from bmi_map._parameter import split_array_type
 
+class CMapper(TableMapper):
+    extension = ".h"
 
-class CMapper(LanguageMapper):
-    _type_mapping = {
+    scalar_types = {
         "int": "int",
         "double": "double",
         "string": "char*",
     }
+    array_types = {
+        "any": "void*",
+        "int": "int*",
+        "double": "double*",
+        "string": "char*",
+    }
+    dim_template = ", const int {dim}"
+    leading = ("void* self",)
 
-    def map(self, name: str, params: Sequence[Parameter]) -> str:
-        return f"int {name}({self.map_params(params)});"
-
-    @staticmethod
-    def map_type(dtype: str) -> str:
-        if dtype.startswith("array"):
-            array_type, _ = split_array_type(dtype)
-            if array_type == "any":
-                c_type = "void"
-            else:
-                c_type = CMapper.map_type(array_type)
-
-            if array_type != "string":
-                c_type += "*"
-        else:
-            c_type = CMapper._type_mapping[dtype]
-        return c_type
-
-    @staticmethod
-    def map_param(param: Parameter) -> str:
-        c_type = CMapper.map_type(param.type)
-        if param.intent.endswith("out") and param.type != "string":
-            c_type = f"{c_type}*"
-        if param.intent == "in" or param.type == "string":
-            c_type = f"const {c_type}"
-        c_param = f"{c_type} {param.name}"
+    def map_signature(self, signature: Signature) -> str:
+        return f"int {signature.name}({self.map_params(signature.params)});"
 
-        if param.type.startswith("array"):
-            _, dims = split_array_type(param.type)
-            c_param = ", ".join([c_param] + [f"const int {dim}" for dim in dims])
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        is_string = not isarray and dtype == "string"
 
-        return c_param
+        if isarray and dtype == "string":
+            # An array of strings is an array of char*, whatever its intent.
+            type_ = f"{type_}*"
+        elif intent.endswith("out") and not is_string:
+            type_ = f"{type_}*"
+        if intent == "in" or is_string:
+            type_ = f"const {type_}"
 
-    @staticmethod
-    def map_params(params: Sequence[Parameter]) -> str:
-        return ", ".join(["void* self"] + [CMapper.map_param(p) for p in params])
+        return f"{type_} {{name}}{{dims}}"
@@ -1,60 +1,76 @@
 from collections.abc import Sequence
+from typing import Any
 
-from bmi_map._mapper import LanguageMapper
+from bmi_map._mapper import Signature
+from bmi_map._mapper import TableMapper
 from bmi_map._parameter import Parameter
-from bmi_map._parameter import split_array_type
 
 
-class CxxMapper(LanguageMapper):
-    _type_mapping = {
+class CxxMapper(TableMapper):
+    """Map functions to C++.
+
+    Strings are passed as ``std::string`` and arrays as pointers. See
+    :class:`ZeroCopyCxxMapper` for a style that passes views instead.
+    """
+
+    extension = ".hxx"
+    style = "classic"
+
+    scalar_types = {
         "int": "int",
         "double": "double",
         "string": "std::string",
     }
+    array_types = {
+        "any": "void*",
+        "int": "int*",
+        "double": "double*",
+        "string": "std::vector<std::string>*",
+    }
 
-    def map(self, name: str, params: Sequence[Parameter]) -> str:
-        name = "".join(part.title() for part in name.split("_"))
-        return f"{self.map_returns(params)} {name}({self.map_params(params)});"
-
-    @staticmethod
-    def map_type(dtype: str) -> str:
-        if dtype.startswith("array"):
-            array_type, _ = split_array_type(dtype)
-            if array_type == "any":
-                cxx_type = "void"
-            elif array_type == "string":
-                cxx_type = "std::vector<std::string>"
-            else:
-                cxx_type = CxxMapper.map_type(array_type)
-
-            if dtype != "string":
-                cxx_type += "*"
-        else:
-            cxx_type = CxxMapper._type_mapping[dtype]
-
-        return cxx_type
-
-    @staticmethod
-    def map_param(param: Parameter) -> str:
-        cxx_type = CxxMapper.map_type(param.type)
-        if param.type != "string":
-            if param.intent == "in":
-                cxx_type = f"const {cxx_type}"
-            elif param.intent.endswith("out"):
-                cxx_type = f"{cxx_type}*"
-        return f"{cxx_type} {param.name}"
-
-    @staticmethod
-    def map_params(params: Sequence[Parameter]) -> str:
-        return ", ".join(
-            CxxMapper.map_param(param)
-            for param in params
-            if param.intent.startswith("in")
-        )
-
-    @staticmethod
-    def map_returns(params: Sequence[Parameter]) -> str:
-        returns = [CxxMapper.map_type(p.type) for p in params if p.intent == "out"]
+    @classmethod
+    def from_options(cls, style: str | None = None, **options: Any) -> "CxxMapper":
+        """Create the mapper for a style of C++.
+
+        Parameters
+        ----------
+        style : {"classic", "zero-copy"}, optional
+            The ``"classic"`` style passes strings as ``std::string`` and
+            arrays as pointers. The ``"zero-copy"`` style passes views
+            (``std::string_view`` and ``std::span``) so that implementations
+            can hand out their own data without copying or allocating.
+            The default is the style of the class.
+        **options
+            Keyword arguments passed to the mapper class.
+        """
+        if style is None:
+            return cls(**options)
+        try:
+            mapper_class = CXX_STYLES[style]
+        except KeyError:
+            raise ValueError(
+                f"C++ style not understood ({style!r} not one of"
+                f" {', '.join(repr(s) for s in CXX_STYLES)})"
+            ) from None
+        return mapper_class(**options)
+
+    def map_signature(self, signature: Signature) -> str:
+        name = "".join(part.title() for part in signature.name.split("_"))
+        returns = self.map_returns(signature.returns)
+        return f"{returns} {name}({self.map_params(signature.inputs)});"
+
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        if isarray or dtype != "string":
+            if intent == "in":
+                type_ = f"const {type_}"
+            elif intent.endswith("out"):
+                type_ = f"{type_}*"
+        return f"{type_} {{name}}"
+
+    @classmethod
+    def map_returns(cls, params: Sequence[Parameter]) -> str:
+        returns = [cls.map_type(p.type_spec) for p in params]
 
         if len(returns) == 0:
             return "void"
@@ -62,3 +78,50 @@ class CxxMapper(LanguageMapper):
             return returns[0]
         else:
             raise ValueError("multiple return types not allowed")
+
+
+class ZeroCopyCxxMapper(CxxMapper):
+    """Map functions to C++ using views rather than owning types.
+
+    Strings are ``std::string_view`` and arrays are ``std::span``, whose
+    elements are ``const`` unless the parameter's intent lets the function
+    modify them. Values that are returned are read-only views.
+    """
+
+    style = "zero-copy"
+
+    _elements = {
+        "any": "std::byte",
+        "int": "int",
+        "double": "double",
+        "string": "std::string_view",
+    }
+
+    scalar_types = {
+        "int": "int",
+        "double": "double",
+        "string": "std::string_view",
+    }
+    array_types = {
+        dtype: f"std::span<const {element}>" for dtype, element in _elements.items()
+    }
+
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        if isarray:
+            if intent != "in":
+                type_ = f"std::span<{cls._elements[dtype]}>"
+        elif dtype == "string":
+            if intent != "in":
+                type_ = f"{type_}&"
+        elif intent == "in":
+            type_ = f"const {type_}"
+        else:
+            type_ = f"{type_}*"
+        return f"{type_} {{name}}"
+
+
+CXX_STYLES: dict[str, type[CxxMapper]] = {
+    CxxMapper.style: CxxMapper,
+    ZeroCopyCxxMapper.style: ZeroCopyCxxMapper,
+}
@@ -1,56 +1,39 @@
 from collections.abc import Sequence
 
-from bmi_map._mapper import LanguageMapper
+from bmi_map._mapper import Signature
+from bmi_map._mapper import TableMapper
 from bmi_map._parameter import Parameter
-from bmi_map._parameter import split_array_type
 
 
-class PythonMapper(LanguageMapper):
-    _type_mapping = {
+class PythonMapper(TableMapper):
+    extension = ".pyi"
+
+    scalar_types = {
         "int": "int",
         "double": "float",
         "string": "str",
     }
+    array_types = {
+        "any": "NDArray[Any]",
+        "int": "NDArray[int]",
+        "double": "NDArray[float]",
+        "string": "tuple[str, ...]",
+    }
+    leading = ("self",)
 
-    def map(self, name: str, params: Sequence[Parameter]) -> str:
+    def map_signature(self, signature: Signature) -> str:
         return (
-            f"def {name}({PythonMapper.map_params(params)})"
-            f" -> {PythonMapper.map_returns(params)}:"
+            f"def {signature.name}({self.map_params(signature.inputs)})"
+            f" -> {self.map_returns(signature.outputs)}:"
         )
 
-    @staticmethod
-    def map_type(dtype: str) -> str:
-        if dtype.startswith("array"):
-            array_type, _ = split_array_type(dtype)
-            if array_type == "any":
-                py_type = "Any"
-            elif array_type == "string":
-                py_type = "tuple[str, ...]"
-            else:
-                py_type = PythonMapper.map_type(array_type)
-
-            if array_type != "string":
-                py_type = f"NDArray[{py_type}]"
-        else:
-            py_type = PythonMapper._type_mapping[dtype]
-        return py_type
-
-    @staticmethod
-    def map_param(param: Parameter) -> str:
-        return f"{param.name}: {PythonMapper.map_type(param.type)}"
-
-    @staticmethod
-    def map_params(params: Sequence[Parameter]) -> str:
-        return ", ".join(
-            ["self"]
-            + [PythonMapper.map_param(p) for p in params if p.intent.startswith("in")]
-        )
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        return f"{{name}}: {type_}"
 
-    @staticmethod
-    def map_returns(params: Sequence[Parameter]) -> str:
-        returns = [
-            PythonMapper.map_type(p.type) for p in params if p.intent.endswith("out")
-        ]
+    @classmethod
+    def map_returns(cls, params: Sequence[Parameter]) -> str:
+        returns = [cls.map_type(p.type_spec) for p in params]
         if len(returns) == 0:
             return "None"
         elif len(returns) == 1:
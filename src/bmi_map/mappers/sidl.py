@@ -1,31 +1,26 @@
-from collections.abc import Sequence
+from bmi_map._mapper import Signature
+from bmi_map._mapper import TableMapper
 
-from bmi_map._mapper import LanguageMapper
-from bmi_map._parameter import Parameter
-from bmi_map._parameter import split_array_type
 
+class SidlMapper(TableMapper):
+    extension = ".sidl"
 
-class SidlMapper(LanguageMapper):
-    def map(self, name: str, params: Sequence[Parameter]) -> str:
-        return f"int {name}({SidlMapper.map_params(params)});"
+    scalar_types = {
+        "int": "int",
+        "double": "double",
+        "string": "string",
+    }
+    array_types = {
+        "any": "array<,{rank}>",
+        "int": "array<int,{rank}>",
+        "double": "array<double,{rank}>",
+        "string": "array<string,{rank}>",
+    }
+    rank_template = " {rank}"
 
-    @staticmethod
-    def map_type(dtype: str) -> str:
-        if dtype.startswith("array"):
-            dtype, dims = split_array_type(dtype)
-            if dtype == "any":
-                dtype = ""
-            if dims:
-                return f"array<{dtype.strip()}, {len(dims)}>"
-            else:
-                return f"array<{dtype.strip()},>"
-        else:
-            return dtype
+    def map_signature(self, signature: Signature) -> str:
+        return f"int {signature.name}({self.map_params(signature.params)});"
 
-    @staticmethod
-    def map_param(param: Parameter) -> str:
-        return f"{param.intent} {SidlMapper.map_type(param.type)} {param.name}"
-
-    @staticmethod
-    def map_params(params: Sequence[Parameter]) -> str:
-        return ", ".join(SidlMapper.map_param(p) for p in params)
+    @classmethod
+    def param_template(cls, intent: str, isarray: bool, dtype: str, type_: str) -> str:
+        return f"{intent} {type_} {{name}}"
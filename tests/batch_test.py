@@ -0,0 +1,114 @@
+import pytest
+from bmi_map._batch import expand_spec_paths
+from bmi_map._batch import map_spec_batch
+from bmi_map._bmi import BMI
+from bmi_map._main import main
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import map_spec
+
+EXTRA = """
+[bmi.get_{name}]
+params = [{{ name = "x", intent = "out", type = "double" }}]
+"""
+
+
+@pytest.fixture
+def specs():
+    grid = (Parameter("grid", "in", "int"),)
+    return [
+        dict(BMI),
+        {"update": BMI["update"], "get_grid_rank": grid},
+        {"update": BMI["update"], "get_grid_rank": grid},
+        {"get_grid_rank": (Parameter("grid", "out", "int"),)},
+    ]
+
+
+def _write_specs(path, names):
+    for name in names:
+        (path / f"{name}.toml").write_text(
+            """\
+[bmi.update]
+params = []
+"""
+            + EXTRA.format(name=name)
+        )
+
+
+def test_expand_spec_paths(tmp_path):
+    _write_specs(tmp_path, ("b", "a", "c"))
+
+    paths = expand_spec_paths([str(tmp_path / "b.toml"), str(tmp_path / "*.toml")])
+    assert paths == [str(tmp_path / name) for name in ("b.toml", "a.toml", "c.toml")]
+
+
+def test_expand_spec_paths_without_match(tmp_path):
+    assert expand_spec_paths([str(tmp_path / "*.toml")]) == [str(tmp_path / "*.toml")]
+
+
+@pytest.mark.parametrize("jobs", (None, 2))
+def test_map_spec_batch_matches_map_spec(specs, jobs):
+    mapped, _ = map_spec_batch(specs, to=("c", "python"), jobs=jobs, executor="thread")
+    assert mapped == [map_spec(spec, to=("c", "python")) for spec in specs]
+
+
+def test_map_spec_batch_stats(specs):
+    _, stats = map_spec_batch(specs, to=("c", "sidl"))
+
+    assert stats.specs == 4
+    assert stats.functions == len(BMI) + 5
+    assert stats.unique == len(BMI) + 2
+    assert stats.languages == 2
+    assert stats.saved == pytest.approx(3 / (len(BMI) + 5))
+
+
+def test_map_spec_batch_empty():
+    mapped, stats = map_spec_batch([], to="c")
+    assert mapped == []
+    assert stats.saved == 0.0
+
+
+def test_batch_command(tmp_path, capsys):
+    _write_specs(tmp_path, ("a", "b"))
+
+    argv = ["--spec", str(tmp_path / "*.toml"), "--to", "c", "sidl"]
+    assert main(argv + ["--output-dir", str(tmp_path / "out")]) == 0
+
+    assert sorted(p.name for p in (tmp_path / "out" / "a" / "c").iterdir()) == [
+        "get_a.h",
+        "update.h",
+    ]
+    assert sorted(p.name for p in (tmp_path / "out" / "b" / "sidl").iterdir()) == [
+        "get_b.sidl",
+        "update.sidl",
+    ]
+    assert (tmp_path / "out" / "b" / "c" / "get_b.h").read_text() == (
+        "int get_b(void* self, double* x);\n"
+    )
+    assert "3 unique" in capsys.readouterr().err
+
+
+def test_batch_command_requires_output_dir(tmp_path):
+    _write_specs(tmp_path, ("a", "b"))
+    with pytest.raises(SystemExit):
+        main(["--spec", str(tmp_path / "*.toml")])
+
+
+def test_batch_command_spec_names_must_differ(tmp_path):
+    for folder in ("x", "y"):
+        (tmp_path / folder).mkdir()
+        _write_specs(tmp_path / folder, ("a",))
+
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "--spec",
+                str(tmp_path / "*" / "a.toml"),
+                "--output-dir",
+                str(tmp_path / "out"),
+            ]
+        )
+
+
+def test_spec_not_found(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["--spec", str(tmp_path / "missing.toml")])
@@ -0,0 +1,67 @@
+import pytest
+from bmi_map._cache import LRUCache
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import bmi_map
+from bmi_map.bmi_map import get_mapper
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.bmi_map import mapping_cache_info
+from bmi_map.bmi_map import set_mapping_cache_size
+
+
+@pytest.fixture
+def mapping_cache():
+    mapping_cache_clear()
+    yield
+    set_mapping_cache_size(4096)
+    mapping_cache_clear()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.lookup("a", lambda: 1)
+    cache.lookup("b", lambda: 2)
+    cache.lookup("a", lambda: 0)
+    cache.lookup("c", lambda: 3)
+
+    assert cache.lookup("a", lambda: 0) == 1
+    assert cache.lookup("b", lambda: 0) == 0
+    assert cache.info().evictions == 2
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(maxsize=0)
+    assert cache.lookup("a", lambda: 1) == 1
+    assert cache.lookup("a", lambda: 2) == 2
+    assert len(cache) == 0
+
+
+def test_lru_cache_resize():
+    cache = LRUCache(maxsize=None)
+    for value in range(10):
+        cache.lookup(value, lambda value=value: value)
+    cache.resize(4)
+    assert cache.info().currsize == 4
+    assert cache.info().evictions == 6
+
+
+def test_mapper_is_shared():
+    assert get_mapper("c") is get_mapper("c")
+
+
+def test_bmi_map_uses_cache(mapping_cache):
+    params = [Parameter(name="a", intent="in", type="int")]
+
+    first = bmi_map("foo", params, to="c")
+    second = bmi_map("foo", tuple(params), to="c")
+
+    assert first == second
+    info = mapping_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_bmi_map_without_cache(mapping_cache):
+    set_mapping_cache_size(0)
+    params = [Parameter(name="a", intent="in", type="int")]
+
+    assert bmi_map("foo", params, to="c") == bmi_map("foo", params, to="c")
+    assert mapping_cache_info().currsize == 0
@@ -0,0 +1,110 @@
+import pytest
+from bmi_map._check import check_spec
+from bmi_map._check import SpecError
+from bmi_map._main import main
+from bmi_map._spec_cache import SpecCache
+from bmi_map.bmi_map import loads
+
+
+def test_check_valid_spec():
+    funcs = {"foo": {"params": [{"name": "a", "intent": "in", "type": "int"}]}}
+    assert check_spec(funcs) == []
+
+
+def test_check_reports_every_error():
+    funcs = {
+        "foo": {
+            "params": [
+                {"name": "a", "intent": "up", "type": "long"},
+                {"name": "a", "intent": "in", "type": "array[int, n, n]"},
+            ]
+        },
+        "bar": {},
+    }
+    errors = check_spec(funcs)
+    assert [error.location for error in errors] == [
+        "foo.params[0].intent",
+        "foo.params[0].type",
+        "foo.params[1].type",
+        "foo.params[1].name",
+        "bar",
+    ]
+
+
+def test_check_function_name():
+    funcs = {"../escaped": {"params": []}}
+    assert check_spec(funcs) == [
+        SpecError("../escaped", "not a valid function name"),
+    ]
+
+
+def test_check_fail_fast():
+    funcs = {"foo": {"params": [{"name": "1a", "intent": "up", "type": "long"}]}}
+    assert len(check_spec(funcs)) == 3
+    assert len(check_spec(funcs, fail_fast=True)) == 1
+
+
+@pytest.mark.parametrize(
+    "param,field",
+    (
+        ({"intent": "in", "type": "int"}, "name"),
+        ({"name": "a", "intent": "in", "type": "int", "units": "m"}, "units"),
+        ({"name": "a", "intent": 1, "type": "int"}, "intent"),
+    ),
+)
+def test_check_param_fields(param, field):
+    (error,) = check_spec({"foo": {"params": [param]}})
+    assert error == SpecError("foo", error.message, parameter=0, field=field)
+
+
+def test_check_non_table_param():
+    (error,) = check_spec({"foo": {"params": ["a"]}})
+    assert str(error).startswith("foo.params[0]: ")
+
+
+def test_check_command(tmp_path, capsys):
+    spec = tmp_path / "spec.toml"
+    spec.write_text(
+        """\
+[bmi.foo]
+params = [{ name = "a", intent = "in", type = "long" }]
+
+[bmi.bar]
+"""
+    )
+    assert main(["check", "--spec", str(spec)]) == 1
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(": ")[1] for line in lines] == ["foo.params[0].type", "bar"]
+
+
+def test_check_command_ok(tmp_path, capsys):
+    spec = tmp_path / "spec.toml"
+    spec.write_text(
+        """\
+[bmi.foo]
+params = [{ name = "a", intent = "in", type = "int" }]
+"""
+    )
+    assert main(["check", "--spec", str(spec)]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_check_command_no_bmi_table(tmp_path, capsys):
+    spec = tmp_path / "spec.toml"
+    spec.write_text("[foo]\nparams = []\n")
+    assert main(["check", "--spec", str(spec)]) == 1
+    assert capsys.readouterr().out == f"{spec}: bmi: missing table\n"
+
+
+@pytest.mark.parametrize("cache", (False, True))
+def test_load_no_bmi_table(tmp_path, cache):
+    with pytest.raises(ValueError, match="no \\[bmi\\] table"):
+        loads("[foo]\nparams = []\n", cache=SpecCache(tmp_path) if cache else False)
+
+
+def test_check_command_bad_toml(tmp_path, capsys):
+    spec = tmp_path / "spec.toml"
+    spec.write_text("[bmi.foo\n")
+    assert main(["check", "--spec", str(spec)]) == 1
+    assert capsys.readouterr().out.startswith(f"{spec}: ")
@@ -10,3 +10,101 @@ def test_help():
 def test_version():
     with pytest.raises(SystemExit):
         main(["--version"])
+
+
+def test_to_several_languages(capsys):
+    assert (
+        main(["--to", "c", "python", "--include", "^update$", "--color", "never"]) == 0
+    )
+
+    output = capsys.readouterr().out
+    assert output == "int update(void* self);\n\ndef update(self) -> None:\n"
+
+
+def test_spec_only_validates_included(tmp_path, capsys):
+    spec = tmp_path / "spec.toml"
+    spec.write_text(
+        """\
+[bmi.foo]
+params = [{ name = "a", intent = "in", type = "int" }]
+
+[bmi.bar]
+params = [{ name = "b", intent = "in", type = "long" }]
+"""
+    )
+    assert main(["--spec", str(spec), "--include", "foo", "--color", "never"]) == 0
+    assert capsys.readouterr().out == "int foo(in int a);\n"
+
+
+@pytest.mark.parametrize("executor", ("process", "thread"))
+def test_jobs_matches_serial(capsys, executor):
+    argv = ["--to", "c", "sidl", "--color", "never"]
+
+    main(argv)
+    serial = capsys.readouterr().out
+    main(argv + ["--jobs", "2", "--executor", executor])
+    parallel = capsys.readouterr().out
+
+    assert parallel == serial
+
+
+@pytest.mark.parametrize("jobs", ("-1", "two"))
+def test_bad_jobs(capsys, jobs):
+    with pytest.raises(SystemExit):
+        main(["--jobs", jobs])
+    assert "--jobs" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("flag,n_entries", [("--cache", 1), ("--no-cache", 0)])
+def test_spec_cache(tmp_path, monkeypatch, capsys, flag, n_entries):
+    monkeypatch.setenv("BMI_MAP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("BMI_MAP_SPEC_CACHE", "1")
+    spec = tmp_path / "spec.toml"
+    spec.write_text(
+        '[bmi.foo]\nparams = [{ name = "a", intent = "in", type = "int" }]\n'
+    )
+
+    for _ in range(2):
+        assert main(["--spec", str(spec), flag, "--color", "never"]) == 0
+        assert capsys.readouterr().out == "int foo(in int a);\n"
+
+    assert len(list(tmp_path.rglob("*.pickle"))) == n_entries
+
+
+@pytest.mark.parametrize(
+    "style,expected",
+    [
+        (None, "std::string GetVarUnits(std::string name);\n"),
+        ("classic", "std::string GetVarUnits(std::string name);\n"),
+        ("zero-copy", "std::string_view GetVarUnits(std::string_view name);\n"),
+    ],
+)
+def test_cxx_style(capsys, style, expected):
+    argv = ["--to", "c++", "--include", "^get_var_units$", "--color", "never"]
+    if style is not None:
+        argv += ["--cxx-style", style]
+    assert main(argv) == 0
+    assert capsys.readouterr().out == expected
+
+    assert main(argv[:-2] if style else argv) == 0
+    assert capsys.readouterr().out == "std::string GetVarUnits(std::string name);\n"
+
+
+def test_batched(tmp_path, capsys):
+    argv = ["--to", "python", "--include", "_values$", "--color", "never"]
+    assert main(argv) == 0
+    assert capsys.readouterr().out.strip() == ""
+
+    assert main(argv + ["--batched"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "def get_values(self, names: tuple[str, ...], dest: NDArray[Any]) -> None:",
+        "def set_values(self, names: tuple[str, ...], src: NDArray[Any]) -> None:",
+    ]
+
+    spec = tmp_path / "spec.toml"
+    spec.write_text("[bmi.update]\nparams = []\n")
+    assert main(["--spec", str(spec), "--batched", "--color", "never"]) == 0
+    assert capsys.readouterr().out.splitlines()[:2] == [
+        "int update();",
+        "int get_values(in array<string, 1> names, in array<,> dest);",
+    ]
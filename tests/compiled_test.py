@@ -0,0 +1,124 @@
+import io
+import struct
+
+import pytest
+from bmi_map._bmi import BMI
+from bmi_map._compiled import compile_spec
+from bmi_map._compiled import CompiledSpec
+from bmi_map._compiled import dump
+from bmi_map._compiled import MAGIC
+from bmi_map._compiled import open_compiled
+from bmi_map._main import main
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import iter_map
+from bmi_map.bmi_map import load
+
+SPEC = """\
+[bmi.foo]
+params = [
+    { name = "café", intent = "in", type = "array[double, m,n]" },
+    { name = "b", intent = "out", type = "int" },
+]
+
+[bmi.bar]
+params = []
+"""
+
+
+def test_roundtrip():
+    spec = CompiledSpec(compile_spec(BMI))
+
+    assert len(spec) == len(BMI)
+    assert list(spec) == list(BMI)
+    assert dict(spec) == dict(BMI)
+    assert spec["update"] is spec["update"]
+
+
+def test_strings_are_stored_once():
+    params = (Parameter(name="grid", intent="in", type="int"),)
+    data = compile_spec({f"f{i}": params for i in range(10)})
+
+    assert data.count(b"grid") == 1
+    assert dict(CompiledSpec(data)) == {f"f{i}": params for i in range(10)}
+
+
+def test_missing_function():
+    with pytest.raises(KeyError):
+        CompiledSpec(compile_spec(BMI))["foo"]
+
+
+@pytest.mark.parametrize("lazy", (True, False))
+def test_load_detects_compiled(lazy):
+    spec = load(io.BytesIO(SPEC.encode()))
+    compiled = load(io.BytesIO(compile_spec(spec)), lazy=lazy)
+
+    assert isinstance(compiled, CompiledSpec) is lazy
+    assert dict(compiled) == spec
+    assert compiled["foo"][0].type == "array[double, m, n]"
+
+
+def test_load_memory_maps_file(tmp_path):
+    dump(BMI, tmp_path / "bmi.bmispec")
+
+    with open(tmp_path / "bmi.bmispec", "rb") as fp:
+        spec = load(fp, lazy=True)
+    assert dict(spec) == dict(BMI)
+    assert dict(open_compiled(tmp_path / "bmi.bmispec")) == dict(BMI)
+
+
+def test_iter_map_compiled():
+    compiled = compile_spec({"update": BMI["update"]})
+    assert list(iter_map([compiled], to="c")) == [
+        ("c", "update", "int update(void* self);")
+    ]
+
+
+@pytest.mark.parametrize(
+    "data,match",
+    (
+        (b"BMISPEC", "too short"),
+        (b"NOTASPEC" + bytes(16), "not a compiled spec"),
+        (struct.pack("<8sHxxIII", MAGIC, 99, 0, 0, 0), "version"),
+        (compile_spec(BMI)[:-10], "truncated"),
+    ),
+)
+def test_bad_compiled_spec(data, match):
+    with pytest.raises(ValueError, match=match):
+        CompiledSpec(data)
+
+
+def test_compile_command(tmp_path, capsys):
+    (tmp_path / "spec.toml").write_text(SPEC)
+
+    assert main(["compile", str(tmp_path / "spec.toml")]) == 0
+    assert (tmp_path / "spec.bmispec").read_bytes().startswith(MAGIC)
+
+    outputs = []
+    for path in ("spec.toml", "spec.bmispec"):
+        main(["--spec", str(tmp_path / path), "--to", "c", "--color", "never"])
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1]
+
+
+def test_compile_command_output(tmp_path):
+    (tmp_path / "spec.toml").write_text(SPEC)
+    assert (
+        main(["compile", str(tmp_path / "spec.toml"), "-o", str(tmp_path / "x")]) == 0
+    )
+    assert dict(open_compiled(tmp_path / "x")) == load(io.BytesIO(SPEC.encode()))
+
+
+def test_compile_command_invalid_spec(tmp_path, capsys):
+    (tmp_path / "spec.toml").write_text(SPEC.replace('"int"', '"long"'))
+    assert main(["compile", str(tmp_path / "spec.toml")]) == 1
+    assert "type not understood" in capsys.readouterr().err
+    assert not (tmp_path / "spec.bmispec").exists()
+
+
+def test_compile_command_missing_type(tmp_path, capsys):
+    (tmp_path / "spec.toml").write_text(SPEC.replace(', type = "int"', ""))
+    assert main(["compile", str(tmp_path / "spec.toml")]) == 1
+    assert capsys.readouterr().err == (
+        f"{tmp_path / 'spec.toml'}: foo.params[1].type: missing\n"
+    )
+    assert not (tmp_path / "spec.bmispec").exists()
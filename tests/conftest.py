@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk caches of every test out of the user's cache folder."""
+    path = tmp_path / "bmi-map-cache"
+    monkeypatch.setenv("BMI_MAP_CACHE_DIR", str(path))
+    return path
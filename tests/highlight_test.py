@@ -0,0 +1,34 @@
+import re
+
+import pytest
+from bmi_map._main import get_highlighter
+from bmi_map._main import Highlighter
+
+pytest.importorskip("pygments")
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@pytest.mark.parametrize("language", ("c", "c++", "python", "sidl"))
+@pytest.mark.parametrize("depth", ("256", "truecolor"))
+def test_highlight_keeps_text(language, depth):
+    text = "int foo(void* self);\nint bar(void* self);"
+    highlighted = Highlighter(language, depth=depth)(text)
+    assert ANSI_ESCAPE.sub("", highlighted) == text
+
+
+def test_highlight_color_depth():
+    assert "\x1b[38;5;" in Highlighter("c", depth="256")("int foo;")
+    assert "\x1b[38;2;" in Highlighter("c", depth="truecolor")("int foo;")
+
+
+@pytest.mark.parametrize(
+    "colorterm,expected", [("truecolor", "\x1b[38;2;"), ("", "\x1b[38;5;")]
+)
+def test_highlight_auto_depth(monkeypatch, colorterm, expected):
+    monkeypatch.setenv("COLORTERM", colorterm)
+    assert expected in Highlighter("c")("int foo;")
+
+
+def test_highlighter_is_shared():
+    assert get_highlighter("c", "256") is get_highlighter("c", "256")
@@ -1,3 +1,4 @@
+import pytest
 from bmi_map._parameter import Parameter
 from bmi_map.bmi_map import loads
 
@@ -36,3 +37,69 @@ def test_loads_empty():
 """
     spec = loads(content)
     assert spec == {}
+
+
+def test_loads_lazy_validates_on_access():
+    content = """\
+[bmi.foo]
+params = [
+    { name = "a", intent = "in", type = "double" }
+]
+
+[bmi.bar]
+params = [
+    { name = "b", intent = "in", type = "long" }
+]
+"""
+    spec = loads(content, lazy=True)
+    assert list(spec) == ["foo", "bar"]
+    assert spec["foo"] == (Parameter(name="a", intent="in", type="double"),)
+
+    with pytest.raises(ValueError):
+        spec["bar"]
+    with pytest.raises(ValueError):
+        spec.validate_all()
+
+
+def test_loads_lazy_equals_eager():
+    content = """\
+[bmi.foo]
+params = [
+    { name = "a", intent = "in", type = "double" },
+    { name = "b", intent = "inout", type = "array[int, n]" },
+]
+"""
+    assert loads(content, lazy=True) == loads(content)
+
+
+@pytest.mark.parametrize("lazy", (True, False))
+@pytest.mark.parametrize("name", ("../../escaped", "a/b", "get.x", ""))
+def test_loads_rejects_bad_function_names(name, lazy):
+    content = f"""\
+[bmi.{name!r}]
+params = []
+"""
+    with pytest.raises(ValueError, match="function name is not valid"):
+        loads(content, lazy=lazy)
+
+
+@pytest.mark.parametrize(
+    "params,error",
+    (
+        ('["a"]', "foo.params[0]: not a table"),
+        ('[{ name = "a", intent = "in" }]', "foo.params[0].type: missing"),
+        (
+            '[{ name = "a", intent = "in", type = "int", units = "m" }]',
+            "foo.params[0].units: unknown field",
+        ),
+        (
+            '[{ name = "a", intent = "in", type = 1 }]',
+            "foo.params[0].type: not a string",
+        ),
+        ('"a"', "foo: 'params' is not an array"),
+    ),
+)
+def test_loads_malformed_params(params, error):
+    with pytest.raises(ValueError) as excinfo:
+        loads(f"[bmi.foo]\nparams = {params}\n")
+    assert str(excinfo.value) == error
@@ -1,6 +1,23 @@
+import io
+
 import pytest
+from bmi_map._bmi import BATCHED_BMI
+from bmi_map._bmi import BMI
+from bmi_map._bmi import with_batched
+from bmi_map._mapper import Signature
+from bmi_map._mapper import TableMapper
 from bmi_map._parameter import Parameter
+from bmi_map._parameter import VALID_ARRAY_TYPES
+from bmi_map._parameter import VALID_INTENTS
+from bmi_map._parameter import VALID_SCALAR_TYPES
 from bmi_map.bmi_map import bmi_map
+from bmi_map.bmi_map import get_mapper
+from bmi_map.bmi_map import iter_map
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapper_options
+from bmi_map.bmi_map import set_mapper_options
+from bmi_map.mappers.cxx import CxxMapper
+from bmi_map.mappers.cxx import ZeroCopyCxxMapper
 
 
 @pytest.mark.parametrize(
@@ -65,6 +82,19 @@ def test_c_array_intent(intent, expected):
     assert mapped_func == expected
 
 
+@pytest.mark.parametrize(
+    "intent,expected",
+    [
+        ("in", "int foo(void* self, const char** a);"),
+        ("inout", "int foo(void* self, char** a);"),
+        ("out", "int foo(void* self, char** a);"),
+    ],
+)
+def test_c_string_array_intent(intent, expected):
+    params = [Parameter(name="a", type="array[string]", intent=intent)]
+    assert bmi_map("foo", params, to="c") == expected
+
+
 @pytest.mark.parametrize(
     "dims,expected",
     [
@@ -115,3 +145,216 @@ def test_cxx_two_parameter(a_intent, b_intent, expected):
     ]
     mapped_func = bmi_map("foo", params, to="c++")
     assert mapped_func == expected
+
+
+@pytest.fixture
+def zero_copy():
+    set_mapper_options("c++", style="zero-copy")
+    yield
+    set_mapper_options("c++")
+
+
+@pytest.mark.parametrize(
+    "intent,type_,expected",
+    [
+        ("in", "int", "void Foo(const int a);"),
+        ("inout", "int", "void Foo(int* a);"),
+        ("out", "int", "int Foo();"),
+        ("in", "string", "void Foo(std::string_view a);"),
+        ("inout", "string", "void Foo(std::string_view& a);"),
+        ("out", "string", "std::string_view Foo();"),
+        ("in", "array[double]", "void Foo(std::span<const double> a);"),
+        ("inout", "array[double]", "void Foo(std::span<double> a);"),
+        ("out", "array[double]", "std::span<const double> Foo();"),
+        ("in", "array[any]", "void Foo(std::span<const std::byte> a);"),
+        ("inout", "array[any]", "void Foo(std::span<std::byte> a);"),
+        ("in", "array[string]", "void Foo(std::span<const std::string_view> a);"),
+        ("inout", "array[string]", "void Foo(std::span<std::string_view> a);"),
+        ("out", "array[string]", "std::span<const std::string_view> Foo();"),
+    ],
+)
+def test_cxx_zero_copy(zero_copy, intent, type_, expected):
+    params = [Parameter(name="a", type=type_, intent=intent)]
+    assert bmi_map("foo", params, to="c++") == expected
+
+
+def test_cxx_zero_copy_bmi(zero_copy):
+    mapped = map_spec(BMI, to="c++")["c++"]
+    assert mapped["get_input_var_names"] == (
+        "std::span<const std::string_view> GetInputVarNames();"
+    )
+    assert mapped["get_var_units"] == (
+        "std::string_view GetVarUnits(std::string_view name);"
+    )
+    assert mapped["get_grid_x"] == (
+        "void GetGridX(const int grid, std::span<const double> x);"
+    )
+
+
+def test_cxx_style_option():
+    assert type(CxxMapper()) is CxxMapper
+    assert type(ZeroCopyCxxMapper()) is ZeroCopyCxxMapper
+    assert type(CxxMapper.from_options()) is CxxMapper
+    assert type(CxxMapper.from_options(style="classic")) is CxxMapper
+    assert type(CxxMapper.from_options(style="zero-copy")) is ZeroCopyCxxMapper
+    with pytest.raises(ValueError, match="C\\+\\+ style not understood"):
+        CxxMapper.from_options(style="copy")
+    with pytest.raises(TypeError):
+        CxxMapper(style="zero-copy")
+
+
+def test_set_mapper_options(zero_copy):
+    assert mapper_options() == {"c++": {"style": "zero-copy"}}
+    assert isinstance(get_mapper("c++"), ZeroCopyCxxMapper)
+
+    params = [Parameter(name="a", type="string", intent="in")]
+    assert bmi_map("foo", params, to="c++") == "void Foo(std::string_view a);"
+    set_mapper_options("c++")
+    assert mapper_options() == {}
+    assert bmi_map("foo", params, to="c++") == "void Foo(std::string a);"
+
+    with pytest.raises(ValueError, match="language not understood"):
+        set_mapper_options("cobol", style="zero-copy")
+
+
+def test_map_spec_languages_in_order():
+    spec = {
+        "foo": [Parameter(name="a", type="int", intent="in")],
+        "bar": [Parameter(name="a", type="int", intent="out")],
+    }
+    mapped = map_spec(spec, to=("python", "c"))
+
+    assert list(mapped) == ["python", "c"]
+    assert list(mapped["python"]) == ["foo", "bar"]
+    assert list(mapped["c"]) == ["foo", "bar"]
+
+
+@pytest.mark.parametrize("to", ("c", "c++", "python", "sidl"))
+def test_map_spec_matches_bmi_map(to):
+    mapped = map_spec(BMI, to=to)
+    assert mapped == {
+        to: {name: bmi_map(name, params, to=to) for name, params in BMI.items()}
+    }
+
+
+def test_iter_map_is_lazy():
+    consumed = []
+
+    def functions():
+        for name, params in BMI.items():
+            consumed.append(name)
+            yield name, params
+
+    mapped = iter_map(functions(), to=("c", "sidl"))
+    assert consumed == []
+
+    assert next(mapped) == ("c", "finalize", "int finalize(void* self);")
+    assert next(mapped) == ("sidl", "finalize", "int finalize();")
+    assert consumed == ["finalize"]
+
+
+def test_iter_map_sources():
+    doc = '[bmi.foo]\nparams = [{ name = "a", intent = "in", type = "int" }]\n'
+    params = (Parameter(name="a", type="int", intent="in"),)
+    sources = [
+        doc,
+        doc.encode(),
+        io.BytesIO(doc.encode()),
+        {"foo": params},
+        ("foo", params),
+    ]
+
+    assert (
+        list(iter_map(sources, to="sidl"))
+        == [("sidl", "foo", "int foo(in int a);")] * 5
+    )
+
+
+def test_iter_map_include():
+    mapped = iter_map([BMI], to="python", include="^get_var_")
+    assert [name for _, name, _ in mapped] == [
+        name for name in BMI if name.startswith("get_var_")
+    ]
+
+
+def test_iter_map_matches_map_spec():
+    expected = map_spec(BMI, to=("c", "c++"))
+    for language, name, text in iter_map(BMI.items(), to=("c", "c++")):
+        assert expected[language][name] == text
+
+
+@pytest.mark.parametrize("to", ("c", "c++", "python", "sidl"))
+def test_mapper_tables_are_complete(to):
+    mapper = get_mapper(to)
+    keys = {
+        (intent, False, dtype)
+        for intent in VALID_INTENTS
+        for dtype in VALID_SCALAR_TYPES
+    }
+    keys |= {
+        (intent, True, dtype) for intent in VALID_INTENTS for dtype in VALID_ARRAY_TYPES
+    }
+    assert mapper._param_table.keys() == keys
+    if to == "c++":
+        assert ZeroCopyCxxMapper._param_table.keys() == keys
+
+
+def test_table_mapper_new_language():
+    class FortranMapper(TableMapper):
+        scalar_types = {"int": "integer", "double": "real(8)", "string": "character(*)"}
+        array_types = {"double": "real(8), dimension(*)"}
+
+        def map_signature(self, signature: Signature) -> str:
+            return f"function {signature.name}({self.map_params(signature.params)})"
+
+        @classmethod
+        def param_template(cls, intent, isarray, dtype, type_):
+            return f"{type_}, intent({intent}) :: {{name}}"
+
+    params = [
+        Parameter(name="grid", intent="in", type="int"),
+        Parameter(name="x", intent="out", type="array[double, n]"),
+    ]
+    assert FortranMapper().map("get_x", params) == (
+        "function get_x(integer, intent(in) :: grid,"
+        " real(8), dimension(*), intent(out) :: x)"
+    )
+
+
+def test_with_batched():
+    spec = with_batched(BMI)
+    assert list(spec) == list(BMI) + list(BATCHED_BMI)
+    assert len(spec) == len(BMI) + len(BATCHED_BMI)
+    assert spec["get_values"] == BATCHED_BMI["get_values"]
+
+    update = {"get_values": BMI["update"]}
+    assert dict(with_batched(update))["get_values"] == ()
+
+
+def test_with_batched_is_lazy():
+    class Spec(dict):
+        def __getitem__(self, name):
+            raise AssertionError(f"{name} accessed")
+
+    spec = with_batched(Spec(update=()))
+    assert list(spec)[0] == "update"
+    assert spec["set_values"] == BATCHED_BMI["set_values"]
+
+
+def test_map_batched():
+    mapped = map_spec(BATCHED_BMI)
+    assert mapped["c"]["get_values"] == (
+        "int get_values(void* self, const char** names, const int n_names,"
+        " const void* dest);"
+    )
+    assert mapped["c++"]["set_values"] == (
+        "void SetValues(const std::vector<std::string>* names, const void* src);"
+    )
+    assert mapped["python"]["get_values_at_indices"] == (
+        "def get_values_at_indices(self, names: tuple[str, ...],"
+        " dest: NDArray[Any], inds: NDArray[int]) -> None:"
+    )
+    assert mapped["sidl"]["set_values_at_indices"] == (
+        "int set_values_at_indices(in array<string, 1> names,"
+        " in array<int, 1> inds, in array<,> src);"
+    )
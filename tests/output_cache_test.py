@@ -0,0 +1,223 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bmi_map._batch import map_spec_batch
+from bmi_map._bmi import BMI
+from bmi_map._main import main
+from bmi_map._output_cache import OutputCache
+from bmi_map._parallel import map_specs_parallel
+from bmi_map._parameter import Parameter
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.bmi_map import set_mapper_options
+from bmi_map.bmi_map import set_output_cache
+
+PARAMS = (Parameter(name="a", intent="in", type="int"),)
+
+
+def _fail():
+    raise AssertionError("should not be called")
+
+
+FOO = OutputCache.digest([("foo", PARAMS)])
+
+
+def digest(name):
+    return OutputCache.digest([(name, ())])
+
+
+def test_cache_roundtrip(tmp_path):
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.lookup("c", FOO, lambda: ["int foo();"]) == ["int foo();"]
+        assert cache.lookup("c", FOO, _fail) == ["int foo();"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get("c", FOO) == ["int foo();"]
+        assert cache.get("c", digest("foo")) is None
+        cache.put("c", digest("foo"), ["int foo(void);"])
+        assert cache.get("c", digest("foo")) == ["int foo(void);"]
+        assert cache.lookup("sidl", FOO, lambda: ["sidl"]) == ["sidl"]
+
+    assert OutputCache(tmp_path / "cache.sqlite").stats() == {
+        "entries": 3,
+        "bytes": 3 * 32 + len('["int foo();"]["int foo(void);"]["sidl"]'),
+        "hits": 3,
+        "misses": 3,
+    }
+
+
+def test_digest_depends_on_functions():
+    assert FOO != digest("foo")
+    assert FOO == OutputCache.digest(
+        [("foo", [Parameter(name="a", intent=" in", type="int")])]
+    )
+    assert OutputCache.digest([("a", ()), ("b", ())]) != OutputCache.digest(
+        [("b", ()), ("a", ())]
+    )
+    assert OutputCache.key("c", FOO) != OutputCache.key("sidl", FOO)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with OutputCache(path) as cache:
+        for name in ("a", "b", "c"):
+            cache.put("c", digest(name), ["x" * 100])
+            cache.flush()
+    with OutputCache(path) as cache:
+        cache.lookup("c", digest("a"), _fail)
+
+    with OutputCache(path, max_bytes=400) as cache:
+        cache.put("c", digest("d"), ["x" * 100])
+
+    with OutputCache(path) as cache:
+        assert cache.stats()["entries"] == 2
+        cache.lookup("c", digest("a"), _fail)
+        cache.lookup("c", digest("d"), _fail)
+
+
+def test_cache_clear(tmp_path):
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        cache.put("c", FOO, ["int foo();"])
+        cache.flush()
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+
+def test_cache_not_a_database(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    path.write_bytes(b"not a database" * 100)
+
+    with OutputCache(path) as cache:
+        assert cache.lookup("c", FOO, lambda: ["int foo();"]) == ["int foo();"]
+        assert cache.stats()["entries"] == 0
+
+
+def test_cache_shared_by_threads(tmp_path):
+    def lookup(i):
+        return cache.lookup("c", digest(f"f{i % 50}"), lambda: [f"int f{i % 50}();"])
+
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lookup, range(1000)))
+
+    assert results == [[f"int f{i % 50}();"] for i in range(1000)]
+    assert OutputCache(tmp_path / "cache.sqlite").stats()["entries"] == 50
+
+
+def _fill(path, worker):
+    with OutputCache(path) as cache:
+        for i in range(200):
+            cache.lookup("c", digest(f"f{i}"), lambda i=i: [f"int f{i}();"])
+            if i % 20 == worker:
+                cache.flush()
+
+
+def test_cache_shared_by_processes(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with ProcessPoolExecutor(4) as pool:
+        list(pool.map(_fill, [path] * 4, range(4)))
+
+    with OutputCache(path) as cache:
+        assert cache.stats()["entries"] == 200
+        assert cache.lookup("c", digest("f7"), _fail) == ["int f7();"]
+
+
+def test_map_spec_uses_output_cache(tmp_path):
+    spec = {"foo": PARAMS}
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        set_output_cache(cache)
+        try:
+            mapping_cache_clear()
+            expected = map_spec(spec, to=("c", "sidl"))
+            mapping_cache_clear()
+            assert map_spec(spec, to=("c", "sidl")) == expected
+        finally:
+            set_output_cache(None)
+            mapping_cache_clear()
+        assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.parametrize("executor", ("process", "thread"))
+def test_parallel_saves_to_output_cache(tmp_path, executor):
+    specs = [BMI, {"foo": PARAMS}]
+    expected = [map_spec(spec, to=("c", "sidl")) for spec in specs]
+
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        set_output_cache(cache)
+        try:
+            mapping_cache_clear()
+            cold = map_specs_parallel(
+                specs, to=("c", "sidl"), jobs=2, executor=executor
+            )
+            cache.flush()
+            warm = map_specs_parallel(
+                specs, to=("c", "sidl"), jobs=2, executor=executor
+            )
+        finally:
+            set_output_cache(None)
+            mapping_cache_clear()
+        assert (cache.hits, cache.misses) == (4, 4)
+        assert cache.stats()["entries"] == 4
+    assert cold == warm == expected
+
+
+@pytest.mark.parametrize("jobs", (None, 2))
+def test_batch_uses_output_cache(tmp_path, jobs):
+    specs = [BMI, {"update": BMI["update"], "foo": PARAMS}]
+    expected = [map_spec(spec, to=("c", "sidl")) for spec in specs]
+
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        set_output_cache(cache)
+        try:
+            mapping_cache_clear()
+            cold, _ = map_spec_batch(
+                specs, to=("c", "sidl"), jobs=jobs, executor="thread"
+            )
+            cache.flush()
+            warm, _ = map_spec_batch(
+                specs, to=("c", "sidl"), jobs=jobs, executor="thread"
+            )
+            assert map_spec(specs[1], to="c") == {"c": expected[1]["c"]}
+        finally:
+            set_output_cache(None)
+            mapping_cache_clear()
+        assert (cache.hits, cache.misses) == (5, 4)
+        assert cache.stats()["entries"] == 4
+    assert cold == warm == expected
+
+
+def test_output_cache_keeps_mapper_options_apart(tmp_path):
+    spec = {"foo": (Parameter("name", "in", "string"),)}
+    with OutputCache(tmp_path / "cache.sqlite") as cache:
+        set_output_cache(cache)
+        try:
+            classic = map_spec(spec, to="c++")
+            set_mapper_options("c++", style="zero-copy")
+            zero_copy = map_spec(spec, to="c++")
+        finally:
+            set_mapper_options("c++")
+            set_output_cache(None)
+            mapping_cache_clear()
+        assert cache.misses == 2
+    assert classic["c++"]["foo"] == "void Foo(std::string name);"
+    assert zero_copy["c++"]["foo"] == "void Foo(std::string_view name);"
+
+
+def test_cache_command(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("BMI_MAP_CACHE_DIR", str(tmp_path))
+    argv = ["--to", "c", "--include", "^update$", "--color", "never", "--cache"]
+
+    assert main(argv) == 0
+    assert main(argv) == 0
+    assert capsys.readouterr().out == "int update(void* self);\n" * 2
+
+    assert main(["cache", "stats"]) == 0
+    out = capsys.readouterr().out
+    assert "entries: 1\n" in out
+    assert "hits: 1, misses: 1" in out
+
+    assert main(["cache", "clear"]) == 0
+    assert main(["cache", "stats"]) == 0
+    assert "entries: 0\n" in capsys.readouterr().out
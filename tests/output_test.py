@@ -0,0 +1,110 @@
+import io
+import os
+
+import pytest
+from bmi_map._bmi import BMI
+from bmi_map._main import main
+from bmi_map._mapper import Signature
+from bmi_map._output import AtomicWriter
+from bmi_map._output import default_file_mode
+from bmi_map._output import function_path
+from bmi_map._output import remove_functions
+from bmi_map._output import write_blocks
+
+
+def test_atomic_writer_discards_on_error(tmp_path):
+    path = tmp_path / "bmi.h"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with AtomicWriter(path) as fp:
+            fp.write("new")
+            raise RuntimeError()
+
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_writer_file_mode(tmp_path):
+    path = tmp_path / "bmi.h"
+    with AtomicWriter(path) as fp:
+        fp.write("new")
+
+    assert path.stat().st_mode & 0o777 == default_file_mode()
+
+
+def test_default_file_mode():
+    umask = os.umask(0o027)
+    try:
+        default_file_mode.cache_clear()
+        assert default_file_mode() == 0o640
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(umask)
+        default_file_mode.cache_clear()
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 256))
+def test_write_blocks(chunk_size):
+    blocks = [("c", ["a", "b", "c"]), ("sidl", []), ("python", ["d"])]
+    fp = io.StringIO()
+
+    write_blocks(fp, blocks, chunk_size=chunk_size)
+    assert fp.getvalue() == "a\nb\nc\n\n\n\nd\n"
+
+
+def test_output_file(tmp_path, capsys):
+    path = tmp_path / "bmi.txt"
+    argv = ["--to", "c", "sidl", "--color", "never"]
+
+    main(argv)
+    expected = capsys.readouterr().out
+
+    assert main(argv + ["--output", str(path)]) == 0
+    assert capsys.readouterr().out == ""
+    assert path.read_text() == expected
+
+    mtime = path.stat().st_mtime_ns
+    assert main(argv + ["--output", str(path)]) == 0
+    assert path.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("name", ("../../escaped", "a/b", "/tmp/escaped"))
+def test_function_path_stays_in_output_dir(tmp_path, name):
+    output_dir = tmp_path / "output"
+    victim = tmp_path / "escaped.h"
+    victim.write_text("keep me")
+
+    with pytest.raises(ValueError, match="function name is not valid"):
+        function_path(output_dir, "c", name)
+    with pytest.raises(ValueError, match="function name is not valid"):
+        remove_functions(output_dir, ["c"], [name])
+    assert victim.read_text() == "keep me"
+
+
+def test_output_dir_rejects_bad_function_names(tmp_path):
+    spec = tmp_path / "spec.toml"
+    spec.write_text('[bmi."../../escaped"]\nparams = []\n')
+    output_dir = tmp_path / "output"
+
+    with pytest.raises(ValueError, match="function name is not valid"):
+        main(["--spec", str(spec), "--output-dir", str(output_dir), "--to", "c"])
+    assert sorted(tmp_path.iterdir()) == [spec]
+
+
+@pytest.mark.parametrize("to_file", (True, False))
+def test_output_walks_spec_once(tmp_path, capsys, monkeypatch, to_file):
+    from_params = Signature.from_params
+    names = []
+
+    def spy(name, params):
+        names.append(name)
+        return from_params(name, params)
+
+    monkeypatch.setattr(Signature, "from_params", staticmethod(spy))
+
+    argv = ["--to", "c", "c++", "python", "sidl", "--color", "never"]
+    if to_file:
+        argv += ["--output", str(tmp_path / "bmi.txt")]
+    assert main(argv) == 0
+    assert names == list(BMI)
@@ -0,0 +1,40 @@
+import pytest
+from bmi_map._bmi import BMI
+from bmi_map._parallel import map_specs_parallel
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import set_mapper_options
+
+
+@pytest.mark.parametrize("executor", ("process", "thread"))
+@pytest.mark.parametrize("jobs", (1, 3))
+def test_parallel_matches_serial(executor, jobs):
+    specs = [BMI, {name: BMI[name] for name in reversed(BMI)}]
+    to = ("c", "python")
+
+    mapped = map_specs_parallel(specs, to=to, jobs=jobs, executor=executor)
+
+    assert mapped == [map_spec(spec, to=to) for spec in specs]
+    for spec, mapped_spec in zip(specs, mapped, strict=True):
+        assert list(mapped_spec) == list(to)
+        assert list(mapped_spec["c"]) == list(spec)
+
+
+def test_parallel_empty_spec():
+    assert map_specs_parallel([{}], to="c", jobs=2, executor="thread") == [{"c": {}}]
+
+
+def test_parallel_bad_executor():
+    with pytest.raises(ValueError):
+        map_specs_parallel([BMI], to="c", executor="fiber")
+
+
+@pytest.mark.parametrize("executor", ("process", "thread"))
+def test_parallel_uses_mapper_options(executor):
+    set_mapper_options("c++", style="zero-copy")
+    try:
+        expected = map_spec(BMI, to="c++")
+        mapped = map_specs_parallel([BMI], to="c++", jobs=2, executor=executor)
+    finally:
+        set_mapper_options("c++")
+    assert mapped == [expected]
+    assert "std::span" in mapped[0]["c++"]["get_grid_x"]
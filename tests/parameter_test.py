@@ -0,0 +1,87 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+from bmi_map._parameter import Parameter
+from bmi_map._parameter import parse_type
+from bmi_map._parameter import TypeSpec
+
+
+@pytest.mark.parametrize("dtype", ("int", "double", "string"))
+def test_parse_scalar(dtype):
+    type_spec = parse_type(dtype)
+    assert type_spec == TypeSpec(dtype)
+    assert type_spec.isscalar
+    assert not type_spec.isarray
+    assert type_spec.dims == ()
+    assert str(type_spec) == dtype
+
+
+def test_parse_array():
+    type_spec = parse_type("array[double,  m,n ]")
+    assert type_spec == TypeSpec("double", isarray=True, dims=("m", "n"))
+    assert not type_spec.isscalar
+    assert str(type_spec) == "array[double, m, n]"
+
+
+def test_parse_type_is_interned():
+    assert parse_type("array[int, n]") is parse_type("array[int, n]")
+
+
+@pytest.mark.parametrize("dtype", ("float", "array[float]", "array[int, m, m]"))
+def test_parse_bad_type(dtype):
+    with pytest.raises(ValueError):
+        parse_type(dtype)
+
+
+@pytest.mark.parametrize(
+    "dtype,expected", [("int", True), ("string", True), ("array[int]", False)]
+)
+def test_parameter_isscalar(dtype, expected):
+    assert Parameter(name="a", intent="in", type=dtype).isscalar() is expected
+
+
+def test_parameter_type_spec():
+    param = Parameter(name="a", intent="in", type="array[int,n]")
+    assert param.type == "array[int, n]"
+    assert param.type_spec is parse_type("array[int, n]")
+    assert param.asdict() == {"name": "a", "intent": "in", "type": "array[int, n]"}
+    assert param.astuple() == ("a", "in", "array[int, n]")
+
+
+def test_parameter_is_interned():
+    param = Parameter(name="grid", intent="in", type="array[int,n]")
+
+    assert Parameter(name="grid", intent="in", type="array[int,n]") is param
+    assert Parameter(name=" grid", intent="in ", type="array[int, n]") is param
+    assert Parameter("grid", "in", "array[int, n]") is param
+
+
+def test_parameter_is_slotted():
+    param = Parameter(name="a", intent="in", type="int")
+    assert not hasattr(param, "__dict__")
+    with pytest.raises(AttributeError):
+        param.name = "b"
+
+
+def test_parameter_pickle():
+    param = Parameter(name="a", intent="inout", type="array[double, m]")
+    assert pickle.loads(pickle.dumps(param)) is param
+    assert copy.deepcopy(param) is param
+
+
+def test_parameter_replace():
+    param = Parameter(name="a", intent="in", type="int")
+    assert dataclasses.replace(param, intent="out") is Parameter(
+        name="a", intent="out", type="int"
+    )
+
+
+def test_parameter_hash():
+    params = {
+        Parameter(name="a", intent="in", type="int"),
+        Parameter(name="a", intent=" in", type="int"),
+        Parameter(name="a", intent="out", type="int"),
+    }
+    assert len(params) == 2
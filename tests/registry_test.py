@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+
+import pytest
+from bmi_map import _registry
+from bmi_map._main import main
+from bmi_map._parameter import Parameter
+from bmi_map._registry import available_languages
+from bmi_map._registry import find_mapper
+from bmi_map._registry import load_mapper
+from bmi_map._registry import mapper_version
+from bmi_map._registry import plugin_mappers
+from bmi_map._version import __version__
+from bmi_map.bmi_map import _mapper_id
+from bmi_map.bmi_map import bmi_map
+from bmi_map.bmi_map import get_mapper
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.mappers.c import CMapper
+
+PLUGIN = """\
+from bmi_map._mapper import LanguageMapper
+
+
+class FortranMapper(LanguageMapper):
+    extension = ".f90"
+
+    def map_signature(self, signature):
+        return f"subroutine {signature.name}()"
+
+
+NotAMapper = object
+"""
+
+ENTRY_POINTS = """\
+[bmi_map.mappers]
+fortran = fortran_map:FortranMapper
+broken = fortran_map:NotAMapper
+c = fortran_map:FortranMapper
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setenv("BMI_MAP_CACHE_DIR", str(tmp_path / "cache"))
+    site = tmp_path / "site-packages"
+    site.mkdir()
+    monkeypatch.syspath_prepend(str(site))
+
+    _registry._plugin_index.cache_clear()
+    yield site
+    sys.modules.pop("fortran_map", None)
+    _registry._plugin_index.cache_clear()
+    get_mapper.cache_clear()
+    mapping_cache_clear()
+
+
+def install_plugin(site, version="1.0"):
+    (site / "fortran_map.py").write_text(PLUGIN)
+    for dist_info in site.glob("fortran_map-*.dist-info"):
+        for path in dist_info.iterdir():
+            path.unlink()
+        dist_info.rmdir()
+    dist_info = site / f"fortran_map-{version}.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Name: fortran-map\nVersion: {version}\n")
+    (dist_info / "entry_points.txt").write_text(ENTRY_POINTS)
+    # Make sure the folder looks modified even with a coarse clock.
+    stat = os.stat(site)
+    os.utime(site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_builtin_languages():
+    assert available_languages()[:4] == ("c", "c++", "python", "sidl")
+    assert find_mapper("c") == "bmi_map.mappers.c:CMapper"
+    assert load_mapper("c") is CMapper
+
+
+def test_unknown_language(site, capsys):
+    with pytest.raises(ValueError, match="language not understood"):
+        find_mapper("fortran")
+    with pytest.raises(SystemExit):
+        main(["--to", "fortran"])
+    assert "language not understood" in capsys.readouterr().err
+
+
+def test_builtin_languages_skip_discovery(site, monkeypatch, capsys):
+    monkeypatch.setattr(_registry, "plugin_mappers", None)
+    with pytest.raises(SystemExit):
+        main(["--help"])
+    assert main(["--to", "c", "--include", "^update$", "--color", "never"]) == 0
+    assert not (site.parent / "cache").exists()
+
+
+def test_plugin_mapper(site, capsys):
+    install_plugin(site)
+
+    assert "fortran" in available_languages()
+    assert find_mapper("c") == "bmi_map.mappers.c:CMapper"
+    assert get_mapper("fortran").extension == ".f90"
+    assert bmi_map("update", [], to="fortran") == "subroutine update()"
+
+    assert main(["--to", "fortran", "--include", "^update$", "--color", "never"]) == 0
+    assert capsys.readouterr().out == "subroutine update()\n"
+
+
+def test_plugin_must_be_a_mapper(site):
+    install_plugin(site)
+    with pytest.raises(TypeError, match="not a LanguageMapper"):
+        load_mapper("broken")
+
+
+def test_builtin_mapper_used_before_discovery(site, monkeypatch):
+    monkeypatch.setattr(_registry, "plugin_mappers", None)
+    get_mapper.cache_clear()
+    mapping_cache_clear()
+    params = [Parameter("a", "in", "int")]
+    assert bmi_map("foo", params, to="sidl") == "int foo(in int a);"
+
+
+def test_plugin_index_is_cached(site, monkeypatch):
+    install_plugin(site)
+    assert "fortran" in plugin_mappers()
+
+    index = json.loads((site.parent / "cache" / "mappers.json").read_text())
+    assert index["mappers"] == {
+        "fortran": "fortran_map:FortranMapper",
+        "broken": "fortran_map:NotAMapper",
+    }
+    assert index["versions"] == {"fortran": "1.0", "broken": "1.0"}
+
+    def discover():
+        raise AssertionError("metadata was scanned")
+
+    _registry._plugin_index.cache_clear()
+    monkeypatch.setattr(_registry, "_discover", discover)
+    assert "fortran" in plugin_mappers()
+
+
+def test_plugin_index_updated_on_install(site):
+    assert plugin_mappers() == {}
+
+    install_plugin(site)
+    _registry._plugin_index.cache_clear()
+    assert "fortran" in plugin_mappers()
+
+
+def test_plugin_version_in_mapper_id(site):
+    assert mapper_version("c") == __version__
+
+    install_plugin(site)
+    assert mapper_version("fortran") == "1.0"
+    mapper_id = _mapper_id("fortran")
+    assert "fortran_map:FortranMapper" in mapper_id
+
+    install_plugin(site, version="1.1")
+    _registry._plugin_index.cache_clear()
+    assert mapper_version("fortran") == "1.1"
+    assert _mapper_id("fortran") != mapper_id
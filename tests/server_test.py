@@ -0,0 +1,208 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bmi_map._main import main
+from bmi_map._server import MappingService
+from bmi_map._server import request
+from bmi_map._server import serve_stdio
+from bmi_map._server import serve_unix
+
+SPEC = '[bmi.foo]\nparams = [{ name = "a", intent = "in", type = "%s" }]\n'
+
+
+@pytest.fixture
+def socket_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        yield os.path.join(tmp, "bmi-map.sock")
+
+
+@pytest.fixture
+def server(socket_path):
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets not supported")
+
+    thread = threading.Thread(target=serve_unix, args=(socket_path,), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        thread.join(0.05)
+    yield socket_path
+    request({"op": "shutdown"}, path=socket_path)
+    thread.join(5)
+
+
+def test_service_maps_builtin():
+    response = MappingService().handle({"to": ["c"], "include": "^update$", "id": 1})
+    assert response == {
+        "ok": True,
+        "result": {"c": {"update": "int update(void* self);"}},
+        "id": 1,
+    }
+
+
+def test_service_maps_batched():
+    request = {"to": "c", "include": "^set_values$", "batched": True}
+    assert MappingService().handle(request)["result"] == {
+        "c": {
+            "set_values": (
+                "int set_values(void* self, const char** names, const int n_names,"
+                " const void* src);"
+            )
+        }
+    }
+    del request["batched"]
+    assert MappingService().handle(request)["result"] == {"c": {}}
+
+
+def test_service_reloads_changed_spec(tmp_path):
+    spec = tmp_path / "spec.toml"
+    service = MappingService()
+
+    spec.write_text(SPEC % "int")
+    assert service.handle({"spec": str(spec)})["result"] == {
+        "sidl": {"foo": "int foo(in int a);"}
+    }
+
+    spec.write_text(SPEC % "double")
+    assert service.handle({"spec": str(spec)})["result"] == {
+        "sidl": {"foo": "int foo(in double a);"}
+    }
+
+
+@pytest.mark.parametrize(
+    "req", [{"op": "explode"}, {"spec": "/not/a/spec.toml"}, {"to": "cobol"}]
+)
+def test_service_errors(req):
+    response = MappingService().handle(req)
+    assert not response["ok"]
+    assert response["error"]
+
+
+@pytest.mark.parametrize("req", [5, "ping", [{"op": "ping"}], None])
+def test_service_request_not_an_object(req):
+    response = MappingService().handle(req)
+    assert response == {"ok": False, "error": response["error"]}
+    assert "not an object" in response["error"]
+
+
+def test_serve_stdio():
+    stdin = io.StringIO(
+        '{"to": "c", "include": "^finalize$"}\nnot json\n5\n{"op": "shutdown"}\n{}\n'
+    )
+    stdout = io.StringIO()
+    serve_stdio(stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert responses == [
+        {"ok": True, "result": {"c": {"finalize": "int finalize(void* self);"}}},
+        {"ok": False, "error": responses[1]["error"]},
+        {"ok": False, "error": responses[2]["error"]},
+        {"ok": True},
+    ]
+
+
+def test_serve_unix(server):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(
+            pool.map(
+                lambda to: request({"to": to, "include": "^update$"}, path=server),
+                ["c", "c++", "python", "sidl"] * 4,
+            )
+        )
+    assert all(response["ok"] for response in responses)
+    assert responses[0]["result"] == {"c": {"update": "int update(void* self);"}}
+
+
+def test_serve_unix_keeps_running_server(server):
+    with pytest.raises(FileExistsError, match="already listening"):
+        serve_unix(server)
+    assert request({"op": "ping"}, path=server) == {"ok": True}
+
+
+def test_serve_unix_keeps_regular_file(tmp_path, capsys):
+    path = tmp_path / "regular-file"
+    path.write_text("keep me")
+
+    with pytest.raises(FileExistsError, match="not a socket"):
+        serve_unix(path)
+    assert main(["serve", "--socket", str(path)]) == 1
+    assert "not a socket" in capsys.readouterr().err
+    assert path.read_text() == "keep me"
+
+
+def test_serve_unix_replaces_stale_socket(socket_path):
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets not supported")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(socket_path)
+    assert os.path.exists(socket_path)
+
+    thread = threading.Thread(target=serve_unix, args=(socket_path,), daemon=True)
+    thread.start()
+    for _ in range(100):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex(socket_path) == 0:
+                break
+        thread.join(0.05)
+    assert thread.is_alive()
+
+    request({"op": "shutdown"}, path=socket_path)
+    thread.join(5)
+    assert not os.path.exists(socket_path)
+
+
+def test_serve_unix_answers_while_mapping(socket_path):
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets not supported")
+
+    mapping = threading.Event()
+    release = threading.Event()
+
+    class SlowService(MappingService):
+        def _map(self, request):
+            mapping.set()
+            release.wait(5)
+            return super()._map(request)
+
+    thread = threading.Thread(
+        target=serve_unix, args=(socket_path, SlowService()), daemon=True
+    )
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        thread.join(0.05)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        slow = pool.submit(request, {"to": "c", "include": "^update$"}, socket_path)
+        assert mapping.wait(5)
+        assert request({"op": "ping"}, path=socket_path) == {"ok": True}
+        assert not slow.done()
+        release.set()
+        assert slow.result(5)["ok"]
+
+    request({"op": "shutdown"}, path=socket_path)
+    thread.join(5)
+
+
+def test_request_without_server(socket_path):
+    response = request({"to": "c", "include": "^update$"}, path=socket_path)
+    assert response == {
+        "ok": True,
+        "result": {"c": {"update": "int update(void* self);"}},
+    }
+
+
+def test_client_command(server, capsys):
+    assert (
+        main(["client", "--socket", server, "--to", "c", "--include", "^update$"]) == 0
+    )
+    assert capsys.readouterr().out == "int update(void* self);\n"
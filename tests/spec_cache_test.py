@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from bmi_map._cache import user_cache_dir
+from bmi_map._parameter import Parameter
+from bmi_map._spec_cache import SpecCache
+from bmi_map.bmi_map import load
+from bmi_map.bmi_map import loads
+
+CONTENT = """\
+[bmi.foo]
+params = [
+    { name = "a", intent = "in", type = "double" },
+    { name = "b", intent = "out", type = "array[int, n]" },
+]
+"""
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = SpecCache(tmp_path)
+    spec = {"foo": (Parameter(name="a", intent="in", type="int"),)}
+
+    assert cache.get(b"content") is None
+    cache.put(b"content", spec)
+    assert cache.get(b"content") == spec
+    assert cache.get(b"other content") is None
+
+
+def test_load_uses_cache(tmp_path):
+    cache = SpecCache(tmp_path)
+
+    spec = load(io.BytesIO(CONTENT.encode()), cache=cache)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+    assert cache.get(CONTENT.encode()) == spec
+    assert loads(CONTENT, lazy=True, cache=cache) == loads(CONTENT)
+
+
+def test_cache_skips_parsing(tmp_path):
+    cache = SpecCache(tmp_path)
+    spec = {"bar": (Parameter(name="a", intent="in", type="int"),)}
+    cache.put(CONTENT.encode(), spec)
+
+    assert loads(CONTENT, cache=cache) == spec
+    assert loads(CONTENT, cache=False) != spec
+
+
+def test_cache_ignores_corrupt_entries(tmp_path):
+    cache = SpecCache(tmp_path)
+    (tmp_path / f"{SpecCache.key(b'content')}.pickle").write_bytes(b"not a pickle")
+
+    assert cache.get(b"content") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unusable_cache_dir(tmp_path):
+    (tmp_path / "file").touch()
+    cache = SpecCache(tmp_path / "file" / "specs")
+
+    cache.put(CONTENT.encode(), {})
+    assert cache.get(CONTENT.encode()) is None
+    assert load(io.BytesIO(CONTENT.encode()), cache=cache) == loads(CONTENT)
+
+
+def test_cache_eviction(tmp_path):
+    cache = SpecCache(tmp_path, max_bytes=0)
+    cache.put(b"content", {})
+    assert cache.size() == 0
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("BMI_MAP_CACHE_DIR", str(tmp_path))
+
+    monkeypatch.delenv("BMI_MAP_SPEC_CACHE", raising=False)
+    loads(CONTENT)
+    assert not tmp_path.exists() or list(tmp_path.rglob("*.pickle")) == []
+
+    monkeypatch.setenv("BMI_MAP_SPEC_CACHE", "1")
+    loads(CONTENT)
+    assert len(list(tmp_path.rglob("*.pickle"))) == 1
+
+
+@pytest.mark.parametrize(
+    "env,expected",
+    [
+        ({"BMI_MAP_CACHE_DIR": "/cache"}, "/cache"),
+        ({"XDG_CACHE_HOME": "/xdg"}, "/xdg/bmi-map"),
+    ],
+)
+def test_user_cache_dir(monkeypatch, env, expected):
+    monkeypatch.delenv("BMI_MAP_CACHE_DIR", raising=False)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    assert str(user_cache_dir()) == expected
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET = 0.5
+
+SCRIPT = """\
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from bmi_map._main import main
+elapsed = time.perf_counter() - start
+
+main(sys.argv[1:])
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _run(*argv, env=None):
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *argv],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "to,module",
+    [
+        ("c", "bmi_map.mappers.c"),
+        ("c++", "bmi_map.mappers.cxx"),
+        ("python", "bmi_map.mappers.python"),
+        ("sidl", "bmi_map.mappers.sidl"),
+    ],
+)
+def test_only_requested_mapper_is_imported(to, module):
+    modules = _run("--to", to, "--color", "never")["modules"]
+
+    assert [m for m in modules if m.startswith("bmi_map.mappers.")] == [module]
+
+
+def test_no_color_does_not_import_pygments():
+    modules = _run("--color", "never")["modules"]
+
+    assert not [m for m in modules if m.split(".")[0] == "pygments"]
+    assert "tomllib" not in modules
+    assert "concurrent.futures" not in modules
+
+
+def test_import_time_budget():
+    assert _run("--color", "never")["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_plugin_index_is_reused(tmp_path):
+    env = dict(os.environ, BMI_MAP_CACHE_DIR=str(tmp_path))
+
+    _run("--to", "c", "--color", "never", env=env)
+    modules = _run("--to", "c", "--color", "never", env=env)["modules"]
+
+    assert "importlib.metadata" not in modules
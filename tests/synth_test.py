@@ -0,0 +1,80 @@
+import tomllib
+
+import pytest
+from bmi_map._bmi import BMI
+from bmi_map._check import check_spec
+from bmi_map._main import main
+from bmi_map._synth import synth_spec
+from bmi_map.bmi_map import dumps
+from bmi_map.bmi_map import load
+from bmi_map.bmi_map import loads
+from bmi_map.bmi_map import map_spec
+
+
+@pytest.mark.parametrize("n_functions,params_per_func", [(0, 3), (50, 0), (500, 4)])
+def test_synth_spec_size(n_functions, params_per_func):
+    spec = synth_spec(n_functions, params_per_func, seed=0)
+    assert len(spec) == n_functions
+    assert all(len(params) == params_per_func for params in spec.values())
+
+
+def test_synth_spec_is_reproducible():
+    assert synth_spec(100, seed=1) == synth_spec(100, seed=1)
+    assert synth_spec(100, seed=1) != synth_spec(100, seed=2)
+
+
+def test_synth_spec_mix():
+    params = [param for params in synth_spec(2000, seed=0).values() for param in params]
+
+    assert {param.intent for param in params} == {"in", "inout", "out"}
+    assert {param.type_spec.dtype for param in params} == {
+        "int",
+        "double",
+        "string",
+        "any",
+    }
+    assert {len(param.type_spec.dims) for param in params} == {0, 1, 2, 3}
+    assert 0.2 < sum(param.type_spec.isarray for param in params) / len(params) < 0.6
+
+
+def test_synth_spec_maps_to_every_language():
+    spec = synth_spec(500, params_per_func=5, seed=0)
+    assert all(
+        sum(param.intent == "out" for param in params) <= 1 for params in spec.values()
+    )
+    mapped = map_spec(spec)
+    assert all(len(funcs) == len(spec) for funcs in mapped.values())
+
+
+def test_synth_spec_bad_sizes():
+    with pytest.raises(ValueError):
+        synth_spec(-1)
+
+
+@pytest.mark.parametrize("spec", [BMI, synth_spec(200, seed=3), {}])
+def test_dumps_roundtrip(spec):
+    content = dumps(spec)
+    assert check_spec(tomllib.loads(content)["bmi"]) == []
+    assert dict(loads(content)) == spec
+
+
+def test_dumps_quotes_keys():
+    assert dict(loads(dumps({"get_\u00e9": ()}))) == {"get_\u00e9": ()}
+
+
+def test_synth_command(tmp_path, capsys):
+    argv = ["synth", "--functions", "20", "--params-per-func", "2", "--seed", "7"]
+    assert main(argv) == 0
+    content = capsys.readouterr().out
+    assert dict(loads(content)) == synth_spec(20, 2, seed=7)
+
+    path = tmp_path / "spec.toml"
+    assert main(argv + ["-o", str(path)]) == 0
+    assert path.read_text() == content
+    with open(path, "rb") as fp:
+        assert len(load(fp)) == 20
+
+
+def test_synth_command_bad_sizes():
+    with pytest.raises(SystemExit):
+        main(["synth", "--functions", "-1"])
@@ -0,0 +1,138 @@
+import itertools
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from bmi_map._bmi import BMI
+from bmi_map._cache import LRUCache
+from bmi_map._parallel import map_spec_concurrent
+from bmi_map._parameter import Parameter
+from bmi_map._timing import phase
+from bmi_map._timing import Timings
+from bmi_map.bmi_map import bmi_map
+from bmi_map.bmi_map import loads
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+from bmi_map.bmi_map import mapping_cache_info
+from bmi_map.bmi_map import set_mapping_cache_size
+
+THREADS = 8
+
+LANGUAGES = ("c", "c++", "python", "sidl")
+
+SPEC = """\
+[bmi.get_x]
+params = [
+  { name = "grid", intent = "in", type = "int" },
+  { name = "x", intent = "in", type = "array[double, n]" },
+]
+
+[bmi.get_name]
+params = [{ name = "name", intent = "out", type = "string" }]
+"""
+
+
+@pytest.fixture(autouse=True)
+def switch_often():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(func, n_threads=THREADS):
+    barrier = threading.Barrier(n_threads)
+
+    def run(index):
+        barrier.wait()
+        return func(index)
+
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        return list(pool.map(run, range(n_threads)))
+
+
+def test_map_spec_concurrent_matches_serial():
+    assert map_spec_concurrent(BMI, jobs=THREADS) == map_spec(BMI)
+
+
+def test_map_spec_concurrent_with_pool():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        mapped = map_spec_concurrent(BMI, to="sidl", pool=pool)
+        assert pool.submit(len, mapped["sidl"]).result() == len(BMI)
+    assert mapped == map_spec(BMI, to="sidl")
+
+
+def test_bmi_map_is_reentrant():
+    spec = {
+        f"f{i}": (Parameter(f"a{i % 7}", "in", "array[double, n]"),) for i in range(200)
+    }
+    expected = map_spec(spec, to=LANGUAGES)
+
+    def map_all(index):
+        languages = LANGUAGES[index:] + LANGUAGES[:index]
+        return [
+            (language, name, bmi_map(name, params, to=language))
+            for language in languages
+            for name, params in spec.items()
+        ]
+
+    set_mapping_cache_size(64)
+    mapping_cache_clear()
+    try:
+        results = run_threads(map_all)
+        info = mapping_cache_info()
+    finally:
+        set_mapping_cache_size(4096)
+        mapping_cache_clear()
+
+    for result in results:
+        for language, name, text in result:
+            assert text == expected[language][name]
+    assert info.currsize <= 64
+    assert info.hits + info.misses == THREADS * len(spec) * len(LANGUAGES)
+
+
+def test_loads_is_reentrant():
+    expected = dict(loads(SPEC))
+
+    def load_and_access(index):
+        spec = loads(SPEC, lazy=bool(index % 2))
+        return {name: spec[name] for name in reversed(list(spec))}
+
+    for spec in run_threads(load_and_access):
+        assert spec == expected
+
+
+def test_parameters_interned_across_threads():
+    params = run_threads(
+        lambda index: [
+            Parameter(f"p{i}_x", "inout", "array[int, n]") for i in range(50)
+        ]
+    )
+    for first, *others in zip(*params, strict=True):
+        assert all(other is first for other in others)
+
+
+def test_lru_cache_shared_by_threads():
+    cache = LRUCache(maxsize=16)
+    counter = itertools.count()
+
+    def lookup(index):
+        return [cache.lookup(key % 32, lambda: next(counter)) for key in range(500)]
+
+    run_threads(lookup)
+    info = cache.info()
+    assert info.currsize == len(cache) <= 16
+    assert info.hits + info.misses == THREADS * 500
+
+
+def test_timings_from_threads():
+    def work(index):
+        for _ in range(100):
+            with phase("map", "c"):
+                pass
+
+    with Timings() as timings:
+        run_threads(work)
+    assert timings.calls == {("map", "c"): THREADS * 100}
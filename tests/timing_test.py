@@ -0,0 +1,88 @@
+import pstats
+
+from bmi_map._main import main
+from bmi_map._timing import add_phase_hook
+from bmi_map._timing import phase
+from bmi_map._timing import PhaseEvent
+from bmi_map._timing import remove_phase_hook
+from bmi_map._timing import Timings
+from bmi_map.bmi_map import loads
+from bmi_map.bmi_map import map_spec
+from bmi_map.bmi_map import mapping_cache_clear
+
+SPEC = """\
+[bmi.foo]
+params = [{ name = "a", intent = "in", type = "int" }]
+"""
+
+
+def test_phase_hook_events():
+    events = []
+    add_phase_hook(events.append)
+    try:
+        mapping_cache_clear()
+        map_spec(loads(SPEC, cache=False), to=("c", "sidl"))
+    finally:
+        remove_phase_hook(events.append)
+
+    assert all(isinstance(event, PhaseEvent) for event in events)
+    assert [(e.name, e.language, e.kind) for e in events] == [
+        ("parse", None, "start"),
+        ("parse", None, "end"),
+        ("validate", None, "start"),
+        ("validate", None, "end"),
+        ("map", "c", "start"),
+        ("map", "c", "end"),
+        ("map", "sidl", "start"),
+        ("map", "sidl", "end"),
+    ]
+    assert all(e.elapsed >= 0.0 for e in events if e.kind == "end")
+
+
+def test_phase_without_hooks():
+    with phase("map") as p:
+        pass
+    assert p._start is None
+
+
+def test_timings_nested_phases_are_not_double_counted():
+    with Timings() as timings:
+        with phase("outer"):
+            with phase("inner"):
+                sum(range(10000))
+
+    assert timings.calls == {("inner", None): 1, ("outer", None): 1}
+    assert timings.total == sum(timings.seconds.values())
+    assert timings.seconds["outer", None] < timings.seconds["inner", None]
+
+
+def test_timings_report(capsys):
+    with Timings() as timings:
+        with phase("map", "c"):
+            pass
+    timings.report()
+
+    lines = capsys.readouterr().err.splitlines()
+    assert lines[0].split() == ["phase", "language", "calls", "ms", "%"]
+    assert lines[1].split()[:3] == ["map", "c", "1"]
+    assert lines[-1].split()[0] == "total"
+
+
+def test_timings_option(capsys):
+    assert main(["--to", "c", "--include", "^update$", "--color", "never"]) == 0
+    expected = capsys.readouterr().out
+
+    argv = ["--to", "c", "--include", "^update$", "--color", "never", "--timings"]
+    assert main(argv) == 0
+    captured = capsys.readouterr()
+
+    assert captured.out == expected
+    phases = [line.split()[0] for line in captured.err.splitlines()]
+    assert {"map", "write", "run", "total"} <= set(phases)
+    assert "mapping cache:" in captured.err
+
+
+def test_profile_option(tmp_path, capsys):
+    prof = tmp_path / "run.prof"
+    assert main(["--to", "c", "--color", "never", "--profile", str(prof)]) == 0
+    assert pstats.Stats(str(prof)).total_calls > 0
@@ -0,0 +1,98 @@
+import os
+
+from bmi_map._main import main
+from bmi_map._output import write_if_changed
+from bmi_map._parameter import Parameter
+from bmi_map._watch import diff_specs
+from bmi_map._watch import SpecWatcher
+
+SPEC = """\
+[bmi.foo]
+params = [{{ name = "a", intent = "in", type = "{foo_type}" }}]
+
+[bmi.bar]
+params = [{{ name = "b", intent = "out", type = "int" }}]
+"""
+
+
+def _write_spec(path, **kwds):
+    path.write_text(SPEC.format(**kwds))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / "out" / "foo.h"
+
+    assert write_if_changed(path, "foo")
+    assert not write_if_changed(path, "foo")
+    assert write_if_changed(path, "bar")
+    assert path.read_text() == "bar"
+    assert [p.name for p in path.parent.iterdir()] == ["foo.h"]
+
+
+def test_diff_specs():
+    a = (Parameter(name="a", intent="in", type="int"),)
+    b = (Parameter(name="a", intent="in", type="double"),)
+
+    changed, removed = diff_specs({"foo": a, "bar": a}, {"foo": a, "baz": b})
+    assert changed == ["baz"]
+    assert removed == ["bar"]
+
+
+def test_watcher_only_remaps_changed(tmp_path):
+    spec = tmp_path / "spec.toml"
+    out = tmp_path / "out"
+    _write_spec(spec, foo_type="int")
+
+    watcher = SpecWatcher(spec, out, to=["c", "sidl"])
+    assert sorted(watcher.poll()) == ["bar", "foo"]
+    assert watcher.poll() is None
+
+    bar_stat = (out / "c" / "bar.h").stat()
+
+    _write_spec(spec, foo_type="double")
+    assert watcher.poll() == ["foo"]
+    assert (out / "c" / "foo.h").read_text() == "int foo(void* self, const double a);\n"
+    assert (out / "sidl" / "foo.sidl").read_text() == "int foo(in double a);\n"
+    assert (out / "c" / "bar.h").stat().st_mtime_ns == bar_stat.st_mtime_ns
+
+
+def test_watcher_removes_functions(tmp_path):
+    spec = tmp_path / "spec.toml"
+    out = tmp_path / "out"
+    _write_spec(spec, foo_type="int")
+
+    watcher = SpecWatcher(spec, out, to=["c"])
+    watcher.poll()
+
+    spec.write_text(
+        '[bmi.bar]\nparams = [{ name = "b", intent = "out", type = "int" }]'
+    )
+    assert watcher.update() == []
+    assert sorted(p.name for p in (out / "c").iterdir()) == ["bar.h"]
+
+
+def test_output_dir(tmp_path):
+    assert main(["--to", "c", "python", "--output-dir", str(tmp_path)]) == 0
+    assert (tmp_path / "c" / "update.h").read_text() == "int update(void* self);\n"
+    assert (
+        tmp_path / "python" / "update.pyi"
+    ).read_text() == "def update(self) -> None:\n"
+
+
+def test_watcher_survives_malformed_params(tmp_path, monkeypatch, capsys):
+    spec = tmp_path / "spec.toml"
+    out = tmp_path / "out"
+    spec.write_text('[bmi.foo]\nparams = [{ name = "a", intent = "in" }]\n')
+
+    def sleep(interval):
+        if (out / "c").exists():
+            raise KeyboardInterrupt
+        _write_spec(spec, foo_type="int")
+
+    monkeypatch.setattr("bmi_map._watch.time.sleep", sleep)
+    SpecWatcher(spec, out, to=["c"]).run()
+
+    assert "foo.params[0].type: missing" in capsys.readouterr().err
+    assert sorted(p.name for p in (out / "c").iterdir()) == ["bar.h", "foo.h"]